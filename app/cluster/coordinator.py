@@ -0,0 +1,162 @@
+import asyncio
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Optional
+
+from app.cluster.protocol import (
+    assign_messages, parse_address, read_message, result_from_message, start_server
+)
+from app.cluster.ring import HashRing
+from app.core.config import settings
+from app.core.endpoints import EndpointConfigWatcher, EndpointDiff, EndpointRegistry
+from app.core.logger import setup_logger
+from app.core.metrics import record_probe
+from app.core.models import EndpointConfig
+from app.monitor.engine import MonitorEngine, ResultSink
+
+logger = setup_logger(__name__)
+
+
+class WorkerConnection:
+    def __init__(self, worker_id: str, writer: asyncio.StreamWriter):
+        self.worker_id = worker_id
+        self.writer = writer
+        self.assigned: dict[str, EndpointConfig] = {}
+        self.results = 0
+    
+    def assign(self, endpoints: list[EndpointConfig]) -> None:
+        target = {endpoint.name: endpoint for endpoint in endpoints}
+        # Endpoints alterados na recarga são objetos novos no registry
+        upsert = [
+            endpoint for name, endpoint in target.items() if self.assigned.get(name) is not endpoint
+        ]
+        remove = [name for name in self.assigned if name not in target]
+        self.assigned = target
+        
+        if upsert or remove:
+            for message in assign_messages(upsert, remove):
+                self.writer.write(message)
+    
+    def close(self) -> None:
+        self.writer.close()
+
+
+class Coordinator(MonitorEngine):
+    def __init__(
+        self,
+        registry: EndpointRegistry,
+        sinks: list[ResultSink],
+        address: Optional[str] = None,
+        watcher: Optional[EndpointConfigWatcher] = None,
+        virtual_nodes: Optional[int] = None,
+        heartbeat_timeout: Optional[float] = None
+    ):
+        super().__init__(registry, sinks, watcher=watcher)
+        self.address = address or settings.cluster_address
+        self.ring = HashRing(virtual_nodes or settings.cluster_virtual_nodes)
+        self.heartbeat_timeout = heartbeat_timeout or settings.cluster_heartbeat_timeout
+        self.workers: dict[str, WorkerConnection] = {}
+        self._connections: set[asyncio.Task[None]] = set()
+    
+    def reload(self, endpoints: list[EndpointConfig]) -> EndpointDiff:
+        diff = super().reload(endpoints)
+        if diff:
+            self.rebalance()
+        return diff
+    
+    def rebalance(self) -> None:
+        assignment: dict[str, list[EndpointConfig]] = {worker_id: [] for worker_id in self.workers}
+        for endpoint in self.registry:
+            owner = self.ring.owner(endpoint.name)
+            if owner is not None:
+                assignment[owner].append(endpoint)
+        
+        for worker_id, endpoints in assignment.items():
+            self.workers[worker_id].assign(endpoints)
+    
+    def _join(self, worker: WorkerConnection) -> None:
+        previous = self.workers.get(worker.worker_id)
+        if previous is not None:
+            # Reconexão antes do timeout da conexão antiga: fica a mais recente
+            previous.close()
+        
+        self.workers[worker.worker_id] = worker
+        self.ring.add(worker.worker_id)
+        self.rebalance()
+        logger.info(
+            f"Worker {worker.worker_id} conectado: {len(worker.assigned)} endpoints, "
+            f"{len(self.workers)} workers ativos"
+        )
+    
+    def _leave(self, worker: WorkerConnection) -> None:
+        if self.workers.get(worker.worker_id) is not worker:
+            return
+        
+        del self.workers[worker.worker_id]
+        self.ring.remove(worker.worker_id)
+        self.rebalance()
+        logger.warning(
+            f"Worker {worker.worker_id} desconectado; endpoints redistribuídos entre "
+            f"{len(self.workers)} workers"
+        )
+        if not self.workers and len(self.registry):
+            logger.error("Nenhum worker conectado; endpoints sem verificação")
+    
+    async def _handle_worker(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections.add(task)
+            task.add_done_callback(self._connections.discard)
+        worker: Optional[WorkerConnection] = None
+        
+        try:
+            async with asyncio.timeout(self.heartbeat_timeout):
+                hello = await read_message(reader)
+            if not hello or hello.get("type") != "hello":
+                return
+            
+            worker = WorkerConnection(str(hello["worker"]), writer)
+            self._join(worker)
+            
+            while True:
+                # Workers mandam heartbeat; silêncio além do limite conta como queda
+                async with asyncio.timeout(self.heartbeat_timeout):
+                    message = await read_message(reader)
+                if message is None:
+                    break
+                if message.get("type") == "result":
+                    result = result_from_message(message)
+                    worker.results += 1
+                    record_probe(result)
+                    await self._enqueue(result)
+        except TimeoutError:
+            name = worker.worker_id if worker else "desconhecido"
+            logger.warning(f"Worker {name} sem resposta há {self.heartbeat_timeout}s")
+        except (ConnectionError, ValueError, KeyError) as e:
+            name = worker.worker_id if worker else "desconhecido"
+            logger.warning(f"Conexão com o worker {name} encerrada: {e}")
+        finally:
+            if worker is not None:
+                self._leave(worker)
+            writer.close()
+    
+    async def _close_server(self, server: asyncio.AbstractServer) -> None:
+        server.close()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await server.wait_closed()
+        
+        _, _, path = parse_address(self.address)
+        if path is not None:
+            Path(path).unlink(missing_ok=True)
+    
+    async def _start(self, stack: AsyncExitStack) -> list[asyncio.Task[None]]:
+        server = await start_server(self._handle_worker, self.address)
+        stack.push_async_callback(self._close_server, server)
+        logger.info(
+            f"Coordenador aguardando workers em {self.address} ({len(self.registry)} endpoints)"
+        )
+        return [asyncio.create_task(server.serve_forever())]
@@ -0,0 +1,63 @@
+import argparse
+import asyncio
+from typing import Optional
+
+from rich.console import Console
+
+from app.cluster.coordinator import Coordinator
+from app.cluster.worker import Worker
+from app.core.config import settings
+from app.core.endpoints import EndpointConfigWatcher, EndpointRegistry, load_endpoints
+from app.core.logger import setup_logger
+from app.core.metrics import serve_metrics
+from app.core.stats import StatsTracker
+from app.monitor.sinks import AlertSink, ConsoleSink, HistorySink, StatsSink
+
+logger = setup_logger(__name__)
+console = Console()
+
+
+async def coordinator_loop(address: Optional[str]) -> None:
+    watcher = EndpointConfigWatcher()
+    endpoints = load_endpoints(watcher=watcher)
+    
+    stats_tracker = StatsTracker()
+    coordinator = Coordinator(EndpointRegistry(endpoints), [
+        ConsoleSink(console, stats_tracker),
+        StatsSink(stats_tracker),
+        HistorySink(),
+        AlertSink()
+    ], address=address, watcher=watcher)
+    
+    if settings.metrics_port:
+        await asyncio.gather(
+            coordinator.run(), serve_metrics(settings.metrics_host, settings.metrics_port)
+        )
+    else:
+        await coordinator.run()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="SentinelAPI distribuído em vários workers")
+    roles = parser.add_subparsers(dest="role", required=True)
+    
+    coordinator = roles.add_parser("coordinator", help="distribui endpoints e agrega resultados")
+    coordinator.add_argument("--address", help="socket Unix ou host:porta (padrão: CLUSTER_ADDRESS)")
+    
+    worker = roles.add_parser("worker", help="verifica a parte dos endpoints que recebe")
+    worker.add_argument("--address", help="socket Unix ou host:porta (padrão: CLUSTER_ADDRESS)")
+    worker.add_argument("--id", dest="worker_id", help="identificador estável do worker")
+    
+    args = parser.parse_args(argv)
+    
+    try:
+        if args.role == "coordinator":
+            asyncio.run(coordinator_loop(args.address))
+        else:
+            asyncio.run(Worker(args.worker_id, args.address).run())
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Monitoramento encerrado[/yellow]")
+
+
+if __name__ == "__main__":
+    main()
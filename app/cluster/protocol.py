@@ -0,0 +1,88 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core.models import EndpointConfig, HealthStatus, ProbeResult
+
+# Uma atribuição inicial com milhares de endpoints vai em várias mensagens deste tamanho
+ASSIGN_BATCH = 500
+STREAM_LIMIT = 16 * 1024 * 1024
+
+Message = dict[str, Any]
+ConnectionHandler = Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]]
+
+
+def encode(message: Message) -> bytes:
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False).encode() + b"\n"
+
+
+async def read_message(reader: asyncio.StreamReader) -> Optional[Message]:
+    line = await reader.readline()
+    if not line:
+        return None
+    message: Message = json.loads(line)
+    return message
+
+
+def result_to_message(result: ProbeResult) -> Message:
+    return {
+        "type": "result",
+        "endpoint": result.endpoint,
+        "url": result.url,
+        "status": result.status.value,
+        "response_time": result.response_time,
+        "status_code": result.status_code,
+        "error_message": result.error_message,
+        "checked_at": result.checked_at
+    }
+
+
+def result_from_message(message: Message) -> ProbeResult:
+    return ProbeResult(
+        message["endpoint"],
+        message["url"],
+        HealthStatus(message["status"]),
+        message["response_time"],
+        message.get("status_code"),
+        message.get("error_message"),
+        message["checked_at"]
+    )
+
+
+def assign_messages(upsert: list[EndpointConfig], remove: list[str]) -> list[bytes]:
+    messages = [encode({"type": "assign", "upsert": [], "remove": remove})] if remove else []
+    for start in range(0, len(upsert), ASSIGN_BATCH):
+        batch = upsert[start:start + ASSIGN_BATCH]
+        messages.append(encode({
+            "type": "assign",
+            "upsert": [endpoint.model_dump(mode="json") for endpoint in batch],
+            "remove": []
+        }))
+    return messages
+
+
+def parse_address(address: str) -> tuple[Optional[str], Optional[int], Optional[str]]:
+    if address.startswith("unix:"):
+        return None, None, address[len("unix:"):]
+    host, separator, port = address.rpartition(":")
+    if separator and port.isdigit():
+        return host or "127.0.0.1", int(port), None
+    return None, None, address
+
+
+async def start_server(handler: ConnectionHandler, address: str) -> asyncio.AbstractServer:
+    host, port, path = parse_address(address)
+    if path is None:
+        return await asyncio.start_server(handler, host, port, limit=STREAM_LIMIT)
+    
+    # Socket de uma execução anterior que não foi removido
+    Path(path).unlink(missing_ok=True)
+    return await asyncio.start_unix_server(handler, path, limit=STREAM_LIMIT)
+
+
+async def open_connection(address: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    host, port, path = parse_address(address)
+    if path is None:
+        return await asyncio.open_connection(host, port, limit=STREAM_LIMIT)
+    return await asyncio.open_unix_connection(path, limit=STREAM_LIMIT)
@@ -0,0 +1,51 @@
+import hashlib
+from bisect import bisect
+from typing import Optional
+
+
+def ring_hash(key: str) -> int:
+    # hash() muda a cada processo; o anel precisa dar o mesmo dono em qualquer nó
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    def __init__(self, virtual_nodes: int = 64):
+        self.virtual_nodes = virtual_nodes
+        self._nodes: set[str] = set()
+        self._points: list[int] = []
+        self._owners: list[str] = []
+    
+    def __len__(self) -> int:
+        return len(self._nodes)
+    
+    def __contains__(self, node: str) -> bool:
+        return node in self._nodes
+    
+    @property
+    def nodes(self) -> set[str]:
+        return set(self._nodes)
+    
+    def add(self, node: str) -> None:
+        if node not in self._nodes:
+            self._nodes.add(node)
+            self._rebuild()
+    
+    def remove(self, node: str) -> None:
+        if node in self._nodes:
+            self._nodes.discard(node)
+            self._rebuild()
+    
+    def _rebuild(self) -> None:
+        points = sorted(
+            (ring_hash(f"{node}#{replica}"), node)
+            for node in self._nodes
+            for replica in range(self.virtual_nodes)
+        )
+        self._points = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+    
+    def owner(self, key: str) -> Optional[str]:
+        if not self._points:
+            return None
+        index = bisect(self._points, ring_hash(key)) % len(self._points)
+        return self._owners[index]
@@ -0,0 +1,110 @@
+import asyncio
+import os
+import socket
+from typing import Optional
+
+from app.cluster.protocol import encode, open_connection, read_message, result_to_message
+from app.core.config import settings
+from app.core.endpoints import EndpointRegistry
+from app.core.logger import setup_logger
+from app.core.models import EndpointConfig, ProbeResult
+from app.monitor.engine import MonitorEngine, ResultSink
+from app.monitor.health_checker import HealthChecker
+
+logger = setup_logger(__name__)
+
+MAX_RECONNECT_DELAY = 30.0
+
+
+class ForwardSink(ResultSink):
+    name = "forward"
+    
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+    
+    async def handle(self, result: ProbeResult) -> None:
+        self.writer.write(encode(result_to_message(result)))
+        await self.writer.drain()
+
+
+class Worker:
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        address: Optional[str] = None,
+        checker: Optional[HealthChecker] = None,
+        heartbeat_interval: Optional[float] = None
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.address = address or settings.cluster_address
+        self.checker = checker
+        self.heartbeat_interval = heartbeat_interval or settings.cluster_heartbeat_interval
+        self.assigned: dict[str, EndpointConfig] = {}
+    
+    async def run(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                reader, writer = await open_connection(self.address)
+            except OSError as e:
+                logger.warning(
+                    f"Coordenador indisponível em {self.address} ({e}); "
+                    f"nova tentativa em {delay:.0f}s"
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+                continue
+            
+            delay = 1.0
+            try:
+                await self._session(reader, writer)
+            except (ConnectionError, ValueError) as e:
+                logger.warning(f"Erro na conexão com o coordenador: {e}")
+            finally:
+                writer.close()
+            logger.warning("Conexão com o coordenador perdida; reconectando")
+    
+    async def _session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.write(encode({"type": "hello", "worker": self.worker_id}))
+        await writer.drain()
+        logger.info(f"Worker {self.worker_id} conectado a {self.address}")
+        
+        # Engine novo por conexão: o coordenador reenvia a atribuição completa ao reconectar
+        self.assigned = {}
+        engine = MonitorEngine(EndpointRegistry(), [ForwardSink(writer)], checker=self.checker)
+        tasks = [
+            asyncio.create_task(engine.run()),
+            asyncio.create_task(self._heartbeat(writer)),
+            asyncio.create_task(self._receive(reader, engine))
+        ]
+        
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _receive(self, reader: asyncio.StreamReader, engine: MonitorEngine) -> None:
+        while True:
+            message = await read_message(reader)
+            if message is None:
+                return
+            if message.get("type") != "assign":
+                continue
+            
+            for name in message.get("remove", ()):
+                self.assigned.pop(name, None)
+            for data in message.get("upsert", ()):
+                endpoint = EndpointConfig.model_validate(data)
+                self.assigned[endpoint.name] = endpoint
+            engine.reload(list(self.assigned.values()))
+    
+    async def _heartbeat(self, writer: asyncio.StreamWriter) -> None:
+        message = encode({"type": "heartbeat"})
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            writer.write(message)
+            await writer.drain()
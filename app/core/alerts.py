@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import Optional
 from pydantic import BaseModel
 
@@ -9,8 +10,55 @@ class AlertConfig(BaseModel):
     alert_cooldown_minutes: int = 5
 
 
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitConfig(BaseModel):
+    failure_threshold: int = 3
+    open_seconds: float = 30.0
+    max_open_seconds: float = 600.0
+    probe_timeout: float = 2.0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.failure_threshold > 0
+
+
+class CircuitBreaker:
+    def __init__(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.consecutive_opens = 0
+    
+    def allows_probe(self, current_time: float) -> bool:
+        if self.state is CircuitState.OPEN and current_time >= self.open_until:
+            self.state = CircuitState.HALF_OPEN
+        return self.state is not CircuitState.OPEN
+    
+    def record_probe(self, reachable: bool, config: CircuitConfig, current_time: float) -> None:
+        if reachable:
+            self.consecutive_failures = 0
+            self.consecutive_opens = 0
+            self.state = CircuitState.CLOSED
+            return
+        
+        self.consecutive_failures += 1
+        if self.state is CircuitState.HALF_OPEN or (
+            config.enabled and self.consecutive_failures >= config.failure_threshold
+        ):
+            # Cada reabertura seguida dobra a espera, até o teto configurado
+            self.consecutive_opens += 1
+            backoff = config.open_seconds * 2 ** (self.consecutive_opens - 1)
+            self.state = CircuitState.OPEN
+            self.open_until = current_time + min(backoff, config.max_open_seconds)
+
+
 class EndpointAlertState:
-    def __init__(self):
+    def __init__(self) -> None:
         self.consecutive_failures = 0
         self.last_alert_time: Optional[float] = None
         self.was_down = False
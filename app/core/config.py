@@ -8,9 +8,65 @@ class Settings(BaseSettings):
         case_sensitive=False
     )
     
+    log_level: str = "INFO"
+    log_format: str = "text"
+    log_file: str = "logs/sentinel.log"
+    log_file_format: str = "json"
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_backup_count: int = 7
+    log_rotate_interval: float = 86400
+    log_queue_size: int = 10000
+    log_rate_limit: int = 20
+    log_rate_window: float = 10.0
+    
+    endpoints_file: str = "endpoints.json"
+    endpoints_reload_interval: float = 2.0
+    
     monitor_interval: int = 60
     request_timeout: int = 10
     max_retries: int = 3
+    max_concurrency: int = 100
+    max_concurrency_per_host: int = 10
+    retry_base_delay: float = 1.0
+    retry_max_delay: float = 10.0
+    retry_deadline: float = 0
+    
+    circuit_failure_threshold: int = 3
+    circuit_open_seconds: float = 30.0
+    circuit_max_open_seconds: float = 600.0
+    circuit_probe_timeout: float = 2.0
+    
+    history_db: str = "monitor_history.db"
+    history_batch_size: int = 500
+    history_flush_interval: float = 5.0
+    history_retention_raw_days: float = 2
+    history_retention_1m_days: float = 14
+    history_retention_1h_days: float = 90
+    history_retention_1d_days: float = 730
+    
+    alert_flush_interval: float = 5.0
+    alert_max_batch: int = 100
+    
+    notifier_http2: bool = True
+    notifier_timeout: float = 10.0
+    notifier_max_connections: int = 20
+    notifier_max_keepalive: int = 10
+    notifier_keepalive_expiry: float = 60.0
+    notifier_spill_file: str = "notifier_spill.jsonl"
+    notifier_max_attempts: int = 10
+    notifier_retry_base: float = 1.0
+    notifier_retry_max: float = 300.0
+    
+    dashboard_host: str = "0.0.0.0"
+    dashboard_port: int = 5000
+    
+    metrics_host: str = "0.0.0.0"
+    metrics_port: int = 0
+    
+    cluster_address: str = "sentinel.sock"
+    cluster_virtual_nodes: int = 64
+    cluster_heartbeat_interval: float = 5.0
+    cluster_heartbeat_timeout: float = 15.0
     
     telegram_bot_token: str = ""
     telegram_chat_id: str = ""
@@ -21,6 +77,8 @@ class Settings(BaseSettings):
     smtp_port: int = 587
     smtp_user: str = ""
     smtp_password: str = ""
+    smtp_use_tls: bool = True
+    smtp_timeout: int = 10
     alert_email: str = ""
 
 
@@ -0,0 +1,212 @@
+import asyncio
+import signal
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from app.core.config import settings
+from app.core.loader import EndpointLoader, EntryError, signature
+from app.core.logger import setup_logger
+from app.core.models import EndpointConfig
+
+logger = setup_logger(__name__)
+
+
+MAX_LOGGED_ERRORS = 20
+
+
+def log_load_errors(errors: list[EntryError]) -> None:
+    for error in errors[:MAX_LOGGED_ERRORS]:
+        logger.error(f"Endpoint inválido em {error}")
+    if len(errors) > MAX_LOGGED_ERRORS:
+        logger.error(f"... e mais {len(errors) - MAX_LOGGED_ERRORS} endpoints inválidos")
+
+
+def load_endpoints(
+    file_path: Optional[str] = None,
+    loader: Optional[EndpointLoader] = None,
+    watcher: Optional["EndpointConfigWatcher"] = None
+) -> list[EndpointConfig]:
+    if watcher is not None:
+        loader = watcher.loader
+    loader = loader or EndpointLoader(file_path or settings.endpoints_file)
+    
+    if not loader.path.exists():
+        logger.warning(f"Arquivo de configuração {loader.path} não encontrado")
+        return []
+    
+    if watcher is not None:
+        # Carrega pelo watcher para que a primeira recarga já conheça as versões válidas
+        try:
+            endpoints = watcher.load()
+        except ValueError as e:
+            logger.error(f"Erro ao carregar {loader.path}: {e}")
+            return []
+    else:
+        result = loader.load()
+        log_load_errors(result.errors)
+        endpoints = result.endpoints
+    
+    logger.info(f"Carregados {len(endpoints)} endpoints para monitoramento")
+    return endpoints
+
+
+@dataclass
+class EndpointDiff:
+    added: list[EndpointConfig] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: list[EndpointConfig] = field(default_factory=list)
+    
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+class EndpointRegistry:
+    def __init__(self, endpoints: Iterable[EndpointConfig] = ()):
+        self._endpoints: dict[str, EndpointConfig] = {}
+        for endpoint in endpoints:
+            self.add(endpoint)
+    
+    def __len__(self) -> int:
+        return len(self._endpoints)
+    
+    def __contains__(self, endpoint_id: str) -> bool:
+        return endpoint_id in self._endpoints
+    
+    def __iter__(self) -> Iterator[EndpointConfig]:
+        return iter(self._endpoints.values())
+    
+    def add(self, endpoint: EndpointConfig) -> bool:
+        if endpoint.name in self._endpoints:
+            logger.warning(f"Endpoint duplicado ignorado: {endpoint.name}")
+            return False
+        
+        self.replace(endpoint)
+        return True
+    
+    def replace(self, endpoint: EndpointConfig) -> None:
+        # Lê as cached_property uma vez aqui, ao registrar, para que str(url) e o host
+        # não sejam calculados no caminho quente de cada verificação
+        _ = endpoint.target
+        _ = endpoint.host
+        self._endpoints[endpoint.name] = endpoint
+    
+    def remove(self, endpoint_id: str) -> Optional[EndpointConfig]:
+        return self._endpoints.pop(endpoint_id, None)
+    
+    def get(self, endpoint_id: str) -> Optional[EndpointConfig]:
+        return self._endpoints.get(endpoint_id)
+    
+    def url_for(self, endpoint_id: str) -> str:
+        endpoint = self._endpoints.get(endpoint_id)
+        return endpoint.target if endpoint else ""
+    
+    def tags_for(self, endpoint_id: str) -> list[str]:
+        endpoint = self._endpoints.get(endpoint_id)
+        return endpoint.tags if endpoint else []
+    
+    def diff(self, endpoints: Iterable[EndpointConfig]) -> EndpointDiff:
+        diff = EndpointDiff()
+        seen: set[str] = set()
+        
+        for endpoint in endpoints:
+            if endpoint.name in seen:
+                logger.warning(f"Endpoint duplicado ignorado: {endpoint.name}")
+                continue
+            seen.add(endpoint.name)
+            
+            current = self._endpoints.get(endpoint.name)
+            if current is None:
+                diff.added.append(endpoint)
+            elif current is not endpoint and current != endpoint:
+                diff.changed.append(endpoint)
+        
+        diff.removed = [name for name in self._endpoints if name not in seen]
+        return diff
+
+
+class EndpointConfigWatcher:
+    def __init__(self, file_path: Optional[str] = None, poll_interval: Optional[float] = None):
+        self.loader = EndpointLoader(file_path or settings.endpoints_file)
+        self.poll_interval = (
+            settings.endpoints_reload_interval if poll_interval is None else poll_interval
+        )
+        self._signature: Optional[tuple[tuple[str, int, int], ...]] = None
+        self._current: dict[str, EndpointConfig] = {}
+        self._reload_requested = asyncio.Event()
+    
+    @property
+    def config_file(self) -> Path:
+        return self.loader.path
+    
+    def _stat(self) -> tuple[tuple[str, int, int], ...]:
+        return signature(self.loader.path)
+    
+    def load(self) -> list[EndpointConfig]:
+        self._signature = self._stat()
+        result = self.loader.load()
+        log_load_errors(result.errors)
+        
+        if not result.complete:
+            raise ValueError("arquivo de configuração ilegível")
+        
+        # Entradas inválidas mantêm a última versão válida em vez de derrubar o endpoint
+        endpoints = result.endpoints
+        names = {endpoint.name for endpoint in endpoints}
+        for error in result.errors:
+            if error.name is None or error.name in names:
+                continue
+            previous = self._current.get(error.name)
+            if previous is not None:
+                endpoints.append(previous)
+                names.add(error.name)
+        
+        self._current = {endpoint.name: endpoint for endpoint in endpoints}
+        return endpoints
+    
+    def request_reload(self) -> None:
+        self._reload_requested.set()
+    
+    def _install_signal_handler(self) -> None:
+        if not hasattr(signal, "SIGHUP"):
+            return
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, self.request_reload)
+        except (NotImplementedError, RuntimeError, ValueError):
+            logger.warning("SIGHUP indisponível; recarga apenas por alteração do arquivo")
+    
+    def _remove_signal_handler(self) -> None:
+        if hasattr(signal, "SIGHUP"):
+            try:
+                asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+    
+    async def run(self, on_change: Callable[[list[EndpointConfig]], object]) -> None:
+        self._install_signal_handler()
+        if self._signature is None:
+            self._signature = self._stat()
+        
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        self._reload_requested.wait(),
+                        timeout=self.poll_interval or None
+                    )
+                except TimeoutError:
+                    if self._stat() == self._signature:
+                        continue
+                
+                self._reload_requested.clear()
+                try:
+                    endpoints = await asyncio.to_thread(self.load)
+                except Exception as e:
+                    logger.error(
+                        f"Erro ao recarregar {self.config_file}; mantendo configuração atual: {e}"
+                    )
+                    continue
+                
+                on_change(endpoints)
+        finally:
+            self._remove_signal_handler()
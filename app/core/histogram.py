@@ -0,0 +1,111 @@
+import math
+from time import time
+from typing import Any, Optional
+
+MIN_LATENCY = 0.001
+MAX_LATENCY = 300.0
+GROWTH = 1.05
+
+_LOG_GROWTH = math.log(GROWTH)
+MAX_BUCKET = int(math.log(MAX_LATENCY / MIN_LATENCY) / _LOG_GROWTH) + 1
+
+
+class LatencyHistogram:
+    __slots__ = ("count", "counts")
+    
+    def __init__(self) -> None:
+        self.counts: dict[int, int] = {}
+        self.count = 0
+    
+    @staticmethod
+    def bucket_for(seconds: float) -> int:
+        if seconds <= MIN_LATENCY:
+            return 0
+        return min(int(math.log(seconds / MIN_LATENCY) / _LOG_GROWTH) + 1, MAX_BUCKET)
+    
+    @staticmethod
+    def value_for(bucket: int) -> float:
+        if bucket == 0:
+            return MIN_LATENCY
+        return MIN_LATENCY * math.pow(GROWTH, bucket - 0.5)
+    
+    def record(self, seconds: float) -> None:
+        bucket = self.bucket_for(seconds)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+    
+    def merge(self, other: "LatencyHistogram") -> None:
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+    
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        
+        rank = max(math.ceil(q * self.count), 1)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return self.value_for(bucket)
+        return self.value_for(max(self.counts))
+
+
+class SlidingLatencyWindow:
+    __slots__ = ("_histograms", "_starts", "slot_seconds", "slots")
+    
+    def __init__(self, slot_seconds: float = 300, slots: int = 12):
+        self.slot_seconds = slot_seconds
+        self.slots = slots
+        self._histograms = [LatencyHistogram() for _ in range(slots)]
+        self._starts = [0.0] * slots
+    
+    def _slot(self, now: float) -> LatencyHistogram:
+        start = now // self.slot_seconds * self.slot_seconds
+        index = int(start // self.slot_seconds) % self.slots
+        
+        if self._starts[index] != start:
+            self._histograms[index] = LatencyHistogram()
+            self._starts[index] = start
+        return self._histograms[index]
+    
+    def record(self, seconds: float, now: Optional[float] = None) -> None:
+        self._slot(now or time()).record(seconds)
+    
+    def merged(self, now: Optional[float] = None) -> LatencyHistogram:
+        now = now or time()
+        oldest = now - self.slot_seconds * self.slots
+        merged = LatencyHistogram()
+        
+        for start, histogram in zip(self._starts, self._histograms):
+            if start > oldest:
+                merged.merge(histogram)
+        return merged
+
+
+class LatencyTracker:
+    def __init__(self, slot_seconds: float = 300, slots: int = 12):
+        self.slot_seconds = slot_seconds
+        self.slots = slots
+        self.windows: dict[str, SlidingLatencyWindow] = {}
+    
+    def record(self, endpoint: str, seconds: float, now: Optional[float] = None) -> None:
+        window = self.windows.get(endpoint)
+        if window is None:
+            window = self.windows[endpoint] = SlidingLatencyWindow(self.slot_seconds, self.slots)
+        window.record(seconds, now)
+    
+    def percentiles(self, endpoint: str, now: Optional[float] = None) -> dict[str, Any]:
+        window = self.windows.get(endpoint)
+        histogram = window.merged(now) if window else LatencyHistogram()
+        
+        return {
+            "count": histogram.count,
+            "p50": histogram.quantile(0.50),
+            "p95": histogram.quantile(0.95),
+            "p99": histogram.quantile(0.99)
+        }
+    
+    def all_percentiles(self, now: Optional[float] = None) -> dict[str, dict[str, Any]]:
+        return {endpoint: self.percentiles(endpoint, now) for endpoint in self.windows}
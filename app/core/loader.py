@@ -0,0 +1,264 @@
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Iterator, Optional
+
+from pydantic import TypeAdapter, ValidationError
+
+from app.core.models import EndpointConfig
+
+try:
+    import yaml
+    YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+except ImportError:
+    yaml = None
+
+ENDPOINT_LIST = TypeAdapter(list[EndpointConfig])
+BATCH_SIZE = 1000
+CHUNK_SIZE = 1 << 16
+WHITESPACE = re.compile(r"\s*")
+FORMATS = {
+    ".json": "json",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".yaml": "yaml",
+    ".yml": "yaml"
+}
+
+
+@dataclass
+class EntryError:
+    source: str
+    index: Optional[int]
+    name: Optional[str]
+    message: str
+    
+    def __str__(self) -> str:
+        where = self.source if self.index is None else f"{self.source}[{self.index}]"
+        label = f" ({self.name})" if self.name else ""
+        return f"{where}{label}: {self.message}"
+
+
+@dataclass
+class LoadResult:
+    endpoints: list[EndpointConfig] = field(default_factory=list)
+    errors: list[EntryError] = field(default_factory=list)
+    
+    @property
+    def complete(self) -> bool:
+        return not any(error.index is None for error in self.errors)
+
+
+def source_files(path: Path) -> list[Path]:
+    if path.is_dir():
+        return sorted(
+            child for child in path.iterdir()
+            if child.is_file() and child.suffix.lower() in FORMATS
+        )
+    return [path] if path.exists() else []
+
+
+def signature(path: Path) -> tuple[tuple[str, int, int], ...]:
+    entries = []
+    for file in source_files(path):
+        try:
+            stat = file.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((file.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(entries)
+
+
+def iter_json_array(f: IO[str], chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[Any, str]]:
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    consumed = 0
+    # Próximo token aceito: "[" (open), valor ou "]" (first), valor (value),
+    # "," ou "]" (separator) e, depois do "]", só espaços até o fim (end)
+    expect = "open"
+    eof = False
+    
+    while True:
+        whitespace = WHITESPACE.match(buffer, position)
+        if whitespace is not None:
+            position = whitespace.end()
+        
+        if position < len(buffer):
+            char = buffer[position]
+            if expect == "open":
+                if char != "[":
+                    raise ValueError("O arquivo deve conter uma lista de endpoints")
+                expect = "first"
+                position += 1
+                continue
+            
+            if expect == "end":
+                raise ValueError(
+                    f"Conteúdo após o fim da lista de endpoints (posição {consumed + position})"
+                )
+            
+            if expect == "separator" or (expect == "first" and char == "]"):
+                if char == "]":
+                    expect = "end"
+                elif char == "," and expect == "separator":
+                    expect = "value"
+                else:
+                    raise ValueError(f"Esperava ',' ou ']' na posição {consumed + position}")
+                position += 1
+                continue
+            
+            if char in ",]":
+                raise ValueError(f"Esperava um endpoint na posição {consumed + position}")
+            
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # Um valor no fim do buffer pode estar truncado; só confia nele com mais dados
+                if end < len(buffer) or eof:
+                    yield item, buffer[position:end]
+                    position = end
+                    expect = "separator"
+                    continue
+        elif eof:
+            if expect == "end":
+                return
+            raise ValueError("Lista de endpoints incompleta")
+        
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        consumed += position
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def iter_ndjson(f: IO[str]) -> Iterator[tuple[int, Any, str]]:
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line), line
+        except json.JSONDecodeError as e:
+            yield line_number, e, line
+
+
+def iter_entries(file: Path) -> Iterator[tuple[int, Any, str]]:
+    kind = FORMATS.get(file.suffix.lower(), "json")
+    
+    with open(file, "r", encoding="utf-8") as f:
+        if kind == "ndjson":
+            yield from iter_ndjson(f)
+        elif kind == "yaml":
+            if yaml is None:
+                raise ValueError("Instale PyYAML para carregar endpoints em YAML")
+            data = yaml.load(f, Loader=YamlLoader) or []
+            if not isinstance(data, list):
+                raise ValueError("O arquivo deve conter uma lista de endpoints")
+            for index, entry in enumerate(data):
+                yield index, entry, json.dumps(entry, sort_keys=True, default=str)
+        else:
+            for index, (entry, text) in enumerate(iter_json_array(f)):
+                yield index, entry, text
+
+
+def content_key(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class EndpointLoader:
+    def __init__(self, path: str, batch_size: int = BATCH_SIZE):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._cache: dict[str, EndpointConfig] = {}
+    
+    def load(self) -> LoadResult:
+        result = LoadResult()
+        slots: list[Optional[EndpointConfig]] = []
+        cache: dict[str, EndpointConfig] = {}
+        
+        for file in source_files(self.path):
+            try:
+                self._load_file(file, slots, result, cache)
+            except (OSError, ValueError) as e:
+                result.errors.append(EntryError(str(file), None, None, str(e)))
+            except Exception as e:
+                if yaml is not None and isinstance(e, yaml.YAMLError):
+                    result.errors.append(EntryError(str(file), None, None, str(e)))
+                else:
+                    raise
+        
+        self._cache = cache
+        result.endpoints = [endpoint for endpoint in slots if endpoint is not None]
+        return result
+    
+    def _load_file(
+        self,
+        file: Path,
+        slots: list[Optional[EndpointConfig]],
+        result: LoadResult,
+        cache: dict[str, EndpointConfig]
+    ) -> None:
+        source = str(file)
+        pending: list[tuple[int, int, dict[str, Any], str]] = []
+        
+        for index, entry, text in iter_entries(file):
+            if isinstance(entry, Exception):
+                result.errors.append(EntryError(source, index, None, f"JSON inválido: {entry}"))
+                continue
+            if not isinstance(entry, dict):
+                result.errors.append(EntryError(source, index, None, "Entrada deve ser um objeto"))
+                continue
+            
+            # A chave é o texto original da entrada, sem re-serializar
+            key = content_key(text)
+            cached = cache.get(key) or self._cache.get(key)
+            if cached is not None:
+                cache[key] = cached
+                slots.append(cached)
+                continue
+            
+            slots.append(None)
+            pending.append((len(slots) - 1, index, entry, key))
+            if len(pending) >= self.batch_size:
+                self._validate(source, pending, slots, result, cache)
+                pending = []
+        
+        if pending:
+            self._validate(source, pending, slots, result, cache)
+    
+    @staticmethod
+    def _validate(
+        source: str,
+        pending: list[tuple[int, int, dict[str, Any], str]],
+        slots: list[Optional[EndpointConfig]],
+        result: LoadResult,
+        cache: dict[str, EndpointConfig]
+    ) -> None:
+        try:
+            configs = ENDPOINT_LIST.validate_python([entry for _, _, entry, _ in pending])
+        except ValidationError as e:
+            failed: dict[int, list[str]] = {}
+            for error in e.errors(include_url=False):
+                position, *location = error["loc"]
+                field_name = ".".join(str(part) for part in location)
+                message = f"{field_name}: {error['msg']}" if field_name else error["msg"]
+                failed.setdefault(int(position), []).append(message)
+            
+            for position, messages in failed.items():
+                _, index, entry, _ = pending[position]
+                result.errors.append(
+                    EntryError(source, index, entry.get("name"), "; ".join(messages))
+                )
+            
+            pending = [item for position, item in enumerate(pending) if position not in failed]
+            configs = ENDPOINT_LIST.validate_python([entry for _, _, entry, _ in pending])
+        
+        for (slot, _, _, key), config in zip(pending, configs):
+            slots[slot] = config
+            cache[key] = config
@@ -1,31 +1,170 @@
+import atexit
+import json
 import logging
+import queue
 import sys
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
 
+from app.core.config import settings
 
-def setup_logger(name: str) -> logging.Logger:
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+TEXT_FORMAT = "[%(asctime)s] %(levelname)s - %(name)s - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def make_formatter(kind: str) -> logging.Formatter:
+    if kind == "json":
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
+
+
+class SizeAndTimeRotatingFileHandler(RotatingFileHandler):
+    def __init__(self, filename: str, max_bytes: int, backup_count: int, interval: float):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        self.interval = interval
+        self.rollover_at = self._next_rollover(time.time())
     
-    if logger.handlers:
-        return logger
+    def _next_rollover(self, now: float) -> float:
+        if self.interval <= 0:
+            return float("inf")
+        # Alinhado ao relógio (UTC): com 86400 s o arquivo vira à meia-noite
+        return (now // self.interval + 1) * self.interval
+    
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if record.created >= self.rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+    
+    def doRollover(self) -> None:
+        super().doRollover()
+        self.rollover_at = self._next_rollover(time.time())
+
+
+class RateLimitFilter(logging.Filter):
+    def __init__(self, limit: int, window: float):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.dropped = 0
+        # Chave é o ponto de chamada, não a mensagem: logs com f-string variam a cada endpoint
+        self._windows: dict[tuple[str, int], list[float]] = {}
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Erros nunca são suprimidos: num incidente, cada "DOWN" e alerta descartado importa
+        if self.limit <= 0 or record.levelno >= logging.ERROR:
+            return True
+        
+        key = (record.pathname, record.lineno)
+        state = self._windows.get(key)
+        if state is None or record.created - state[0] >= self.window:
+            suppressed = state[2] if state else 0
+            self._windows[key] = [record.created, 1, 0]
+            if suppressed:
+                record.msg = f"{record.msg} [+{suppressed} mensagens semelhantes suprimidas]"
+            return True
+        
+        if state[1] < self.limit:
+            state[1] += 1
+            return True
+        
+        state[2] += 1
+        self.dropped += 1
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    def __init__(self, log_queue: queue.Queue[logging.LogRecord]):
+        super().__init__(log_queue)
+        self.dropped = 0
     
-    formatter = logging.Formatter(
-        "[%(asctime)s] %(levelname)s - %(name)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A formatação fica para a thread do listener; o event loop só enfileira
+        return record
     
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    def __init__(self) -> None:
+        self.queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=settings.log_queue_size)
+        self.handler = NonBlockingQueueHandler(self.queue)
+        self.rate_limit = RateLimitFilter(settings.log_rate_limit, settings.log_rate_window)
+        self.handler.addFilter(self.rate_limit)
+        
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(make_formatter(settings.log_format))
+        handlers: list[logging.Handler] = [console_handler]
+        
+        if settings.log_file:
+            log_file = Path(settings.log_file)
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+            file_handler = SizeAndTimeRotatingFileHandler(
+                str(log_file),
+                settings.log_max_bytes,
+                settings.log_backup_count,
+                settings.log_rotate_interval
+            )
+            file_handler.setFormatter(make_formatter(settings.log_file_format))
+            handlers.append(file_handler)
+        
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.stop)
     
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+    @property
+    def dropped(self) -> dict[str, int]:
+        return {"rate_limit": self.rate_limit.dropped, "queue_full": self.handler.dropped}
     
-    log_file = log_dir / f"sentinel_{datetime.now().strftime('%Y%m%d')}.log"
-    file_handler = logging.FileHandler(log_file, encoding="utf-8")
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    def stop(self) -> None:
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+
+_pipeline: Optional[LogPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline() -> LogPipeline:
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = LogPipeline()
+    return _pipeline
+
+
+def setup_logger(name: str) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.setLevel(settings.log_level.upper())
+    
+    if logger.handlers:
+        return logger
     
+    # Todos os loggers compartilham um QueueHandler; disco e terminal ficam na thread do listener
+    logger.addHandler(get_pipeline().handler)
     return logger
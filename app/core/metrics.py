@@ -0,0 +1,339 @@
+import asyncio
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Any, Callable, Generic, Iterator, Optional, Sequence, TypeVar
+
+from app.core.logger import get_pipeline, setup_logger
+from app.core.models import ProbeResult
+
+logger = setup_logger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{escape_label(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+# Os valores são atualizados só pelo event loop, então um atributo simples basta:
+# sem locks nem atomics no caminho quente. A exportação lê cópias das listas.
+class CounterValue:
+    __slots__ = ("value",)
+    
+    def __init__(self) -> None:
+        self.value = 0.0
+    
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class GaugeValue:
+    __slots__ = ("function", "value")
+    
+    def __init__(self) -> None:
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+    
+    def set(self, value: float) -> None:
+        self.value = value
+    
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+    
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+    
+    def get(self) -> float:
+        if self.function is not None:
+            try:
+                return self.function()
+            except Exception:
+                return math.nan
+        return self.value
+
+
+class HistogramValue:
+    __slots__ = ("bounds", "count", "counts", "sum")
+    
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+ChildT = TypeVar("ChildT")
+
+
+class Metric(ABC, Generic[ChildT]):
+    kind = "untyped"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional["MetricsRegistry"] = None
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], ChildT] = {}
+        self._default: Optional[ChildT] = None if self.labelnames else self.labels()
+        (registry or REGISTRY).register(self)
+    
+    @abstractmethod
+    def _new_child(self) -> ChildT:
+        pass
+    
+    @property
+    def _unlabelled(self) -> ChildT:
+        if self._default is None:
+            raise ValueError(f"{self.name} exige os labels {self.labelnames}: use .labels(...)")
+        return self._default
+    
+    def labels(self, *values: str) -> ChildT:
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} espera os labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+    
+    def remove(self, *values: str) -> None:
+        self._children.pop(values, None)
+    
+    def clear(self) -> None:
+        self._children.clear()
+        if self._default is not None:
+            self._children[()] = self._default
+    
+    @abstractmethod
+    def _samples(self, labels: str, child: ChildT) -> Iterator[str]:
+        pass
+    
+    def collect(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for values, child in list(self._children.items()):
+            yield from self._samples(format_labels(self.labelnames, values), child)
+
+
+class Counter(Metric[CounterValue]):
+    kind = "counter"
+    
+    def _new_child(self) -> CounterValue:
+        return CounterValue()
+    
+    def inc(self, amount: float = 1) -> None:
+        self._unlabelled.inc(amount)
+    
+    def _samples(self, labels: str, child: CounterValue) -> Iterator[str]:
+        yield f"{self.name}{labels} {format_value(child.value)}"
+
+
+class Gauge(Metric[GaugeValue]):
+    kind = "gauge"
+    
+    def _new_child(self) -> GaugeValue:
+        return GaugeValue()
+    
+    def set(self, value: float) -> None:
+        self._unlabelled.set(value)
+    
+    def inc(self, amount: float = 1) -> None:
+        self._unlabelled.inc(amount)
+    
+    def dec(self, amount: float = 1) -> None:
+        self._unlabelled.dec(amount)
+    
+    def set_function(self, function: Optional[Callable[[], float]]) -> None:
+        self._unlabelled.function = function
+    
+    def _samples(self, labels: str, child: GaugeValue) -> Iterator[str]:
+        yield f"{self.name}{labels} {format_value(child.get())}"
+
+
+class Histogram(Metric[HistogramValue]):
+    kind = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        registry: Optional["MetricsRegistry"] = None
+    ) -> None:
+        self.bounds = tuple(sorted(buckets))
+        self._bound_labels = [format_value(bound) for bound in self.bounds] + ["+Inf"]
+        super().__init__(name, documentation, labelnames, registry)
+    
+    def _new_child(self) -> HistogramValue:
+        return HistogramValue(self.bounds)
+    
+    def observe(self, value: float) -> None:
+        self._unlabelled.observe(value)
+    
+    def _samples(self, labels: str, child: HistogramValue) -> Iterator[str]:
+        prefix = labels[:-1] + "," if labels else "{"
+        cumulative = 0
+        for bound, count in zip(self._bound_labels, list(child.counts)):
+            cumulative += count
+            yield f'{self.name}_bucket{prefix}le="{bound}"}} {cumulative}'
+        yield f"{self.name}_sum{labels} {format_value(child.sum)}"
+        yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric[Any]] = {}
+    
+    def register(self, metric: Metric[Any]) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrica duplicada: {metric.name}")
+        self._metrics[metric.name] = metric
+    
+    def get(self, name: str) -> Optional[Metric[Any]]:
+        return self._metrics.get(name)
+    
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.collect())
+        lines.append("")
+        return "\n".join(lines)
+
+
+REGISTRY = MetricsRegistry()
+
+
+PROBES = Counter("sentinel_probes_total", "Verificações concluídas por status", ["status"])
+PROBE_RETRIES = Counter("sentinel_probe_retries_total", "Novas tentativas após falha de requisição")
+PROBE_ERRORS = Counter(
+    "sentinel_probe_errors_total", "Falhas de requisição por tipo", ["reason"]
+)
+ENDPOINT_UP = Gauge(
+    "sentinel_endpoint_up", "1 se a última verificação do endpoint foi healthy", ["endpoint"]
+)
+ENDPOINT_LATENCY = Gauge(
+    "sentinel_endpoint_latency_seconds", "Tempo de resposta da última verificação", ["endpoint"]
+)
+PROBE_DURATION = Histogram(
+    "sentinel_probe_duration_seconds", "Tempo de resposta das verificações", ["endpoint"]
+)
+CIRCUITS_OPEN = Gauge("sentinel_circuits_open", "Endpoints com circuito aberto ou meio-aberto")
+CIRCUIT_SKIPPED = Counter(
+    "sentinel_circuit_skipped_total", "Verificações evitadas por circuito aberto"
+)
+
+SCHEDULER_LAG = Histogram(
+    "sentinel_scheduler_lag_seconds",
+    "Atraso entre o horário previsto e o disparo de cada verificação",
+    buckets=LAG_BUCKETS
+)
+SCHEDULER_QUEUE = Gauge("sentinel_scheduler_queue_size", "Entradas no heap do agendador")
+SCHEDULER_BATCHES = Gauge(
+    "sentinel_scheduler_inflight_batches", "Lotes de verificação em andamento"
+)
+RESULT_QUEUE = Gauge("sentinel_result_queue_depth", "Resultados aguardando os sinks")
+
+ALERTS = Counter(
+    "sentinel_alerts_total", "Entregas de alerta por canal e resultado", ["channel", "outcome"]
+)
+ALERT_DURATION = Histogram(
+    "sentinel_alert_delivery_seconds", "Duração de cada tentativa de entrega de alerta", ["channel"]
+)
+ALERT_QUEUE = Gauge("sentinel_alert_queue_depth", "Alertas aguardando entrega")
+
+STATS_UPDATES = Counter("sentinel_stats_updates_total", "Lotes registrados pelo StatsTracker")
+STATS_COMPACTIONS = Counter(
+    "sentinel_stats_compactions_total", "Compactações do log de estatísticas"
+)
+STATS_UPTIME = Gauge("sentinel_uptime_ratio", "Fração de verificações healthy acumulada")
+
+LOG_DROPPED = Gauge(
+    "sentinel_log_records_dropped", "Mensagens de log descartadas desde o início", ["reason"]
+)
+for _reason in ("rate_limit", "queue_full"):
+    LOG_DROPPED.labels(_reason).function = lambda reason=_reason: get_pipeline().dropped[reason]
+
+
+_endpoint_children: dict[str, tuple[GaugeValue, GaugeValue, HistogramValue]] = {}
+
+
+def record_probe(result: ProbeResult) -> None:
+    children = _endpoint_children.get(result.endpoint)
+    if children is None:
+        name = result.endpoint
+        children = _endpoint_children[name] = (
+            ENDPOINT_UP.labels(name), ENDPOINT_LATENCY.labels(name), PROBE_DURATION.labels(name)
+        )
+    
+    up, latency, duration = children
+    up.value = 1 if result.is_healthy else 0
+    latency.value = result.response_time
+    duration.observe(result.response_time)
+    PROBES.labels(result.status.value).value += 1
+
+
+def forget_endpoint(name: str) -> None:
+    _endpoint_children.pop(name, None)
+    for metric in (ENDPOINT_UP, ENDPOINT_LATENCY, PROBE_DURATION):
+        metric.remove(name)
+
+
+async def render() -> str:
+    # Com dezenas de milhares de endpoints a serialização leva tempo; roda fora do loop
+    return await asyncio.to_thread(REGISTRY.render)
+
+
+async def _handle_scrape(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        request = await reader.readuntil(b"\r\n\r\n")
+        path = request.split(b" ", 2)[1] if request.count(b" ") >= 2 else b""
+        
+        if path.split(b"?")[0] == b"/metrics":
+            status, content_type, body = "200 OK", CONTENT_TYPE, (await render()).encode()
+        else:
+            status, content_type, body = "404 Not Found", "text/plain", b"not found\n"
+        
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_metrics(host: str, port: int) -> None:
+    server = await asyncio.start_server(_handle_scrape, host, port)
+    logger.info(f"Métricas disponíveis em http://{host}:{port}/metrics")
+    async with server:
+        await server.serve_forever()
@@ -1,8 +1,12 @@
+import random
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
+from time import time
 from typing import Optional
 
-from pydantic import BaseModel, HttpUrl, field_validator
+from pydantic import BaseModel, Field, HttpUrl, field_validator, model_validator
 
 
 class HealthStatus(str, Enum):
@@ -11,12 +15,66 @@ class HealthStatus(str, Enum):
     DOWN = "down"
 
 
+class RetryPolicy(BaseModel):
+    max_attempts: Optional[int] = None
+    base_delay: float = 1.0
+    max_delay: float = 10.0
+    attempt_timeout: Optional[float] = None
+    deadline: Optional[float] = None
+    retry_on: list[int] = Field(default_factory=list)
+    
+    @field_validator("max_attempts")
+    @classmethod
+    def validate_max_attempts(cls, v: Optional[int]) -> Optional[int]:
+        if v is not None and v < 1:
+            raise ValueError("max_attempts must be at least 1")
+        return v
+    
+    @field_validator("base_delay", "max_delay")
+    @classmethod
+    def validate_delay(cls, v: float) -> float:
+        if v < 0:
+            raise ValueError("Delays must not be negative")
+        return v
+    
+    @field_validator("attempt_timeout", "deadline")
+    @classmethod
+    def validate_timeout(cls, v: Optional[float]) -> Optional[float]:
+        if v is not None and v <= 0:
+            raise ValueError("Timeouts must be positive")
+        return v
+    
+    @model_validator(mode="after")
+    def validate_delay_range(self) -> "RetryPolicy":
+        if self.max_delay < self.base_delay:
+            raise ValueError("max_delay must not be lower than base_delay")
+        return self
+    
+    def next_delay(self, previous: float) -> float:
+        # Decorrelated jitter: cada espera sorteia entre a base e 3x a anterior,
+        # então endpoints que falham juntos não voltam a bater juntos
+        upper = max(previous, self.base_delay) * 3
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+
 class EndpointConfig(BaseModel):
     name: str
     url: HttpUrl
     method: str = "GET"
     expected_status: int = 200
     timeout: int = 10
+    interval: Optional[float] = None
+    jitter: float = 0.0
+    tags: list[str] = Field(default_factory=list)
+    retry: Optional[RetryPolicy] = None
+    
+    @cached_property
+    def target(self) -> str:
+        return str(self.url)
+    
+    @cached_property
+    def host(self) -> str:
+        return self.url.host or ""
     
     @field_validator("method")
     @classmethod
@@ -25,6 +83,20 @@ class EndpointConfig(BaseModel):
         if v.upper() not in allowed:
             raise ValueError(f"Method must be one of {allowed}")
         return v.upper()
+    
+    @field_validator("interval")
+    @classmethod
+    def validate_interval(cls, v: Optional[float]) -> Optional[float]:
+        if v is not None and v <= 0:
+            raise ValueError("Interval must be positive")
+        return v
+    
+    @field_validator("jitter")
+    @classmethod
+    def validate_jitter(cls, v: float) -> float:
+        if v < 0:
+            raise ValueError("Jitter must not be negative")
+        return v
 
 
 class HealthCheckResult(BaseModel):
@@ -34,8 +106,39 @@ class HealthCheckResult(BaseModel):
     response_time: float
     status_code: Optional[int] = None
     error_message: Optional[str] = None
-    timestamp: datetime = datetime.now()
+    timestamp: datetime = Field(default_factory=datetime.now)
     
     @property
     def is_healthy(self) -> bool:
         return self.status == HealthStatus.HEALTHY
+    
+    @property
+    def checked_at(self) -> float:
+        return self.timestamp.timestamp()
+
+
+@dataclass(slots=True)
+class ProbeResult:
+    endpoint: str
+    url: str
+    status: HealthStatus
+    response_time: float
+    status_code: Optional[int] = None
+    error_message: Optional[str] = None
+    checked_at: float = field(default_factory=time)
+    
+    @property
+    def is_healthy(self) -> bool:
+        return self.status is HealthStatus.HEALTHY
+    
+    def to_model(self) -> HealthCheckResult:
+        # Dados já tipados pelo checker: converte sem revalidar
+        return HealthCheckResult.model_construct(
+            endpoint=self.endpoint,
+            url=self.url,
+            status=self.status,
+            response_time=self.response_time,
+            status_code=self.status_code,
+            error_message=self.error_message,
+            timestamp=datetime.fromtimestamp(self.checked_at)
+        )
@@ -1,7 +1,17 @@
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Sequence
 import json
+import os
+
+from app.core.histogram import LatencyTracker
+from app.core.logger import setup_logger
+from app.core.metrics import STATS_COMPACTIONS, STATS_UPDATES, STATS_UPTIME
+from app.core.models import HealthCheckResult, ProbeResult
+
+logger = setup_logger(__name__)
 
 
 @dataclass
@@ -15,50 +25,128 @@ class MonitorStats:
 
 
 class StatsTracker:
-    def __init__(self, stats_file: str = "monitor_stats.json"):
+    def __init__(self, stats_file: str = "monitor_stats.json", compact_every: int = 1000):
         self.stats_file = Path(stats_file)
+        self.log_file = self.stats_file.with_name(self.stats_file.name + ".log")
+        self.compact_every = compact_every
+        self._sequence = 0
+        self._snapshot_sequence = 0
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stats-writer")
+        self._torn_log = False
         self.stats = self._load_stats()
+        if self._torn_log:
+            # Novas entradas depois de uma linha cortada seriam ignoradas no próximo replay
+            self._snapshot_sequence = self._sequence
+            self._writer.submit(self._compact, self._sequence, asdict(self.stats))
+        self.latency = LatencyTracker()
     
     def _load_stats(self) -> MonitorStats:
+        stats = MonitorStats()
+        
         if self.stats_file.exists():
             try:
                 with open(self.stats_file, "r") as f:
                     data = json.load(f)
-                return MonitorStats(**data)
-            except Exception:
-                pass
-        return MonitorStats()
+                if "stats" in data:
+                    self._sequence = self._snapshot_sequence = data["sequence"]
+                    data = data["stats"]
+                stats = MonitorStats(**data)
+            except Exception as e:
+                logger.error(f"Snapshot de estatísticas inválido em {self.stats_file}: {e}")
+        
+        if self.log_file.exists():
+            with open(self.log_file, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Entrada incompleta ignorada em {self.log_file}")
+                        self._torn_log = True
+                        break
+                    if entry["seq"] <= self._sequence:
+                        continue
+                    self._apply(stats, entry)
+                    self._sequence = entry["seq"]
+        
+        return stats
+    
+    @staticmethod
+    def _apply(stats: MonitorStats, entry: dict[str, Any]) -> None:
+        stats.total_checks += entry["total"]
+        stats.healthy_count += entry["healthy"]
+        stats.degraded_count += entry["degraded"]
+        stats.down_count += entry["down"]
+        stats.average_response_time = entry["average"]
+        stats.last_check = entry["last"]
+    
+    def _append(self, line: str) -> None:
+        # Roda na thread do writer: o fsync não bloqueia o event loop
+        with open(self.log_file, "a") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
     
-    def _save_stats(self) -> None:
-        with open(self.stats_file, "w") as f:
-            json.dump(self.stats.__dict__, f, indent=2)
+    def _compact(self, sequence: int, snapshot: dict[str, Any]) -> None:
+        tmp_file = self.stats_file.with_name(self.stats_file.name + ".tmp")
+        with open(tmp_file, "w") as f:
+            json.dump({"sequence": sequence, "stats": snapshot}, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.stats_file)
+        self.log_file.write_text("")
     
-    def update(self, results: list) -> None:
+    def _save_stats(self, entry: dict[str, Any]) -> None:
+        self._writer.submit(self._append, json.dumps(entry) + "\n")
+        
+        if self._sequence - self._snapshot_sequence >= self.compact_every:
+            self._snapshot_sequence = self._sequence
+            STATS_COMPACTIONS.inc()
+            self._writer.submit(self._compact, self._sequence, asdict(self.stats))
+    
+    def flush(self) -> None:
+        self._writer.submit(lambda: None).result()
+    
+    def close(self) -> None:
+        if self._sequence > self._snapshot_sequence:
+            self._snapshot_sequence = self._sequence
+            self._writer.submit(self._compact, self._sequence, asdict(self.stats))
+        self._writer.shutdown(wait=True)
+    
+    def update(self, results: Sequence[HealthCheckResult | ProbeResult]) -> None:
         if not results:
             return
         
-        self.stats.total_checks += len(results)
+        entry: dict[str, Any] = {"total": len(results), "healthy": 0, "degraded": 0, "down": 0}
         
         for result in results:
             if result.status.value == "healthy":
-                self.stats.healthy_count += 1
+                entry["healthy"] += 1
             elif result.status.value == "degraded":
-                self.stats.degraded_count += 1
+                entry["degraded"] += 1
             else:
-                self.stats.down_count += 1
+                entry["down"] += 1
         
         avg_time = sum(r.response_time for r in results) / len(results)
         if self.stats.average_response_time == 0:
-            self.stats.average_response_time = avg_time
+            entry["average"] = avg_time
         else:
-            self.stats.average_response_time = (
+            entry["average"] = (
                 self.stats.average_response_time * 0.7 + avg_time * 0.3
             )
         
-        self.stats.last_check = datetime.now().isoformat()
-        self._save_stats()
+        entry["last"] = datetime.now().isoformat()
+        self._sequence += 1
+        entry["seq"] = self._sequence
+        
+        self._apply(self.stats, entry)
+        self._save_stats(entry)
+        STATS_UPDATES.inc()
+        STATS_UPTIME.set(self.stats.healthy_count / self.stats.total_checks)
     
     def get_uptime_percentage(self) -> float:
         if self.stats.total_checks == 0:
             return 0.0
         return (self.stats.healthy_count / self.stats.total_checks) * 100
+    
+    def get_latency_percentiles(self, endpoint: str) -> dict[str, Any]:
+        return self.latency.percentiles(endpoint)
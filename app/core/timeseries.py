@@ -0,0 +1,228 @@
+import asyncio
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.core.logger import setup_logger
+from app.core.models import HealthCheckResult, ProbeResult
+
+logger = setup_logger(__name__)
+
+# endpoint, ts, status, response_time, status_code, error_message
+Row = tuple[str, float, str, float, Optional[int], Optional[str]]
+
+ROLLUPS = {
+    "1m": 60,
+    "1h": 3600,
+    "1d": 86400
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    endpoint TEXT NOT NULL,
+    ts REAL NOT NULL,
+    status TEXT NOT NULL,
+    response_time REAL NOT NULL,
+    status_code INTEGER,
+    error_message TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_endpoint_ts ON results (endpoint, ts);
+CREATE INDEX IF NOT EXISTS idx_results_ts ON results (ts);
+"""
+
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollup_{name} (
+    endpoint TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    checks INTEGER NOT NULL,
+    healthy INTEGER NOT NULL,
+    degraded INTEGER NOT NULL,
+    down INTEGER NOT NULL,
+    total_time REAL NOT NULL,
+    min_time REAL NOT NULL,
+    max_time REAL NOT NULL,
+    PRIMARY KEY (endpoint, bucket)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_rollup_{name}_bucket ON rollup_{name} (bucket);
+"""
+
+ROLLUP_UPSERT = """
+INSERT INTO rollup_{name}
+    (endpoint, bucket, checks, healthy, degraded, down, total_time, min_time, max_time)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (endpoint, bucket) DO UPDATE SET
+    checks = checks + excluded.checks,
+    healthy = healthy + excluded.healthy,
+    degraded = degraded + excluded.degraded,
+    down = down + excluded.down,
+    total_time = total_time + excluded.total_time,
+    min_time = MIN(min_time, excluded.min_time),
+    max_time = MAX(max_time, excluded.max_time)
+"""
+
+
+class ResultStore:
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        retention_days: Optional[dict[str, float]] = None
+    ):
+        self.db_path = Path(db_path or settings.history_db)
+        self.batch_size = batch_size or settings.history_batch_size
+        self.retention_days = retention_days or {
+            "raw": settings.history_retention_raw_days,
+            "1m": settings.history_retention_1m_days,
+            "1h": settings.history_retention_1h_days,
+            "1d": settings.history_retention_1d_days
+        }
+        self._buffer: list[Row] = []
+        self._buffer_full = asyncio.Event()
+        self._lock = Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        for name in ROLLUPS:
+            self._conn.executescript(ROLLUP_SCHEMA.format(name=name))
+    
+    def add(self, result: HealthCheckResult | ProbeResult) -> None:
+        self._buffer.append((
+            result.endpoint,
+            result.checked_at,
+            result.status.value,
+            result.response_time,
+            result.status_code,
+            result.error_message
+        ))
+        if len(self._buffer) >= self.batch_size:
+            self._buffer_full.set()
+    
+    def flush(self) -> int:
+        return self._write(self._take())
+    
+    def _take(self) -> list[Row]:
+        rows, self._buffer = self._buffer, []
+        self._buffer_full.clear()
+        return rows
+    
+    def _write(self, rows: list[Row]) -> int:
+        if not rows:
+            return 0
+        
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            for name, width in ROLLUPS.items():
+                self._conn.executemany(
+                    ROLLUP_UPSERT.format(name=name), self._aggregate(rows, width)
+                )
+        return len(rows)
+    
+    @staticmethod
+    def _aggregate(rows: list[Row], width: int) -> list[tuple[Any, ...]]:
+        buckets: dict[tuple[str, int], list[float]] = {}
+        
+        for endpoint, ts, status, response_time, _, _ in rows:
+            key = (endpoint, int(ts // width) * width)
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = [0, 0, 0, 0, 0.0, response_time, response_time]
+            
+            bucket[0] += 1
+            if status == "healthy":
+                bucket[1] += 1
+            elif status == "degraded":
+                bucket[2] += 1
+            else:
+                bucket[3] += 1
+            bucket[4] += response_time
+            bucket[5] = min(bucket[5], response_time)
+            bucket[6] = max(bucket[6], response_time)
+        
+        return [(*key, *values) for key, values in buckets.items()]
+    
+    def apply_retention(self, now: Optional[float] = None) -> None:
+        now = now or time()
+        
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM results WHERE ts < ?",
+                (now - self.retention_days["raw"] * 86400,)
+            )
+            for name in ROLLUPS:
+                self._conn.execute(
+                    f"DELETE FROM rollup_{name} WHERE bucket < ?",
+                    (now - self.retention_days[name] * 86400,)
+                )
+    
+    def query(
+        self,
+        endpoint: str,
+        since: float,
+        until: Optional[float] = None,
+        resolution: str = "raw"
+    ) -> list[dict[str, Any]]:
+        until = until or time()
+        
+        if resolution == "raw":
+            sql = (
+                "SELECT ts, status, response_time, status_code, error_message "
+                "FROM results WHERE endpoint = ? AND ts >= ? AND ts <= ? ORDER BY ts"
+            )
+            columns = ["timestamp", "status", "response_time", "status_code", "error_message"]
+        elif resolution in ROLLUPS:
+            sql = (
+                "SELECT bucket, checks, healthy, degraded, down, "
+                "total_time / checks, min_time, max_time "
+                f"FROM rollup_{resolution} "
+                "WHERE endpoint = ? AND bucket >= ? AND bucket <= ? ORDER BY bucket"
+            )
+            since = since // ROLLUPS[resolution] * ROLLUPS[resolution]
+            columns = [
+                "timestamp", "checks", "healthy", "degraded", "down",
+                "average_response_time", "min_response_time", "max_response_time"
+            ]
+        else:
+            raise ValueError(f"Resolution must be one of {['raw', *ROLLUPS]}")
+        
+        with self._lock:
+            rows = self._conn.execute(sql, (endpoint, since, until)).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+    
+    def endpoints(self) -> list[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT endpoint FROM rollup_1d ORDER BY endpoint"
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    async def run(self, flush_interval: Optional[float] = None) -> None:
+        flush_interval = flush_interval or settings.history_flush_interval
+        last_retention = 0.0
+        
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._buffer_full.wait(), timeout=flush_interval)
+                except TimeoutError:
+                    pass
+                
+                try:
+                    await asyncio.to_thread(self._write, self._take())
+                    if time() - last_retention >= 3600:
+                        await asyncio.to_thread(self.apply_retention)
+                        last_retention = time()
+                except sqlite3.Error as e:
+                    logger.error(f"Erro ao gravar histórico: {e}")
+        finally:
+            await asyncio.to_thread(self._write, self._take())
+    
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
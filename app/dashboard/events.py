@@ -0,0 +1,60 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Optional
+
+
+class EventBroadcaster:
+    def __init__(self, max_pending: int = 256):
+        self.max_pending = max_pending
+        self._subscribers: set[asyncio.Queue[Optional[str]]] = set()
+    
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+    
+    @staticmethod
+    def format(event: str, data: Any) -> str:
+        return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+    
+    def publish(self, event: str, data: Any) -> None:
+        if not self._subscribers:
+            return
+        
+        message = self.format(event, data)
+        for queue in list(self._subscribers):
+            if queue.qsize() >= self.max_pending:
+                self.unsubscribe(queue)
+                queue.put_nowait(None)
+            else:
+                queue.put_nowait(message)
+    
+    def subscribe(self) -> asyncio.Queue[Optional[str]]:
+        queue: asyncio.Queue[Optional[str]] = asyncio.Queue(maxsize=self.max_pending + 1)
+        self._subscribers.add(queue)
+        return queue
+    
+    def unsubscribe(self, queue: asyncio.Queue[Optional[str]]) -> None:
+        self._subscribers.discard(queue)
+    
+    async def stream(
+        self,
+        initial: Optional[str] = None,
+        keepalive: float = 15.0
+    ) -> AsyncIterator[str]:
+        queue = self.subscribe()
+        try:
+            if initial:
+                yield initial
+            
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                
+                if message is None:
+                    return
+                yield message
+        finally:
+            self.unsubscribe(queue)
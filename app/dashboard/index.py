@@ -0,0 +1,142 @@
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+SORT_KEYS: dict[str, Callable[[dict[str, Any]], Any]] = {
+    "name": lambda entry: entry["name"],
+    "latency": lambda entry: entry["response_time"],
+    "last_change": lambda entry: entry["last_change"]
+}
+
+
+class StatusIndex:
+    def __init__(self) -> None:
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.names: list[str] = []
+        self.by_status: dict[str, set[str]] = {}
+        self.by_tag: dict[str, set[str]] = {}
+        self.version = 0
+        self._ordered: dict[str, tuple[int, list[str]]] = {}
+    
+    def update(self, entry: dict[str, Any], tags: Optional[list[str]] = None) -> dict[str, Any]:
+        name = entry["name"]
+        previous = self.entries.get(name)
+        
+        if previous is None:
+            insort(self.names, name)
+            entry["last_change"] = entry.get("timestamp") or datetime.now().isoformat()
+        else:
+            self.by_status[previous["status"]].discard(name)
+            if previous["status"] == entry["status"]:
+                entry["last_change"] = previous["last_change"]
+            else:
+                entry["last_change"] = entry.get("timestamp") or datetime.now().isoformat()
+            for tag in previous.get("tags", []):
+                self.by_tag[tag].discard(name)
+        
+        entry["tags"] = list(tags if tags is not None else entry.get("tags", []))
+        self.entries[name] = entry
+        self.by_status.setdefault(entry["status"], set()).add(name)
+        for tag in entry["tags"]:
+            self.by_tag.setdefault(tag, set()).add(name)
+        
+        self.version += 1
+        return entry
+    
+    def remove(self, name: str) -> None:
+        entry = self.entries.pop(name, None)
+        if entry is None:
+            return
+        
+        position = bisect_left(self.names, name)
+        del self.names[position]
+        self.by_status[entry["status"]].discard(name)
+        for tag in entry["tags"]:
+            self.by_tag[tag].discard(name)
+        self.version += 1
+    
+    def counts(self) -> dict[str, int]:
+        return {
+            "total_endpoints": len(self.entries),
+            "healthy": len(self.by_status.get("healthy", ())),
+            "degraded": len(self.by_status.get("degraded", ())),
+            "down": len(self.by_status.get("down", ()))
+        }
+    
+    def tags_for(self, name: str) -> list[str]:
+        entry = self.entries.get(name)
+        return entry["tags"] if entry else []
+    
+    def _prefixed(self, prefix: str) -> list[str]:
+        start = bisect_left(self.names, prefix)
+        end = bisect_left(self.names, prefix + "\U0010ffff")
+        return self.names[start:end]
+    
+    def _ordered_names(self, sort: str) -> list[str]:
+        cached = self._ordered.get(sort)
+        if cached and cached[0] == self.version:
+            return cached[1]
+        
+        if sort == "name":
+            ordered = self.names
+        else:
+            key = SORT_KEYS[sort]
+            ordered = sorted(self.names, key=lambda name: key(self.entries[name]))
+        
+        self._ordered[sort] = (self.version, ordered)
+        return ordered
+    
+    def select(
+        self,
+        status: Optional[str] = None,
+        prefix: Optional[str] = None,
+        tag: Optional[str] = None
+    ) -> Optional[set[str]]:
+        filters = []
+        if status:
+            filters.append(self.by_status.get(status, set()))
+        if tag:
+            filters.append(self.by_tag.get(tag, set()))
+        if prefix:
+            filters.append(set(self._prefixed(prefix)))
+        
+        if not filters:
+            return None
+        return set.intersection(*sorted(filters, key=len))
+    
+    def query(
+        self,
+        status: Optional[str] = None,
+        prefix: Optional[str] = None,
+        tag: Optional[str] = None,
+        sort: str = "name",
+        descending: bool = False,
+        page: int = 1,
+        page_size: int = 50
+    ) -> dict[str, Any]:
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Sort must be one of {list(SORT_KEYS)}")
+        
+        candidates = self.select(status, prefix, tag)
+        if candidates is None:
+            names = self._ordered_names(sort)
+        elif len(candidates) * 4 < len(self.names):
+            key = SORT_KEYS[sort]
+            names = sorted(candidates, key=lambda name: key(self.entries[name]))
+        else:
+            names = [name for name in self._ordered_names(sort) if name in candidates]
+        
+        if descending:
+            names = names[::-1]
+        
+        page = max(page, 1)
+        page_size = max(min(page_size, 500), 1)
+        start = (page - 1) * page_size
+        
+        return {
+            "items": [self.entries[name] for name in names[start:start + page_size]],
+            "total": len(names),
+            "page": page,
+            "page_size": page_size,
+            "pages": (len(names) + page_size - 1) // page_size
+        }
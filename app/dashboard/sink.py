@@ -0,0 +1,62 @@
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import settings
+from app.core.endpoints import EndpointRegistry
+from app.core.logger import setup_logger
+from app.core.models import ProbeResult
+from app.core.stats import StatsTracker
+from app.dashboard.state import DashboardState
+from app.monitor.engine import ResultSink
+
+logger = setup_logger(__name__)
+
+
+class DashboardSink(ResultSink):
+    name = "dashboard"
+    
+    def __init__(
+        self,
+        state: DashboardState,
+        registry: EndpointRegistry,
+        stats_tracker: Optional[StatsTracker] = None,
+        interval: Optional[float] = None
+    ):
+        self.state = state
+        self.registry = registry
+        self.stats_tracker = stats_tracker
+        self.interval = interval or settings.monitor_interval
+        self._pending = False
+    
+    async def handle(self, result: ProbeResult) -> None:
+        self._pending = True
+        self.state.record({
+            "name": result.endpoint,
+            "url": result.url,
+            "status": result.status.value,
+            "response_time": round(result.response_time, 2),
+            "status_code": result.status_code,
+            "error_message": result.error_message,
+            "latency": self.stats_tracker.get_latency_percentiles(result.endpoint)
+            if self.stats_tracker else None,
+            "timestamp": datetime.now().isoformat()
+        }, self.registry.tags_for(result.endpoint))
+    
+    def remove_endpoint(self, name: str) -> None:
+        self.state.remove(name)
+        self._pending = True
+    
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            
+            if not self._pending:
+                continue
+            
+            self._pending = False
+            stats = (await self.state.complete_sweep()).stats
+            logger.info(
+                f"Check completo: {stats['healthy']} healthy, "
+                f"{stats['degraded']} degraded, {stats['down']} down"
+            )
@@ -0,0 +1,79 @@
+import asyncio
+import gzip
+import json
+from itertools import count
+from typing import Any, Optional
+from uuid import uuid4
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class SerializedSnapshot:
+    __slots__ = ("encodings", "etag")
+    
+    def __init__(self, etag: str, body: bytes):
+        self.etag = etag
+        self.encodings = {"identity": body, "gzip": gzip.compress(body, compresslevel=6)}
+        if brotli is not None:
+            self.encodings["br"] = brotli.compress(body)
+
+
+def accepted_encodings(header: str) -> set[str]:
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+class SnapshotCache:
+    def __init__(self) -> None:
+        self._boot = uuid4().hex[:8]
+        self._versions = count(1)
+        self._snapshots: dict[str, SerializedSnapshot] = {}
+    
+    def _etag(self, name: str) -> str:
+        return f'"{name}-{self._boot}-{next(self._versions)}"'
+    
+    @staticmethod
+    def _serialize(etag: str, data: Any) -> SerializedSnapshot:
+        body = json.dumps(data, default=str, separators=(",", ":")).encode()
+        return SerializedSnapshot(etag, body)
+    
+    def publish(self, name: str, data: Any) -> SerializedSnapshot:
+        snapshot = self._serialize(self._etag(name), data)
+        self._snapshots[name] = snapshot
+        return snapshot
+    
+    async def publish_in_thread(self, name: str, data: Any) -> SerializedSnapshot:
+        # Com milhares de endpoints, serializar e comprimir leva segundos: fica fora do
+        # event loop, que só troca a referência quando o snapshot novo está pronto
+        snapshot = await asyncio.to_thread(self._serialize, self._etag(name), data)
+        self._snapshots[name] = snapshot
+        return snapshot
+    
+    def select(
+        self, name: str, if_none_match: Optional[str], accept_encoding: str
+    ) -> tuple[int, dict[str, str], bytes]:
+        snapshot = self._snapshots[name]
+        headers = {
+            "ETag": snapshot.etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding"
+        }
+        
+        if if_none_match and snapshot.etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return 304, headers, b""
+        
+        accepted = accepted_encodings(accept_encoding)
+        for coding in ("br", "gzip"):
+            if coding in accepted and coding in snapshot.encodings:
+                headers["Content-Encoding"] = coding
+                return 200, headers, snapshot.encodings[coding]
+        
+        return 200, headers, snapshot.encodings["identity"]
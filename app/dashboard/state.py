@@ -0,0 +1,118 @@
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from app.dashboard.events import EventBroadcaster
+from app.dashboard.index import StatusIndex
+from app.dashboard.snapshot import SnapshotCache
+
+EMPTY_STATS = MappingProxyType({
+    "total_endpoints": 0,
+    "healthy": 0,
+    "degraded": 0,
+    "down": 0
+})
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    results: tuple[dict[str, Any], ...] = ()
+    last_check: Optional[str] = None
+    stats: Mapping[str, int] = field(default_factory=lambda: EMPTY_STATS)
+    history: tuple[dict[str, Any], ...] = ()
+    
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "results": list(self.results),
+            "last_check": self.last_check,
+            "stats": dict(self.stats)
+        }
+
+
+class DashboardState:
+    def __init__(self, history_size: int = 50):
+        self.index = StatusIndex()
+        self.events = EventBroadcaster()
+        self.snapshots = SnapshotCache()
+        self.snapshot = DashboardSnapshot()
+        self._results: list[dict[str, Any]] = []
+        self._positions: dict[str, int] = {}
+        self._history: deque[dict[str, Any]] = deque(maxlen=history_size)
+        self._changes: dict[str, dict[str, Any]] = {}
+        self._removed: set[str] = set()
+        self.snapshots.publish("status", self.snapshot.as_dict())
+        self.snapshots.publish("history", {"history": []})
+    
+    def record(self, entry: dict[str, Any], tags: Optional[list[str]] = None) -> dict[str, Any]:
+        previous = self.index.entries.get(entry["name"])
+        entry = self.index.update(entry, tags)
+        position = self._positions.get(entry["name"])
+        
+        if position is None:
+            self._positions[entry["name"]] = len(self._results)
+            self._results.append(entry)
+        else:
+            self._results[position] = entry
+        
+        # Só mudanças de estado, agrupadas num único evento "sweep" por varredura: uma
+        # rajada de mudanças não enche a fila dos clientes SSE (max_pending)
+        if (
+            previous is None
+            or previous["status"] != entry["status"]
+            or previous.get("status_code") != entry.get("status_code")
+        ):
+            self._changes[entry["name"]] = entry
+            self._removed.discard(entry["name"])
+        return entry
+    
+    def remove(self, name: str) -> None:
+        if self._positions.pop(name, None) is None:
+            return
+        
+        self.index.remove(name)
+        self._results = [entry for entry in self._results if entry["name"] != name]
+        self._positions = {entry["name"]: i for i, entry in enumerate(self._results)}
+        self._changes.pop(name, None)
+        self._removed.add(name)
+    
+    async def complete_sweep(self) -> DashboardSnapshot:
+        last_check = datetime.now().isoformat()
+        # Contagens mantidas incrementalmente pelo índice a cada resultado
+        stats = self.index.counts()
+        changes, self._changes = list(self._changes.values()), {}
+        removed, self._removed = sorted(self._removed), set()
+        history_entry = {
+            "timestamp": last_check,
+            "results": [
+                {
+                    "name": entry["name"],
+                    "status": entry["status"],
+                    "response_time": entry["response_time"]
+                }
+                for entry in self._results
+            ]
+        }
+        self._history.append(history_entry)
+        
+        snapshot = self.snapshot = DashboardSnapshot(
+            results=tuple(self._results),
+            last_check=last_check,
+            stats=MappingProxyType(stats),
+            history=tuple(self._history)
+        )
+        await self._publish_snapshots(snapshot)
+        self.events.publish("sweep", {
+            "last_check": last_check,
+            "stats": stats,
+            "changes": changes,
+            "removed": removed
+        })
+        return snapshot
+    
+    async def _publish_snapshots(self, snapshot: DashboardSnapshot) -> None:
+        # O histórico fica só no snapshot "history" (/api/history), não no "status";
+        # do mais recente ao mais antigo, na mesma ordem da rota com filtros
+        await self.snapshots.publish_in_thread("status", snapshot.as_dict())
+        await self.snapshots.publish_in_thread("history", {"history": snapshot.history[-20:][::-1]})
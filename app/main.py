@@ -1,136 +1,38 @@
 import asyncio
-import json
-from pathlib import Path
-from time import time
 
 from rich.console import Console
-from rich.table import Table
 
-from app.core.alerts import AlertConfig, EndpointAlertState
 from app.core.config import settings
+from app.core.endpoints import EndpointConfigWatcher, EndpointRegistry, load_endpoints
 from app.core.logger import setup_logger
-from app.core.models import EndpointConfig, HealthCheckResult
+from app.core.metrics import serve_metrics
+from app.core.models import EndpointConfig
 from app.core.stats import StatsTracker
-from app.monitor.health_checker import HealthChecker
-from app.notifier.discord import DiscordNotifier
-from app.notifier.email import EmailNotifier
-from app.notifier.telegram import TelegramNotifier
+from app.monitor.engine import MonitorEngine
+from app.monitor.sinks import AlertSink, ConsoleSink, HistorySink, StatsSink
 
 logger = setup_logger(__name__)
 console = Console()
 
 
-def load_endpoints(file_path: str = "endpoints.json") -> list[EndpointConfig]:
-    config_file = Path(file_path)
-    
-    if not config_file.exists():
-        logger.warning(f"Arquivo de configuração {file_path} não encontrado")
-        return []
-    
-    try:
-        with open(config_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
-        endpoints = [EndpointConfig(**endpoint) for endpoint in data]
-        logger.info(f"Carregados {len(endpoints)} endpoints para monitoramento")
-        return endpoints
-        
-    except Exception as e:
-        logger.error(f"Erro ao carregar endpoints: {e}")
-        return []
-
-
-def display_results(results: list[HealthCheckResult]) -> None:
-    table = Table(title="Status de Monitoramento")
-    
-    table.add_column("Endpoint", style="cyan", no_wrap=True)
-    table.add_column("Status", style="bold")
-    table.add_column("Tempo (s)", justify="right")
-    table.add_column("Status Code", justify="center")
-    table.add_column("Erro", style="red")
-    
-    for result in results:
-        status_color = {
-            "healthy": "[green]HEALTHY[/green]",
-            "degraded": "[yellow]DEGRADED[/yellow]",
-            "down": "[red]DOWN[/red]"
-        }
-        
-        table.add_row(
-            result.endpoint,
-            status_color.get(result.status, result.status),
-            f"{result.response_time:.2f}",
-            str(result.status_code) if result.status_code else "N/A",
-            result.error_message or ""
-        )
-    
-    console.print(table)
-
-
-alert_states = {}
-alert_config = AlertConfig()
-
-
-async def send_alerts(results: list[HealthCheckResult]) -> None:
-    notifiers = [
-        TelegramNotifier(),
-        DiscordNotifier(),
-        EmailNotifier()
-    ]
-    
-    active_notifiers = [n for n in notifiers if n.is_configured()]
-    
-    if not active_notifiers:
-        logger.info("Nenhum notificador configurado")
-        return
-    
-    current_time = time()
-    
-    for result in results:
-        if result.endpoint not in alert_states:
-            alert_states[result.endpoint] = EndpointAlertState()
-        
-        state = alert_states[result.endpoint]
-        
-        if not result.is_healthy:
-            state.record_failure()
-            if state.should_alert(alert_config, current_time):
-                tasks = [notifier.send_alert(result) for notifier in active_notifiers]
-                await asyncio.gather(*tasks)
-        else:
-            if state.should_notify_recovery(alert_config):
-                logger.info(f"{result.endpoint} recuperado!")
-            state.record_success()
-
-
-async def monitor_loop(endpoints: list[EndpointConfig]) -> None:
+async def monitor_loop(
+    endpoints: list[EndpointConfig], watcher: EndpointConfigWatcher
+) -> None:
     stats_tracker = StatsTracker()
-    
-    async with HealthChecker(max_retries=settings.max_retries) as checker:
-        while True:
-            try:
-                console.print(f"\n[bold blue]Iniciando verificação de saúde...[/bold blue]")
-                
-                results = await checker.check_multiple(endpoints)
-                display_results(results)
-                
-                stats_tracker.update(results)
-                uptime = stats_tracker.get_uptime_percentage()
-                console.print(f"\n[dim]Uptime: {uptime:.1f}% | Verificações: {stats_tracker.stats.total_checks}[/dim]")
-                
-                await send_alerts(results)
-                
-                console.print(
-                    f"\n[dim]Próxima verificação em {settings.monitor_interval}s...[/dim]"
-                )
-                await asyncio.sleep(settings.monitor_interval)
-                
-            except KeyboardInterrupt:
-                logger.info("Monitoramento interrompido pelo usuário")
-                break
-            except Exception as e:
-                logger.error(f"Erro no loop de monitoramento: {e}")
-                await asyncio.sleep(10)
+    engine = MonitorEngine(EndpointRegistry(endpoints), [
+        ConsoleSink(console, stats_tracker),
+        StatsSink(stats_tracker),
+        HistorySink(),
+        AlertSink()
+    ], watcher=watcher)
+    
+    console.print("\n[bold blue]Iniciando verificação de saúde...[/bold blue]")
+    if settings.metrics_port:
+        await asyncio.gather(
+            engine.run(), serve_metrics(settings.metrics_host, settings.metrics_port)
+        )
+    else:
+        await engine.run()
 
 
 def main() -> None:
@@ -138,7 +40,8 @@ def main() -> None:
     logger.info("SentinelAPI iniciado")
     logger.info(f"Intervalo de monitoramento: {settings.monitor_interval}s")
     
-    endpoints = load_endpoints()
+    watcher = EndpointConfigWatcher()
+    endpoints = load_endpoints(watcher=watcher)
     
     if not endpoints:
         logger.error("Nenhum endpoint configurado para monitoramento")
@@ -149,7 +52,7 @@ def main() -> None:
         console.print(f"  • {endpoint.name} - {endpoint.url}")
     
     try:
-        asyncio.run(monitor_loop(endpoints))
+        asyncio.run(monitor_loop(endpoints, watcher))
     except KeyboardInterrupt:
         console.print("\n[yellow]Monitoramento encerrado[/yellow]")
 
@@ -0,0 +1,135 @@
+import asyncio
+from abc import ABC, abstractmethod
+from contextlib import AsyncExitStack
+from typing import Optional
+
+from app.core.config import settings
+from app.core.endpoints import EndpointConfigWatcher, EndpointDiff, EndpointRegistry
+from app.core.logger import setup_logger
+from app.core.metrics import CIRCUITS_OPEN, RESULT_QUEUE, forget_endpoint
+from app.core.models import EndpointConfig, ProbeResult
+from app.monitor.health_checker import HealthChecker
+from app.monitor.scheduler import EndpointScheduler
+
+logger = setup_logger(__name__)
+
+
+class ResultSink(ABC):
+    name: str = "sink"
+    
+    async def open(self) -> None:
+        pass
+    
+    @abstractmethod
+    async def handle(self, result: ProbeResult) -> None:
+        pass
+    
+    async def run(self) -> None:
+        pass
+    
+    def remove_endpoint(self, name: str) -> None:
+        pass
+    
+    async def close(self) -> None:
+        pass
+
+
+class MonitorEngine:
+    def __init__(
+        self,
+        registry: EndpointRegistry,
+        sinks: list[ResultSink],
+        interval: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        checker: Optional[HealthChecker] = None,
+        watcher: Optional[EndpointConfigWatcher] = None
+    ):
+        self.registry = registry
+        self.sinks = sinks
+        self.interval = interval or settings.monitor_interval
+        self.max_retries = max_retries or settings.max_retries
+        self.checker = checker
+        self.watcher = watcher
+        self.scheduler: Optional[EndpointScheduler] = None
+        self._results: asyncio.Queue[ProbeResult] = asyncio.Queue()
+        RESULT_QUEUE.set_function(self._results.qsize)
+    
+    async def _enqueue(self, result: ProbeResult) -> None:
+        # Resultados em voo de endpoints removidos na recarga são descartados
+        if result.endpoint in self.registry:
+            self._results.put_nowait(result)
+    
+    def reload(self, endpoints: list[EndpointConfig]) -> EndpointDiff:
+        diff = self.registry.diff(endpoints)
+        
+        for name in diff.removed:
+            self.registry.remove(name)
+            if self.scheduler:
+                self.scheduler.remove(name)
+            for sink in self.sinks:
+                sink.remove_endpoint(name)
+            forget_endpoint(name)
+        
+        for endpoint in diff.changed:
+            self.registry.replace(endpoint)
+            if self.scheduler:
+                self.scheduler.update(endpoint)
+        
+        for endpoint in diff.added:
+            self.registry.add(endpoint)
+            if self.scheduler:
+                self.scheduler.add(endpoint)
+        
+        if diff:
+            logger.info(
+                f"Configuração recarregada: {len(diff.added)} adicionados, "
+                f"{len(diff.removed)} removidos, {len(diff.changed)} alterados"
+            )
+        return diff
+    
+    async def _dispatch(self) -> None:
+        while True:
+            result = await self._results.get()
+            
+            try:
+                for sink in self.sinks:
+                    try:
+                        await sink.handle(result)
+                    except Exception as e:
+                        logger.error(
+                            f"Erro no sink {sink.name} ao processar {result.endpoint}: {e}"
+                        )
+            finally:
+                self._results.task_done()
+    
+    async def _start(self, stack: AsyncExitStack) -> list[asyncio.Task[None]]:
+        checker = self.checker
+        if checker is None:
+            checker = await stack.enter_async_context(HealthChecker(max_retries=self.max_retries))
+        # O gauge é global: registrado pelo motor que roda, não por cada HealthChecker criado
+        CIRCUITS_OPEN.set_function(checker.open_circuits)
+        self.scheduler = EndpointScheduler(
+            checker, list(self.registry), self.interval, self._enqueue
+        )
+        return [asyncio.create_task(self.scheduler.run())]
+    
+    async def run(self) -> None:
+        async with AsyncExitStack() as stack:
+            for sink in self.sinks:
+                await sink.open()
+                stack.push_async_callback(sink.close)
+            
+            tasks = [
+                *await self._start(stack),
+                asyncio.create_task(self._dispatch()),
+                *(asyncio.create_task(sink.run()) for sink in self.sinks)
+            ]
+            if self.watcher:
+                tasks.append(asyncio.create_task(self.watcher.run(self.reload)))
+            
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
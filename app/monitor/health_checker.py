@@ -1,96 +1,299 @@
 import asyncio
-from time import time
-from typing import Optional
+from contextlib import asynccontextmanager
+from itertools import chain, zip_longest
+from time import monotonic, perf_counter
+from types import TracebackType
+from typing import AsyncIterator, Optional
 
 import httpx
 
+from app.core.alerts import CircuitBreaker, CircuitConfig, CircuitState
+from app.core.config import settings
 from app.core.logger import setup_logger
-from app.core.models import EndpointConfig, HealthCheckResult, HealthStatus
+from app.core.metrics import (
+    CIRCUIT_SKIPPED, PROBE_ERRORS, PROBE_RETRIES, record_probe
+)
+from app.core.models import EndpointConfig, HealthStatus, ProbeResult, RetryPolicy
 
 logger = setup_logger(__name__)
 
 
 class HealthChecker:
-    def __init__(self, max_retries: int = 3):
+    def __init__(
+        self,
+        max_retries: int = 3,
+        max_concurrency: Optional[int] = None,
+        max_concurrency_per_host: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        circuit_config: Optional[CircuitConfig] = None,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
         self.max_retries = max_retries
+        self.max_concurrency = max_concurrency or settings.max_concurrency
+        self.max_concurrency_per_host = (
+            max_concurrency_per_host or settings.max_concurrency_per_host
+        )
+        self.transport = transport
         self.client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+        self.circuit_config = circuit_config or CircuitConfig(
+            failure_threshold=settings.circuit_failure_threshold,
+            open_seconds=settings.circuit_open_seconds,
+            max_open_seconds=settings.circuit_max_open_seconds,
+            probe_timeout=settings.circuit_probe_timeout
+        )
+        self.circuits: dict[str, CircuitBreaker] = {}
+        self.retry_policy = retry_policy or RetryPolicy(
+            base_delay=settings.retry_base_delay,
+            max_delay=settings.retry_max_delay,
+            deadline=settings.retry_deadline or None
+        )
     
     async def __aenter__(self) -> "HealthChecker":
-        self.client = httpx.AsyncClient(follow_redirects=True)
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency
+        )
+        self.client = httpx.AsyncClient(
+            follow_redirects=True,
+            limits=limits,
+            transport=self.transport
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._host_semaphores = {}
         return self
     
-    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
         if self.client:
             await self.client.aclose()
     
-    async def check_endpoint(self, endpoint: EndpointConfig) -> HealthCheckResult:
-        if not self.client:
+    @asynccontextmanager
+    async def _slot(self, host: str) -> AsyncIterator[None]:
+        host_semaphore = self._host_semaphores.get(host)
+        if host_semaphore is None:
+            host_semaphore = asyncio.Semaphore(self.max_concurrency_per_host)
+            self._host_semaphores[host] = host_semaphore
+        
+        async with host_semaphore:
+            async with self._semaphore:
+                yield
+    
+    def open_circuits(self) -> int:
+        # Lido pela thread que renderiza /metrics: cópia antes de iterar o dict do loop
+        closed = CircuitState.CLOSED
+        return sum(1 for breaker in list(self.circuits.values()) if breaker.state is not closed)
+    
+    def resume_at(self, name: str) -> float:
+        breaker = self.circuits.get(name)
+        if breaker is None or breaker.state is not CircuitState.OPEN:
+            return 0.0
+        return breaker.open_until
+    
+    def reset_circuit(self, name: str) -> None:
+        self.circuits.pop(name, None)
+    
+    async def check_endpoint(self, endpoint: EndpointConfig) -> Optional[ProbeResult]:
+        client = self.client
+        if client is None:
             raise RuntimeError("HealthChecker deve ser usado como context manager")
         
-        start_time = time()
+        policy = endpoint.retry or self.retry_policy
+        attempts = policy.max_attempts or self.max_retries
+        timeout = policy.attempt_timeout or endpoint.timeout
+        
+        if not self.circuit_config.enabled:
+            result = await self._probe(client, endpoint, policy, attempts, timeout)
+            record_probe(result)
+            return result
+        
+        name = endpoint.name
+        breaker = self.circuits.get(name)
+        if breaker is None:
+            breaker = self.circuits[name] = CircuitBreaker()
+        
+        if not breaker.allows_probe(monotonic()):
+            # Sem verificação não há resultado: nada de amostras falsas de latência nos sinks
+            CIRCUIT_SKIPPED.inc()
+            return None
+        
+        if breaker.state is CircuitState.CLOSED:
+            result = await self._probe(client, endpoint, policy, attempts, timeout)
+        else:
+            # Meio-aberto: uma tentativa barata decide se o endpoint voltou
+            timeout = min(timeout, self.circuit_config.probe_timeout)
+            result = await self._probe(client, endpoint, policy, 1, timeout)
+        
+        previous = breaker.state
+        breaker.record_probe(
+            result.status is not HealthStatus.DOWN, self.circuit_config, monotonic()
+        )
+        if breaker.state is CircuitState.OPEN and previous is not CircuitState.OPEN:
+            logger.warning(
+                "%s: circuito aberto por %.0fs", name, breaker.open_until - monotonic()
+            )
+        elif breaker.state is CircuitState.CLOSED and previous is CircuitState.HALF_OPEN:
+            logger.info("%s: circuito fechado, endpoint respondeu", name)
+        
+        record_probe(result)
+        return result
+    
+    async def _probe(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: EndpointConfig,
+        policy: RetryPolicy,
+        attempts: int,
+        timeout: float
+    ) -> ProbeResult:
+        name = endpoint.name
+        target = endpoint.target
+        deadline = policy.deadline
+        start_time: Optional[float] = None
         last_error = None
+        fallback: Optional[ProbeResult] = None
+        delay = 0.0
+        made = 0
         
-        for attempt in range(self.max_retries):
+        for attempt in range(attempts):
+            attempt_timeout = timeout
             try:
-                response = await self.client.request(
-                    method=endpoint.method,
-                    url=str(endpoint.url),
-                    timeout=endpoint.timeout
-                )
+                async with self._slot(endpoint.host):
+                    # O relógio começa com a vaga já obtida: a espera na fila local de
+                    # concorrência não conta no deadline nem no response_time, que medem
+                    # só o endpoint (e as esperas entre tentativas)
+                    now = perf_counter()
+                    if start_time is None:
+                        start_time = now
+                    if deadline is not None:
+                        attempt_timeout = min(timeout, start_time + deadline - now)
+                        if attempt_timeout <= 0:
+                            break
+                    made += 1
+                    # O timeout do httpx vale por fase; este limita a tentativa inteira
+                    async with asyncio.timeout(attempt_timeout):
+                        response = await client.request(
+                            method=endpoint.method,
+                            url=target,
+                            timeout=attempt_timeout
+                        )
                 
-                elapsed = time() - start_time
+                elapsed = perf_counter() - start_time
+                status_code = response.status_code
                 
-                if response.status_code == endpoint.expected_status:
-                    logger.info(
-                        f"{endpoint.name}: HEALTHY "
-                        f"(status={response.status_code}, time={elapsed:.2f}s)"
-                    )
-                    return HealthCheckResult(
-                        endpoint=endpoint.name,
-                        url=str(endpoint.url),
-                        status=HealthStatus.HEALTHY,
-                        response_time=elapsed,
-                        status_code=response.status_code
-                    )
-                else:
-                    logger.warning(
-                        f"{endpoint.name}: DEGRADED "
-                        f"(esperado={endpoint.expected_status}, "
-                        f"recebido={response.status_code})"
+                if status_code == endpoint.expected_status:
+                    logger.debug(
+                        "%s: HEALTHY (status=%s, time=%.2fs)", name, status_code, elapsed
                     )
-                    return HealthCheckResult(
-                        endpoint=endpoint.name,
-                        url=str(endpoint.url),
-                        status=HealthStatus.DEGRADED,
-                        response_time=elapsed,
-                        status_code=response.status_code,
-                        error_message=f"Status code inesperado: {response.status_code}"
-                    )
-                    
-            except httpx.TimeoutException as e:
-                last_error = f"Timeout após {endpoint.timeout}s"
-                logger.warning(f"{endpoint.name}: Tentativa {attempt + 1} - {last_error}")
+                    return ProbeResult(name, target, HealthStatus.HEALTHY, elapsed, status_code)
+                
+                fallback = ProbeResult(
+                    name, target, HealthStatus.DEGRADED, elapsed, status_code,
+                    f"Status code inesperado: {status_code}"
+                )
+                if status_code not in policy.retry_on:
+                    break
+                last_error = f"Status code {status_code}"
+                PROBE_ERRORS.labels("status").inc()
+                logger.warning("%s: Tentativa %d - %s", name, attempt + 1, last_error)
+                
+            except (httpx.TimeoutException, TimeoutError):
+                fallback = None
+                last_error = f"Timeout após {attempt_timeout:g}s"
+                PROBE_ERRORS.labels("timeout").inc()
+                logger.warning("%s: Tentativa %d - %s", name, attempt + 1, last_error)
                 
             except httpx.RequestError as e:
-                last_error = f"Erro de requisição: {str(e)}"
-                logger.warning(f"{endpoint.name}: Tentativa {attempt + 1} - {last_error}")
+                fallback = None
+                last_error = f"Erro de requisição: {e}"
+                PROBE_ERRORS.labels("request").inc()
+                logger.warning("%s: Tentativa %d - %s", name, attempt + 1, last_error)
             
-            if attempt < self.max_retries - 1:
-                await asyncio.sleep(2 ** attempt)
+            if attempt < attempts - 1:
+                delay = policy.next_delay(delay)
+                if (
+                    deadline is not None and start_time is not None
+                    and perf_counter() + delay >= start_time + deadline
+                ):
+                    break
+                PROBE_RETRIES.inc()
+                await asyncio.sleep(delay)
         
-        elapsed = time() - start_time
-        logger.error(f"{endpoint.name}: DOWN após {self.max_retries} tentativas")
+        if fallback is not None:
+            logger.warning(
+                "%s: DEGRADED (esperado=%s, recebido=%s)",
+                name, endpoint.expected_status, fallback.status_code
+            )
+            return fallback
         
-        return HealthCheckResult(
-            endpoint=endpoint.name,
-            url=str(endpoint.url),
-            status=HealthStatus.DOWN,
-            response_time=elapsed,
+        elapsed = perf_counter() - start_time if start_time is not None else 0.0
+        logger.error("%s: DOWN após %d tentativas", name, made)
+        
+        return ProbeResult(
+            name, target, HealthStatus.DOWN, elapsed,
             error_message=last_error or "Falha desconhecida"
         )
     
     async def check_multiple(
         self, endpoints: list[EndpointConfig]
-    ) -> list[HealthCheckResult]:
-        tasks = [self.check_endpoint(endpoint) for endpoint in endpoints]
-        return await asyncio.gather(*tasks)
+    ) -> list[ProbeResult]:
+        results: list[Optional[ProbeResult]] = [None] * len(endpoints)
+        async for index, result in self._iter_indexed(endpoints):
+            results[index] = result
+        # Endpoints com circuito aberto não são verificados e ficam fora da lista
+        return [result for result in results if result is not None]
+    
+    async def iter_results(
+        self, endpoints: list[EndpointConfig]
+    ) -> AsyncIterator[ProbeResult]:
+        async for _, result in self._iter_indexed(endpoints):
+            yield result
+    
+    async def _iter_indexed(
+        self, endpoints: list[EndpointConfig]
+    ) -> AsyncIterator[tuple[int, ProbeResult]]:
+        if not endpoints:
+            return
+        
+        completed: asyncio.Queue[tuple[int, ProbeResult | Exception | None]] = asyncio.Queue()
+        pending = iter(self._interleave_by_host(endpoints))
+        
+        async def worker() -> None:
+            for index, endpoint in pending:
+                try:
+                    completed.put_nowait((index, await self.check_endpoint(endpoint)))
+                except Exception as e:
+                    completed.put_nowait((index, e))
+        
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.max_concurrency, len(endpoints)))
+        ]
+        
+        try:
+            for _ in range(len(endpoints)):
+                index, result = await completed.get()
+                if isinstance(result, Exception):
+                    raise result
+                if result is not None:
+                    yield index, result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+    
+    @staticmethod
+    def _interleave_by_host(
+        endpoints: list[EndpointConfig]
+    ) -> list[tuple[int, EndpointConfig]]:
+        by_host: dict[str, list[tuple[int, EndpointConfig]]] = {}
+        for index, endpoint in enumerate(endpoints):
+            by_host.setdefault(endpoint.host, []).append((index, endpoint))
+        
+        rounds = zip_longest(*by_host.values())
+        return [item for item in chain.from_iterable(rounds) if item is not None]
@@ -0,0 +1,130 @@
+import asyncio
+import heapq
+import random
+from itertools import count
+from time import monotonic
+from typing import Awaitable, Callable, Optional
+
+from app.core.histogram import LatencyHistogram
+from app.core.logger import setup_logger
+from app.core.metrics import SCHEDULER_BATCHES, SCHEDULER_LAG, SCHEDULER_QUEUE
+from app.core.models import EndpointConfig, ProbeResult
+from app.monitor.health_checker import HealthChecker
+
+logger = setup_logger(__name__)
+
+ResultHandler = Callable[[ProbeResult], Awaitable[None]]
+
+
+class EndpointScheduler:
+    def __init__(
+        self,
+        checker: HealthChecker,
+        endpoints: list[EndpointConfig],
+        default_interval: float,
+        on_result: ResultHandler
+    ):
+        self.checker = checker
+        self.default_interval = default_interval
+        self.on_result = on_result
+        self._heap: list[tuple[float, int, EndpointConfig]] = []
+        self._sequence = count()
+        self._wakeup = asyncio.Event()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._endpoints: dict[str, EndpointConfig] = {}
+        self.lag = LatencyHistogram()
+        
+        for endpoint in endpoints:
+            self.add(endpoint)
+    
+    def add(self, endpoint: EndpointConfig) -> None:
+        self._endpoints[endpoint.name] = endpoint
+        self._push(endpoint, monotonic() + random.uniform(0, endpoint.jitter))
+    
+    def remove(self, name: str) -> None:
+        # Entradas antigas no heap são descartadas ao serem retiradas
+        self._endpoints.pop(name, None)
+        self.checker.reset_circuit(name)
+    
+    def update(self, endpoint: EndpointConfig) -> None:
+        self.checker.reset_circuit(endpoint.name)
+        self.add(endpoint)
+    
+    def _is_current(self, endpoint: EndpointConfig) -> bool:
+        return self._endpoints.get(endpoint.name) is endpoint
+    
+    def interval_for(self, endpoint: EndpointConfig) -> float:
+        return endpoint.interval or self.default_interval
+    
+    def _next_run(self, endpoint: EndpointConfig, now: float) -> float:
+        when = now + self.interval_for(endpoint) + random.uniform(0, endpoint.jitter)
+        # Circuito aberto: nada de disparar antes do fim da espera
+        return max(when, self.checker.resume_at(endpoint.name))
+    
+    def _push(self, endpoint: EndpointConfig, when: float) -> None:
+        heapq.heappush(self._heap, (when, next(self._sequence), endpoint))
+        self._wakeup.set()
+    
+    def _next_delay(self, now: float) -> Optional[float]:
+        if not self._heap:
+            return None
+        return max(self._heap[0][0] - now, 0)
+    
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                self._wakeup.clear()
+                now = monotonic()
+                
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    when, _, endpoint = heapq.heappop(self._heap)
+                    if self._is_current(endpoint):
+                        self.lag.record(now - when)
+                        SCHEDULER_LAG.observe(now - when)
+                        due.append(endpoint)
+                if due:
+                    self._dispatch(due)
+                SCHEDULER_QUEUE.set(len(self._heap))
+                
+                # Timer simples em vez de wait_for: não cria task por iteração e não
+                # perde o cancelamento quando ele coincide com o timeout
+                delay = self._next_delay(now)
+                timer = loop.call_later(delay, self._wakeup.set) if delay is not None else None
+                try:
+                    await self._wakeup.wait()
+                finally:
+                    if timer:
+                        timer.cancel()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+    
+    def _dispatch(self, endpoints: list[EndpointConfig]) -> None:
+        task = asyncio.create_task(self._run_batch(endpoints))
+        self._tasks.add(task)
+        task.add_done_callback(self._batch_done)
+        SCHEDULER_BATCHES.set(len(self._tasks))
+    
+    def _batch_done(self, task: asyncio.Task[None]) -> None:
+        self._tasks.discard(task)
+        SCHEDULER_BATCHES.set(len(self._tasks))
+    
+    async def _run_batch(self, endpoints: list[EndpointConfig]) -> None:
+        waiting = {endpoint.name: endpoint for endpoint in endpoints}
+        
+        try:
+            async for result in self.checker.iter_results(endpoints):
+                endpoint = waiting.pop(result.endpoint, None)
+                if endpoint and self._is_current(endpoint):
+                    self._push(endpoint, self._next_run(endpoint, monotonic()))
+                await self.on_result(result)
+        except Exception as e:
+            logger.error(f"Erro ao verificar lote de {len(endpoints)} endpoints: {e}")
+        finally:
+            now = monotonic()
+            for endpoint in waiting.values():
+                if self._is_current(endpoint):
+                    self._push(endpoint, self._next_run(endpoint, now))
@@ -0,0 +1,203 @@
+import asyncio
+from contextlib import AsyncExitStack
+from time import time
+from typing import Any, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from app.core.alerts import AlertConfig, EndpointAlertState
+from app.core.config import settings
+from app.core.logger import setup_logger
+from app.core.models import ProbeResult
+from app.core.stats import StatsTracker
+from app.core.timeseries import ResultStore
+from app.monitor.engine import ResultSink
+from app.notifier.digest import AlertDigest
+from app.notifier.queue import DeliveryQueue
+from app.notifier.registry import NotifierRegistry
+
+logger = setup_logger(__name__)
+
+
+def format_percentiles(percentiles: dict[str, Any]) -> str:
+    if not percentiles["count"]:
+        return "N/A"
+    return " / ".join(f"{percentiles[p]:.2f}" for p in ("p50", "p95", "p99"))
+
+
+def display_results(
+    console: Console,
+    results: list[ProbeResult],
+    stats_tracker: Optional[StatsTracker] = None
+) -> None:
+    table = Table(title="Status de Monitoramento")
+    
+    table.add_column("Endpoint", style="cyan", no_wrap=True)
+    table.add_column("Status", style="bold")
+    table.add_column("Tempo (s)", justify="right")
+    table.add_column("p50 / p95 / p99 (s)", justify="right")
+    table.add_column("Status Code", justify="center")
+    table.add_column("Erro", style="red")
+    
+    for result in results:
+        status_color = {
+            "healthy": "[green]HEALTHY[/green]",
+            "degraded": "[yellow]DEGRADED[/yellow]",
+            "down": "[red]DOWN[/red]"
+        }
+        
+        table.add_row(
+            result.endpoint,
+            status_color.get(result.status, result.status),
+            f"{result.response_time:.2f}",
+            format_percentiles(stats_tracker.get_latency_percentiles(result.endpoint))
+            if stats_tracker else "N/A",
+            str(result.status_code) if result.status_code else "N/A",
+            result.error_message or ""
+        )
+    
+    console.print(table)
+
+
+class ConsoleSink(ResultSink):
+    name = "console"
+    
+    def __init__(
+        self,
+        console: Optional[Console] = None,
+        stats_tracker: Optional[StatsTracker] = None,
+        interval: Optional[float] = None
+    ):
+        self.console = console or Console()
+        self.stats_tracker = stats_tracker
+        self.interval = interval or settings.monitor_interval
+        self.latest: dict[str, ProbeResult] = {}
+    
+    async def handle(self, result: ProbeResult) -> None:
+        previous = self.latest.get(result.endpoint)
+        self.latest[result.endpoint] = result
+        
+        if previous and previous.status != result.status:
+            self.console.print(
+                f"[bold]{result.endpoint}[/bold]: "
+                f"{previous.status.upper()} → {result.status.upper()}"
+            )
+    
+    def remove_endpoint(self, name: str) -> None:
+        self.latest.pop(name, None)
+    
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            
+            if not self.latest:
+                continue
+            
+            display_results(self.console, list(self.latest.values()), self.stats_tracker)
+            if self.stats_tracker:
+                uptime = self.stats_tracker.get_uptime_percentage()
+                self.console.print(
+                    f"\n[dim]Uptime: {uptime:.1f}% | "
+                    f"Verificações: {self.stats_tracker.stats.total_checks}[/dim]"
+                )
+
+
+class StatsSink(ResultSink):
+    name = "stats"
+    
+    def __init__(
+        self,
+        stats_tracker: Optional[StatsTracker] = None,
+        interval: Optional[float] = None
+    ):
+        self.stats_tracker = stats_tracker or StatsTracker()
+        self.interval = interval or settings.monitor_interval
+        self._batch: list[ProbeResult] = []
+    
+    async def handle(self, result: ProbeResult) -> None:
+        # Percentis na hora, para o dashboard; contadores e a média móvel (0.7/0.3)
+        # seguem por varredura, como antes do motor entregar resultado a resultado
+        self.stats_tracker.latency.record(result.endpoint, result.response_time)
+        self._batch.append(result)
+    
+    def _flush(self) -> None:
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self.stats_tracker.update(batch)
+    
+    def remove_endpoint(self, name: str) -> None:
+        self.stats_tracker.latency.windows.pop(name, None)
+    
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self._flush()
+    
+    async def close(self) -> None:
+        self._flush()
+        self.stats_tracker.close()
+
+
+class HistorySink(ResultSink):
+    name = "history"
+    
+    def __init__(self, result_store: Optional[ResultStore] = None):
+        self.result_store = result_store or ResultStore()
+    
+    async def handle(self, result: ProbeResult) -> None:
+        self.result_store.add(result)
+    
+    async def run(self) -> None:
+        await self.result_store.run()
+    
+    async def close(self) -> None:
+        await asyncio.to_thread(self.result_store.close)
+
+
+class AlertSink(ResultSink):
+    name = "alerts"
+    
+    def __init__(self, config: Optional[AlertConfig] = None):
+        self.config = config or AlertConfig()
+        self.states: dict[str, EndpointAlertState] = {}
+        self.alerts: Optional[AlertDigest] = None
+        self.delivery: Optional[DeliveryQueue] = None
+        self._stack = AsyncExitStack()
+    
+    async def open(self) -> None:
+        notifiers = await self._stack.enter_async_context(NotifierRegistry())
+        if not notifiers.active:
+            logger.info("Nenhum notificador configurado")
+        
+        self.delivery = DeliveryQueue(notifiers.active)
+        self._stack.callback(self.delivery.close)
+        self.alerts = AlertDigest(notifiers.active, queue=self.delivery)
+    
+    async def handle(self, result: ProbeResult) -> None:
+        state = self.states.get(result.endpoint)
+        if state is None:
+            state = self.states[result.endpoint] = EndpointAlertState()
+        
+        if not result.is_healthy:
+            state.record_failure()
+            alerts = self.alerts
+            if alerts is None:
+                raise RuntimeError("AlertSink deve ser aberto antes de receber resultados")
+            if alerts.notifiers and state.should_alert(self.config, time()):
+                alerts.add(result.to_model())
+        else:
+            if state.should_notify_recovery(self.config):
+                logger.info(f"{result.endpoint} recuperado!")
+            state.record_success()
+    
+    def remove_endpoint(self, name: str) -> None:
+        self.states.pop(name, None)
+    
+    async def run(self) -> None:
+        if self.alerts is None or self.delivery is None:
+            raise RuntimeError("AlertSink deve ser aberto antes de rodar")
+        await asyncio.gather(self.alerts.run(), self.delivery.run())
+    
+    async def close(self) -> None:
+        await self._stack.aclose()
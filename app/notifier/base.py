@@ -1,9 +1,27 @@
 from abc import ABC, abstractmethod
+from typing import Any, Iterator, Optional
 
+import httpx
+
+from app.core.config import settings
 from app.core.models import HealthCheckResult
 
 
+class DeliveryError(Exception):
+    def __init__(
+        self, message: str, retry_after: Optional[float] = None, retryable: bool = True
+    ):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.retryable = retryable
+
+
 class NotifierBase(ABC):
+    name = "notifier"
+    rate_limit = 1.0
+    burst = 1
+    max_batch_size: Optional[int] = None
+    
     @abstractmethod
     async def send_alert(self, result: HealthCheckResult) -> bool:
         pass
@@ -12,5 +30,77 @@ class NotifierBase(ABC):
     def is_configured(self) -> bool:
         pass
     
+    async def send_digest(self, results: list[HealthCheckResult]) -> bool:
+        sent = True
+        for result in results:
+            sent = await self.send_alert(result) and sent
+        return sent
+    
+    async def deliver(self, results: list[HealthCheckResult]) -> None:
+        if len(results) == 1:
+            sent = await self.send_alert(results[0])
+        else:
+            sent = await self.send_digest(results)
+        
+        if not sent:
+            raise DeliveryError(f"Falha ao entregar alerta via {self.name}")
+    
+    def batches(self, payload: list[dict[str, Any]]) -> Iterator[list[dict[str, Any]]]:
+        size = self.max_batch_size or len(payload) or 1
+        for start in range(0, len(payload), size):
+            yield payload[start:start + size]
+    
     def should_alert(self, result: HealthCheckResult) -> bool:
         return not result.is_healthy
+    
+    async def close(self) -> None:
+        pass
+
+
+class HttpNotifierBase(NotifierBase):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        self.client = client
+    
+    async def _post(self, url: str, payload: dict[str, Any]) -> httpx.Response:
+        # Sem timeout por chamada: vale o do cliente, configurado por NOTIFIER_TIMEOUT
+        if self.client is not None:
+            return await self.client.post(url, json=payload)
+        
+        async with httpx.AsyncClient(timeout=settings.notifier_timeout) as client:
+            return await client.post(url, json=payload)
+    
+    async def _post_checked(
+        self, url: str, payload: dict[str, Any], ok_statuses: tuple[int, ...] = (200,)
+    ) -> httpx.Response:
+        try:
+            response = await self._post(url, payload)
+        except httpx.RequestError as e:
+            raise DeliveryError(f"Erro de requisição: {e}") from e
+        
+        if response.status_code in ok_statuses:
+            return response
+        
+        raise DeliveryError(
+            f"HTTP {response.status_code}: {response.text[:200]}",
+            retry_after=self._retry_after(response),
+            retryable=response.status_code == 429 or response.status_code >= 500
+        )
+    
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        header = response.headers.get("Retry-After")
+        if header:
+            try:
+                return float(header)
+            except ValueError:
+                pass
+        
+        try:
+            body = response.json()
+        except ValueError:
+            return None
+        
+        if not isinstance(body, dict):
+            return None
+        value = body.get("retry_after") or (body.get("parameters") or {}).get("retry_after")
+        return float(value) if value is not None else None
@@ -0,0 +1,87 @@
+import asyncio
+from time import perf_counter
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logger import setup_logger
+from app.core.metrics import ALERT_DURATION, ALERTS
+from app.core.models import HealthCheckResult
+from app.notifier.base import NotifierBase
+from app.notifier.queue import DeliveryQueue
+
+logger = setup_logger(__name__)
+
+
+class AlertDigest:
+    def __init__(
+        self,
+        notifiers: list[NotifierBase],
+        flush_interval: Optional[float] = None,
+        max_batch: Optional[int] = None,
+        queue: Optional[DeliveryQueue] = None
+    ):
+        self.notifiers = notifiers
+        self.queue = queue
+        self.flush_interval = (
+            settings.alert_flush_interval if flush_interval is None else flush_interval
+        )
+        self.max_batch = max_batch or settings.alert_max_batch
+        self._pending: list[HealthCheckResult] = []
+        self._has_pending = asyncio.Event()
+        self._batch_full = asyncio.Event()
+    
+    def add(self, result: HealthCheckResult) -> None:
+        self._pending.append(result)
+        self._has_pending.set()
+        if len(self._pending) >= self.max_batch:
+            self._batch_full.set()
+    
+    async def run(self) -> None:
+        try:
+            while True:
+                await self._has_pending.wait()
+                
+                if not self._batch_full.is_set():
+                    try:
+                        await asyncio.wait_for(self._batch_full.wait(), timeout=self.flush_interval)
+                    except TimeoutError:
+                        pass
+                
+                await self.flush()
+        finally:
+            await self.flush()
+    
+    async def flush(self) -> None:
+        while self._pending:
+            batch = self._pending[:self.max_batch]
+            self._pending = self._pending[self.max_batch:]
+            await self._deliver(batch)
+        
+        self._has_pending.clear()
+        self._batch_full.clear()
+    
+    async def _deliver(self, batch: list[HealthCheckResult]) -> None:
+        if self.queue is not None:
+            self.queue.submit(batch)
+            return
+        
+        if len(batch) > 1:
+            logger.info(f"Agrupando {len(batch)} alertas em um resumo por canal")
+        
+        await asyncio.gather(
+            *(self._send(notifier, batch) for notifier in self.notifiers),
+            return_exceptions=True
+        )
+    
+    @staticmethod
+    async def _send(notifier: NotifierBase, batch: list[HealthCheckResult]) -> None:
+        start = perf_counter()
+        sent = False
+        try:
+            if len(batch) == 1:
+                sent = await notifier.send_alert(batch[0])
+            else:
+                sent = await notifier.send_digest(batch)
+        finally:
+            ALERT_DURATION.labels(notifier.name).observe(perf_counter() - start)
+            ALERTS.labels(notifier.name, "sent" if sent else "failed").inc()
@@ -1,25 +1,31 @@
+from typing import Any, Optional
+
 import httpx
 
 from app.core.config import settings
 from app.core.logger import setup_logger
 from app.core.models import HealthCheckResult
-from app.notifier.base import NotifierBase
+from app.notifier.base import DeliveryError, HttpNotifierBase
 
 logger = setup_logger(__name__)
 
+MAX_EMBEDS_PER_MESSAGE = 10
+
 
-class DiscordNotifier(NotifierBase):
-    def __init__(self):
+class DiscordNotifier(HttpNotifierBase):
+    name = "discord"
+    rate_limit = 2.5
+    burst = 5
+    max_batch_size = MAX_EMBEDS_PER_MESSAGE
+    
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        super().__init__(client)
         self.webhook_url = settings.discord_webhook_url
     
     def is_configured(self) -> bool:
         return bool(self.webhook_url)
     
-    async def send_alert(self, result: HealthCheckResult) -> bool:
-        if not self.is_configured():
-            logger.warning("Discord não configurado. Ignorando alerta.")
-            return False
-        
+    def _build_embed(self, result: HealthCheckResult) -> dict[str, Any]:
         color_map = {
             "healthy": 0x00FF00,
             "degraded": 0xFFA500,
@@ -28,7 +34,7 @@ class DiscordNotifier(NotifierBase):
         
         color = color_map.get(result.status, 0x808080)
         
-        embed = {
+        embed: dict[str, Any] = {
             "title": f"Alerta: {result.endpoint}",
             "description": f"Status do endpoint alterado para **{result.status.upper()}**",
             "color": color,
@@ -64,25 +70,64 @@ class DiscordNotifier(NotifierBase):
                 "inline": False
             })
         
-        payload = {
-            "embeds": [embed]
+        return embed
+    
+    async def _post_embeds(
+        self, embeds: list[dict[str, Any]], content: Optional[str] = None
+    ) -> None:
+        payload: dict[str, Any] = {
+            "embeds": embeds
         }
+        if content:
+            payload["content"] = content
         
+        await self._post_checked(self.webhook_url, payload, (200, 204))
+    
+    async def _send_embeds(
+        self, embeds: list[dict[str, Any]], content: Optional[str] = None
+    ) -> bool:
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.webhook_url,
-                    json=payload,
-                    timeout=10
-                )
-                
-                if response.status_code in [200, 204]:
-                    logger.info(f"Alerta do Discord enviado para {result.endpoint}")
-                    return True
-                else:
-                    logger.error(f"Falha ao enviar alerta do Discord: {response.status_code}")
-                    return False
-                    
+            await self._post_embeds(embeds, content)
+            return True
+            
+        except DeliveryError as e:
+            logger.error(f"Falha ao enviar alerta do Discord: {e}")
+            return False
         except Exception as e:
             logger.error(f"Erro ao enviar alerta do Discord: {e}")
             return False
+    
+    async def send_alert(self, result: HealthCheckResult) -> bool:
+        if not self.is_configured():
+            logger.warning("Discord não configurado. Ignorando alerta.")
+            return False
+        
+        sent = await self._send_embeds([self._build_embed(result)])
+        if sent:
+            logger.info(f"Alerta do Discord enviado para {result.endpoint}")
+        return sent
+    
+    async def send_digest(self, results: list[HealthCheckResult]) -> bool:
+        if not self.is_configured():
+            logger.warning("Discord não configurado. Ignorando alerta.")
+            return False
+        
+        content = f"**{len(results)} endpoints com falha**"
+        sent = True
+        
+        for start in range(0, len(results), MAX_EMBEDS_PER_MESSAGE):
+            chunk = results[start:start + MAX_EMBEDS_PER_MESSAGE]
+            embeds = [self._build_embed(result) for result in chunk]
+            sent = await self._send_embeds(embeds, content if start == 0 else None) and sent
+        
+        if sent:
+            logger.info(f"Resumo do Discord enviado com {len(results)} alertas")
+        return sent
+    
+    async def deliver(self, results: list[HealthCheckResult]) -> None:
+        content = f"**{len(results)} endpoints com falha**" if len(results) > 1 else None
+        
+        for start in range(0, len(results), MAX_EMBEDS_PER_MESSAGE):
+            chunk = results[start:start + MAX_EMBEDS_PER_MESSAGE]
+            embeds = [self._build_embed(result) for result in chunk]
+            await self._post_embeds(embeds, content if start == 0 else None)
@@ -1,6 +1,9 @@
+import asyncio
 import smtplib
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from typing import Optional
 
 from app.core.config import settings
 from app.core.logger import setup_logger
@@ -11,12 +14,19 @@ logger = setup_logger(__name__)
 
 
 class EmailNotifier(NotifierBase):
-    def __init__(self):
+    name = "email"
+    burst = 5
+    
+    def __init__(self) -> None:
         self.smtp_host = settings.smtp_host
         self.smtp_port = settings.smtp_port
         self.smtp_user = settings.smtp_user
         self.smtp_password = settings.smtp_password
         self.alert_email = settings.alert_email
+        self.use_tls = settings.smtp_use_tls
+        self.timeout = settings.smtp_timeout
+        self._server: Optional[smtplib.SMTP] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="smtp")
     
     def is_configured(self) -> bool:
         return bool(
@@ -54,22 +64,112 @@ class EmailNotifier(NotifierBase):
         """
         
         try:
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = self.smtp_user
-            msg["To"] = self.alert_email
-            
-            html_part = MIMEText(html_content, "html")
-            msg.attach(html_part)
-            
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
-            
+            await self._send_html(subject, html_content)
             logger.info(f"Alerta de email enviado para {result.endpoint}")
             return True
             
         except Exception as e:
             logger.error(f"Erro ao enviar alerta de email: {e}")
             return False
+    
+    async def send_digest(self, results: list[HealthCheckResult]) -> bool:
+        if not self.is_configured():
+            logger.warning("Email não configurado. Ignorando alerta.")
+            return False
+        
+        subject = f"[SentinelAPI] Alerta: {len(results)} endpoints com falha"
+        
+        rows = "".join(
+            f"""
+                <tr>
+                    <td style="padding: 6px; border-bottom: 1px solid #ddd;">{result.endpoint}</td>
+                    <td style="padding: 6px; border-bottom: 1px solid #ddd; color: #dc3545; font-weight: bold;">{result.status.upper()}</td>
+                    <td style="padding: 6px; border-bottom: 1px solid #ddd;">{result.url}</td>
+                    <td style="padding: 6px; border-bottom: 1px solid #ddd;">{result.status_code or "N/A"}</td>
+                    <td style="padding: 6px; border-bottom: 1px solid #ddd;">{result.error_message or ""}</td>
+                </tr>"""
+            for result in results
+        )
+        
+        html_content = f"""
+        <html>
+        <body style="font-family: Arial, sans-serif; padding: 20px;">
+            <h2 style="color: #dc3545;">
+                Alerta do SentinelAPI: {len(results)} endpoints com falha
+            </h2>
+            <table style="border-collapse: collapse; width: 100%;">
+                <tr>
+                    <th align="left">Endpoint</th>
+                    <th align="left">Status</th>
+                    <th align="left">URL</th>
+                    <th align="left">Status Code</th>
+                    <th align="left">Erro</th>
+                </tr>{rows}
+            </table>
+            <hr>
+            <p style="font-size: 12px; color: #777;">
+                Timestamp: {results[0].timestamp.strftime('%Y-%m-%d %H:%M:%S')}
+            </p>
+        </body>
+        </html>
+        """
+        
+        try:
+            await self._send_html(subject, html_content)
+            logger.info(f"Resumo de email enviado com {len(results)} alertas")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Erro ao enviar alerta de email: {e}")
+            return False
+    
+    async def _send_html(self, subject: str, html_content: str) -> None:
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = self.smtp_user
+        msg["To"] = self.alert_email
+        
+        html_part = MIMEText(html_content, "html")
+        msg.attach(html_part)
+        
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._deliver, msg)
+    
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            server.login(self.smtp_user, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def _disconnect(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        self._server = None
+    
+    def _deliver(self, msg: MIMEMultipart) -> None:
+        for attempt in range(2):
+            if self._server is None:
+                self._server = self._connect()
+            
+            try:
+                self._server.send_message(msg)
+                return
+            except (smtplib.SMTPServerDisconnected, OSError):
+                self._disconnect()
+                if attempt:
+                    raise
+                logger.info("Sessão SMTP perdida, reconectando...")
+    
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._disconnect)
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,249 @@
+import asyncio
+import json
+import random
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import monotonic, perf_counter
+from typing import Any, Optional
+from uuid import uuid4
+
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.logger import setup_logger
+from app.core.metrics import ALERT_DURATION, ALERT_QUEUE, ALERTS
+from app.core.models import HealthCheckResult
+from app.notifier.base import DeliveryError, NotifierBase
+
+logger = setup_logger(__name__)
+
+COMPACT_AFTER_RECORDS = 1000
+
+
+@dataclass
+class DeliveryJob:
+    id: str
+    channel: str
+    results: list[dict[str, Any]]
+    attempts: int = 0
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = monotonic()
+        self.blocked_until = 0.0
+    
+    def pause(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, monotonic() + seconds)
+        self.tokens = 0.0
+    
+    async def acquire(self) -> None:
+        while True:
+            now = monotonic()
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class DeliveryQueue:
+    def __init__(
+        self,
+        notifiers: list[NotifierBase],
+        spill_file: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+        retry_base: Optional[float] = None,
+        retry_max: Optional[float] = None
+    ):
+        self.notifiers = {notifier.name: notifier for notifier in notifiers}
+        self.spill_file = Path(spill_file or settings.notifier_spill_file)
+        self.max_attempts = max_attempts or settings.notifier_max_attempts
+        self.retry_base = retry_base or settings.notifier_retry_base
+        self.retry_max = retry_max or settings.notifier_retry_max
+        self.buckets = {
+            notifier.name: TokenBucket(notifier.rate_limit, notifier.burst)
+            for notifier in notifiers
+        }
+        self._queues: dict[str, asyncio.Queue[DeliveryJob]] = {
+            name: asyncio.Queue() for name in self.notifiers
+        }
+        self._pending: dict[str, DeliveryJob] = {}
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="alert-spill")
+        self._records = 0
+        self._restore()
+        ALERT_QUEUE.set_function(lambda: self.depth)
+    
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+    
+    def _restore(self) -> None:
+        if self.spill_file.exists():
+            with open(self.spill_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"Entrada incompleta ignorada em {self.spill_file}")
+                        break
+                    
+                    try:
+                        self._replay(entry)
+                    except (KeyError, TypeError) as e:
+                        logger.warning(f"Entrada inválida ignorada em {self.spill_file}: {e}")
+        
+        restored = 0
+        discarded: dict[str, int] = {}
+        for job in list(self._pending.values()):
+            reason = self._discard_reason(job)
+            if reason is None:
+                self._queues[job.channel].put_nowait(job)
+                restored += 1
+            else:
+                del self._pending[job.id]
+                discarded[reason] = discarded.get(reason, 0) + 1
+        
+        for reason, count in discarded.items():
+            logger.warning(f"{count} alertas pendentes descartados de {self.spill_file}: {reason}")
+        if restored:
+            logger.info(f"{restored} alertas pendentes restaurados de {self.spill_file}")
+        self._compact()
+    
+    def _replay(self, entry: dict[str, Any]) -> None:
+        if entry["op"] == "add":
+            job = DeliveryJob(**entry["job"])
+            self._pending[job.id] = job
+        elif entry["op"] == "attempt":
+            retried = self._pending.get(entry["id"])
+            if retried is not None:
+                retried.attempts = entry["attempts"]
+        else:
+            self._pending.pop(entry["id"], None)
+    
+    def _discard_reason(self, job: DeliveryJob) -> Optional[str]:
+        # Um job que nunca poderia ser entregue derrubaria o worker a cada reinício
+        if job.channel not in self._queues:
+            return "canal não configurado"
+        if job.attempts >= self.max_attempts:
+            return "tentativas esgotadas"
+        try:
+            for result in job.results:
+                HealthCheckResult.model_validate(result)
+        except (ValidationError, TypeError):
+            return "conteúdo inválido"
+        return None
+    
+    # A escrita do spill roda numa thread própria, em ordem, fora do event loop
+    def _rewrite(self, lines: list[str]) -> None:
+        tmp_file = self.spill_file.with_name(self.spill_file.name + ".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        tmp_file.replace(self.spill_file)
+    
+    def _append(self, line: str) -> None:
+        with open(self.spill_file, "a", encoding="utf-8") as f:
+            f.write(line)
+    
+    def _compact(self) -> None:
+        lines = [json.dumps({"op": "add", "job": asdict(job)}) + "\n" for job in self._pending.values()]
+        self._records = len(lines)
+        self._writer.submit(self._rewrite, lines)
+    
+    def _record(self, entry: dict[str, Any]) -> None:
+        self._writer.submit(self._append, json.dumps(entry) + "\n")
+        self._records += 1
+    
+    def submit(self, results: list[HealthCheckResult]) -> None:
+        payload = [result.model_dump(mode="json") for result in results]
+        
+        for name, notifier in self.notifiers.items():
+            for batch in notifier.batches(payload):
+                job = DeliveryJob(uuid4().hex, name, batch)
+                self._pending[job.id] = job
+                self._record({"op": "add", "job": asdict(job)})
+                self._queues[name].put_nowait(job)
+    
+    def _backoff(self, attempts: int) -> float:
+        return random.uniform(0, min(self.retry_max, self.retry_base * 2 ** attempts))
+    
+    async def _deliver(self, job: DeliveryJob) -> None:
+        notifier = self.notifiers[job.channel]
+        bucket = self.buckets[job.channel]
+        results = [HealthCheckResult.model_validate(result) for result in job.results]
+        
+        while True:
+            await bucket.acquire()
+            job.attempts += 1
+            # Gravada antes do envio: um processo que cai no meio da entrega não tenta para sempre
+            self._record({"op": "attempt", "id": job.id, "attempts": job.attempts})
+            start = perf_counter()
+            
+            try:
+                await notifier.deliver(results)
+                ALERT_DURATION.labels(job.channel).observe(perf_counter() - start)
+                ALERTS.labels(job.channel, "sent").inc()
+                return
+            except Exception as e:
+                error = e if isinstance(e, DeliveryError) else DeliveryError(str(e))
+            ALERT_DURATION.labels(job.channel).observe(perf_counter() - start)
+            
+            if not error.retryable or job.attempts >= self.max_attempts:
+                ALERTS.labels(job.channel, "dropped").inc()
+                logger.error(
+                    f"Alerta descartado para {job.channel} após {job.attempts} tentativas: {error}"
+                )
+                return
+            
+            if error.retry_after is not None:
+                bucket.pause(error.retry_after)
+                delay = error.retry_after
+            else:
+                delay = self._backoff(job.attempts)
+            
+            ALERTS.labels(job.channel, "retried").inc()
+            logger.warning(
+                f"Falha ao entregar alerta via {job.channel} "
+                f"(tentativa {job.attempts}): {error}. Nova tentativa em {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+    
+    async def _worker(self, channel: str) -> None:
+        queue = self._queues[channel]
+        
+        while True:
+            job = await queue.get()
+            try:
+                await self._deliver(job)
+                self._pending.pop(job.id, None)
+                self._record({"op": "done", "id": job.id})
+                if not self._pending or self._records > COMPACT_AFTER_RECORDS:
+                    self._compact()
+            finally:
+                queue.task_done()
+    
+    async def run(self) -> None:
+        workers = [asyncio.create_task(self._worker(name)) for name in self._queues]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+    
+    async def join(self) -> None:
+        for queue in self._queues.values():
+            await queue.join()
+    
+    def close(self) -> None:
+        self._writer.shutdown(wait=True)
@@ -0,0 +1,72 @@
+from types import TracebackType
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.logger import setup_logger
+from app.notifier.base import NotifierBase
+from app.notifier.discord import DiscordNotifier
+from app.notifier.email import EmailNotifier
+from app.notifier.telegram import TelegramNotifier
+
+logger = setup_logger(__name__)
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_http_client() -> httpx.AsyncClient:
+    http2 = settings.notifier_http2
+    if http2 and not http2_available():
+        logger.warning("Pacote h2 não instalado, notificadores usarão HTTP/1.1")
+        http2 = False
+    
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=settings.notifier_timeout,
+        limits=httpx.Limits(
+            max_connections=settings.notifier_max_connections,
+            max_keepalive_connections=settings.notifier_max_keepalive,
+            keepalive_expiry=settings.notifier_keepalive_expiry
+        )
+    )
+
+
+class NotifierRegistry:
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        self.client = client
+        self.notifiers: list[NotifierBase] = []
+        self._owns_client = client is None
+    
+    async def __aenter__(self) -> "NotifierRegistry":
+        if self.client is None:
+            self.client = create_http_client()
+        
+        self.notifiers = [
+            TelegramNotifier(self.client),
+            DiscordNotifier(self.client),
+            EmailNotifier()
+        ]
+        return self
+    
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        for notifier in self.notifiers:
+            await notifier.close()
+        
+        if self.client and self._owns_client:
+            await self.client.aclose()
+    
+    @property
+    def active(self) -> list[NotifierBase]:
+        return [notifier for notifier in self.notifiers if notifier.is_configured()]
@@ -1,15 +1,28 @@
+from typing import Any, Iterator, Optional
+
 import httpx
 
 from app.core.config import settings
 from app.core.logger import setup_logger
 from app.core.models import HealthCheckResult
-from app.notifier.base import NotifierBase
+from app.notifier.base import DeliveryError, HttpNotifierBase
 
 logger = setup_logger(__name__)
 
+MAX_MESSAGE_LENGTH = 4096
+
+STATUS_EMOJI = {
+    "healthy": "✅",
+    "degraded": "⚠️",
+    "down": "🔴"
+}
+
 
-class TelegramNotifier(NotifierBase):
-    def __init__(self):
+class TelegramNotifier(HttpNotifierBase):
+    name = "telegram"
+    
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        super().__init__(client)
         self.bot_token = settings.telegram_bot_token
         self.chat_id = settings.telegram_chat_id
         self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
@@ -17,18 +30,30 @@ class TelegramNotifier(NotifierBase):
     def is_configured(self) -> bool:
         return bool(self.bot_token and self.chat_id)
     
-    async def send_alert(self, result: HealthCheckResult) -> bool:
-        if not self.is_configured():
-            logger.warning("Telegram não configurado. Ignorando alerta.")
+    async def _post_message(self, message: str) -> None:
+        await self._post_checked(
+            f"{self.base_url}/sendMessage",
+            {
+                "chat_id": self.chat_id,
+                "text": message,
+                "parse_mode": "Markdown"
+            }
+        )
+    
+    async def _send_message(self, message: str) -> bool:
+        try:
+            await self._post_message(message)
+            return True
+            
+        except DeliveryError as e:
+            logger.error(f"Falha ao enviar alerta do Telegram: {e}")
             return False
-        
-        status_emoji = {
-            "healthy": "✅",
-            "degraded": "⚠️",
-            "down": "🔴"
-        }
-        
-        emoji = status_emoji.get(result.status, "❓")
+        except Exception as e:
+            logger.error(f"Erro ao enviar alerta do Telegram: {e}")
+            return False
+    
+    def _format_alert(self, result: HealthCheckResult) -> str:
+        emoji = STATUS_EMOJI.get(result.status, "❓")
         
         message = (
             f"{emoji} *Alerta SentinelAPI*\n\n"
@@ -45,26 +70,77 @@ class TelegramNotifier(NotifierBase):
             message += f"*Erro:* {result.error_message}\n"
         
         message += f"\n_Timestamp: {result.timestamp.strftime('%Y-%m-%d %H:%M:%S')}_"
+        return message
+    
+    @staticmethod
+    def _digest_header(count: int) -> str:
+        return f"🚨 *Alerta SentinelAPI: {count} endpoints com falha*\n\n"
+    
+    @staticmethod
+    def _format_line(endpoint: str, status: str, error_message: Optional[str]) -> str:
+        line = f"{STATUS_EMOJI.get(status, '❓')} *{endpoint}* - {status.upper()}"
+        if error_message:
+            line += f" ({error_message})"
+        return line + "\n"
+    
+    def _format_digest(self, results: list[HealthCheckResult]) -> list[str]:
+        messages = [self._digest_header(len(results))]
         
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/sendMessage",
-                    json={
-                        "chat_id": self.chat_id,
-                        "text": message,
-                        "parse_mode": "Markdown"
-                    },
-                    timeout=10
-                )
-                
-                if response.status_code == 200:
-                    logger.info(f"Alerta do Telegram enviado para {result.endpoint}")
-                    return True
-                else:
-                    logger.error(f"Falha ao enviar alerta do Telegram: {response.text}")
-                    return False
-                    
-        except Exception as e:
-            logger.error(f"Erro ao enviar alerta do Telegram: {e}")
+        for result in results:
+            line = self._format_line(result.endpoint, result.status, result.error_message)
+            if len(messages[-1]) + len(line) > MAX_MESSAGE_LENGTH:
+                messages.append("")
+            messages[-1] += line
+        
+        return messages
+    
+    def batches(self, payload: list[dict[str, Any]]) -> Iterator[list[dict[str, Any]]]:
+        # Cada job da fila cabe numa única mensagem: um token do bucket por post,
+        # e uma nova tentativa não reenvia linhas que já foram entregues
+        budget = MAX_MESSAGE_LENGTH - len(self._digest_header(len(payload)))
+        batch: list[dict[str, Any]] = []
+        used = 0
+        
+        for entry in payload:
+            line = self._format_line(entry["endpoint"], entry["status"], entry.get("error_message"))
+            size = len(line)
+            if batch and used + size > budget:
+                yield batch
+                batch, used = [], 0
+            batch.append(entry)
+            used += size
+        
+        if batch:
+            yield batch
+    
+    async def send_alert(self, result: HealthCheckResult) -> bool:
+        if not self.is_configured():
+            logger.warning("Telegram não configurado. Ignorando alerta.")
             return False
+        
+        sent = await self._send_message(self._format_alert(result))
+        if sent:
+            logger.info(f"Alerta do Telegram enviado para {result.endpoint}")
+        return sent
+    
+    async def send_digest(self, results: list[HealthCheckResult]) -> bool:
+        if not self.is_configured():
+            logger.warning("Telegram não configurado. Ignorando alerta.")
+            return False
+        
+        sent = True
+        for message in self._format_digest(results):
+            sent = await self._send_message(message) and sent
+        
+        if sent:
+            logger.info(f"Resumo do Telegram enviado com {len(results)} alertas")
+        return sent
+    
+    async def deliver(self, results: list[HealthCheckResult]) -> None:
+        if len(results) == 1:
+            message = self._format_alert(results[0])
+        else:
+            message = "".join(self._format_digest(results))
+        
+        # Os lotes já vêm dimensionados por batches(); o corte só pega linhas gigantes
+        await self._post_message(message[:MAX_MESSAGE_LENGTH])
@@ -0,0 +1,252 @@
+"""
+Benchmark de vazão do HealthChecker e do loop de monitoramento
+
+Sobe um upstream simulado local (benchmarks.upstream) e mede, para cada
+quantidade de endpoints, a vazão de check_multiple (varredura única) e do
+MonitorEngine rodando por um tempo fixo: verificações/s, CPU, RSS e o atraso
+do agendador em relação ao horário previsto. Cada cenário roda em um processo
+novo para que RSS e CPU não se misturem entre tamanhos.
+
+Uso: python -m benchmarks.checker --sizes 100,1000,10000 --json resultados.json
+     python -m benchmarks.checker --baseline resultados.json --tolerance 0.2
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import queue
+import resource
+import sys
+from time import perf_counter, process_time
+
+from app.core.endpoints import EndpointRegistry
+from app.core.models import EndpointConfig, ProbeResult
+from app.monitor.engine import MonitorEngine, ResultSink
+from app.monitor.health_checker import HealthChecker
+from benchmarks.upstream import FakeUpstream, UpstreamProfile
+
+MODES = ("sweep", "monitor")
+
+
+class CountingSink(ResultSink):
+    name = "benchmark"
+    
+    def __init__(self):
+        self.count = 0
+        self.unhealthy = 0
+    
+    async def handle(self, result: ProbeResult) -> None:
+        self.count += 1
+        if not result.is_healthy:
+            self.unhealthy += 1
+
+
+def build_endpoints(base_url: str, size: int, timeout: int) -> list[EndpointConfig]:
+    return [
+        EndpointConfig(name=f"E{i}", url=f"{base_url}/health/{i}", timeout=timeout)
+        for i in range(size)
+    ]
+
+
+def make_checker(options: dict) -> HealthChecker:
+    return HealthChecker(
+        max_retries=options["retries"],
+        max_concurrency=options["concurrency"],
+        max_concurrency_per_host=options["per_host"] or options["concurrency"]
+    )
+
+
+async def run_sweep(endpoints: list[EndpointConfig], options: dict) -> dict:
+    async with make_checker(options) as checker:
+        await checker.check_multiple(endpoints[:min(len(endpoints), 100)])
+        
+        start, cpu = perf_counter(), process_time()
+        results = await checker.check_multiple(endpoints)
+        elapsed, cpu = perf_counter() - start, process_time() - cpu
+    
+    return {
+        "checks": len(results),
+        "unhealthy": sum(not result.is_healthy for result in results),
+        "elapsed": elapsed,
+        "cpu": cpu
+    }
+
+
+async def run_monitor(endpoints: list[EndpointConfig], options: dict) -> dict:
+    sink = CountingSink()
+    
+    async with make_checker(options) as checker:
+        engine = MonitorEngine(
+            EndpointRegistry(endpoints),
+            [sink],
+            interval=options["interval"],
+            max_retries=options["retries"],
+            checker=checker
+        )
+        
+        start, cpu = perf_counter(), process_time()
+        task = asyncio.create_task(engine.run())
+        await asyncio.sleep(options["duration"])
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        elapsed, cpu = perf_counter() - start, process_time() - cpu
+    
+    lag = engine.scheduler.lag
+    return {
+        "checks": sink.count,
+        "unhealthy": sink.unhealthy,
+        "elapsed": elapsed,
+        "cpu": cpu,
+        "lag_p50": lag.quantile(0.50),
+        "lag_p99": lag.quantile(0.99)
+    }
+
+
+def run_scenario(mode: str, size: int, base_url: str, options: dict, output) -> None:
+    if not options["log"]:
+        logging.disable(logging.CRITICAL)
+    
+    endpoints = build_endpoints(base_url, size, options["timeout"])
+    runner = run_sweep if mode == "sweep" else run_monitor
+    metrics = asyncio.run(runner(endpoints, options))
+    
+    metrics.update(
+        mode=mode,
+        size=size,
+        checks_per_sec=metrics["checks"] / metrics["elapsed"] if metrics["elapsed"] else 0.0,
+        cpu_percent=metrics["cpu"] / metrics["elapsed"] * 100 if metrics["elapsed"] else 0.0,
+        # ru_maxrss é em KiB no Linux
+        rss_mb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    )
+    output.put(metrics)
+
+
+def run_isolated(mode: str, size: int, base_url: str, options: dict) -> dict:
+    context = multiprocessing.get_context("spawn")
+    output = context.Queue()
+    process = context.Process(target=run_scenario, args=(mode, size, base_url, options, output))
+    process.start()
+    
+    try:
+        while True:
+            try:
+                return output.get(timeout=1)
+            except queue.Empty:
+                if not process.is_alive():
+                    raise RuntimeError(
+                        f"cenário {mode} com {size} endpoints terminou sem resultado "
+                        f"(código {process.exitcode})"
+                    )
+    finally:
+        process.join()
+
+
+def format_lag(value) -> str:
+    return "-" if value is None else f"{value * 1000:.1f}"
+
+
+def print_header() -> None:
+    print(
+        f"{'modo':<9}{'endpoints':>10}{'verif.':>9}{'verif./s':>11}{'falhas':>8}"
+        f"{'CPU %':>8}{'RSS MB':>9}{'lag p50 ms':>12}{'lag p99 ms':>12}"
+    )
+
+
+def print_row(metrics: dict) -> None:
+    print(
+        f"{metrics['mode']:<9}{metrics['size']:>10}{metrics['checks']:>9}"
+        f"{metrics['checks_per_sec']:>11.0f}{metrics['unhealthy']:>8}"
+        f"{metrics['cpu_percent']:>8.0f}{metrics['rss_mb']:>9.1f}"
+        f"{format_lag(metrics.get('lag_p50')):>12}{format_lag(metrics.get('lag_p99')):>12}",
+        flush=True
+    )
+
+
+def find_regressions(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    previous = {(metrics["mode"], metrics["size"]): metrics for metrics in baseline}
+    regressions = []
+    
+    for metrics in results:
+        reference = previous.get((metrics["mode"], metrics["size"]))
+        if reference is None or not reference["checks_per_sec"]:
+            continue
+        
+        change = metrics["checks_per_sec"] / reference["checks_per_sec"] - 1
+        if change < -tolerance:
+            regressions.append(
+                f"{metrics['mode']} com {metrics['size']} endpoints: "
+                f"{reference['checks_per_sec']:.0f} → {metrics['checks_per_sec']:.0f} verif./s "
+                f"({change:+.0%})"
+            )
+    return regressions
+
+
+def parse_sizes(value: str) -> list[int]:
+    return [int(size) for size in value.split(",") if size.strip()]
+
+
+def parse_modes(value: str) -> list[str]:
+    modes = [mode.strip() for mode in value.split(",") if mode.strip()]
+    for mode in modes:
+        if mode not in MODES:
+            raise argparse.ArgumentTypeError(f"modo inválido: {mode}")
+    return modes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=parse_sizes, default=[100, 1000, 10000, 50000])
+    parser.add_argument("--modes", type=parse_modes, default=list(MODES))
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--per-host", type=int, default=0,
+                        help="limite por host; todos os endpoints estão em 127.0.0.1 (padrão: --concurrency)")
+    parser.add_argument("--retries", type=int, default=1)
+    parser.add_argument("--timeout", type=int, default=2, help="timeout de cada endpoint em segundos")
+    parser.add_argument("--interval", type=float, default=10.0, help="intervalo do modo monitor")
+    parser.add_argument("--duration", type=float, default=30.0, help="duração do modo monitor")
+    parser.add_argument("--log", action="store_true", help="mantém os logs do checker ligados")
+    parser.add_argument("--json", dest="json_path", help="salva os resultados neste arquivo")
+    parser.add_argument("--baseline", help="compara com resultados salvos por --json")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="queda máxima de verif./s aceita em relação ao baseline")
+    UpstreamProfile.add_arguments(parser)
+    args = parser.parse_args()
+    
+    options = {
+        "concurrency": args.concurrency,
+        "per_host": args.per_host,
+        "retries": args.retries,
+        "timeout": args.timeout,
+        "interval": args.interval,
+        "duration": args.duration,
+        "log": args.log
+    }
+    
+    results = []
+    print_header()
+    with FakeUpstream(UpstreamProfile.from_args(args)) as upstream:
+        for mode in args.modes:
+            for size in args.sizes:
+                results.append(run_isolated(mode, size, upstream.base_url, options))
+                print_row(results[-1])
+    
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressões em relação ao baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nSem regressões em relação ao baseline")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Benchmark do custo por verificação no caminho quente do HealthChecker
+
+Compara o resultado pydantic (HealthCheckResult) com o ProbeResult compacto,
+a URL re-convertida a cada uso com a string pré-calculada, e o log formatado
+em INFO com o log preguiçoso em DEBUG.
+
+Uso: python -m benchmarks.result_overhead [--checks 20000]
+"""
+import argparse
+import asyncio
+import io
+import logging
+import sys
+import tracemalloc
+from time import perf_counter
+
+import httpx
+
+from app.core.models import EndpointConfig, HealthCheckResult, HealthStatus, ProbeResult
+from app.monitor.health_checker import HealthChecker
+
+
+def per_call(func, repeat: int) -> float:
+    start = perf_counter()
+    for _ in range(repeat):
+        func()
+    return (perf_counter() - start) / repeat * 1e6
+
+
+def bytes_per_object(factory, count: int = 10000) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def micro_benchmarks(repeat: int) -> list[tuple[str, float, float]]:
+    endpoint = EndpointConfig(name="API", url="https://api.example.com/health")
+    target = endpoint.target
+    
+    log = logging.getLogger("benchmarks.hot_path")
+    log.handlers = [logging.StreamHandler(io.StringIO())]
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    
+    def pydantic_result():
+        return HealthCheckResult(
+            endpoint=endpoint.name,
+            url=str(endpoint.url),
+            status=HealthStatus.HEALTHY,
+            response_time=0.123,
+            status_code=200
+        )
+    
+    def probe_result():
+        return ProbeResult(endpoint.name, target, HealthStatus.HEALTHY, 0.123, 200)
+    
+    def eager_log():
+        log.info(f"{endpoint.name}: HEALTHY (status={200}, time={0.123:.2f}s)")
+    
+    def lazy_log():
+        log.debug("%s: HEALTHY (status=%s, time=%.2fs)", endpoint.name, 200, 0.123)
+    
+    return [
+        ("resultado", per_call(pydantic_result, repeat), per_call(probe_result, repeat)),
+        ("url", per_call(lambda: str(endpoint.url), repeat), per_call(lambda: endpoint.target, repeat)),
+        ("log de sucesso", per_call(eager_log, repeat), per_call(lazy_log, repeat))
+    ]
+
+
+async def end_to_end(checks: int) -> float:
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+    endpoints = [
+        EndpointConfig(name=f"E{i}", url=f"https://h{i % 50}.example.com/{i}")
+        for i in range(checks)
+    ]
+    logging.getLogger("app.monitor.health_checker").setLevel(logging.INFO)
+    
+    async with HealthChecker(max_retries=1, transport=transport) as checker:
+        await checker.check_multiple(endpoints[:100])
+        start = perf_counter()
+        await checker.check_multiple(endpoints)
+        return (perf_counter() - start) / checks * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--checks", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=50000)
+    args = parser.parse_args()
+    
+    print(f"{'etapa':<16}{'antes (µs)':>12}{'depois (µs)':>13}{'redução':>10}")
+    saved = 0.0
+    for name, before, after in micro_benchmarks(args.repeat):
+        saved += before - after
+        print(f"{name:<16}{before:>12.2f}{after:>13.2f}{before / after:>9.1f}x")
+    
+    endpoint = EndpointConfig(name="API", url="https://api.example.com/health")
+    pydantic_size = bytes_per_object(lambda: HealthCheckResult(
+        endpoint=endpoint.name, url=endpoint.target, status=HealthStatus.HEALTHY,
+        response_time=0.1, status_code=200
+    ))
+    probe_size = bytes_per_object(
+        lambda: ProbeResult(endpoint.name, endpoint.target, HealthStatus.HEALTHY, 0.1, 200)
+    )
+    
+    per_check = asyncio.run(end_to_end(args.checks))
+    print(f"\nmemória por resultado: {pydantic_size:.0f} B → {probe_size:.0f} B")
+    print(f"economia estimada por verificação: {saved:.2f} µs")
+    print(f"check_endpoint de ponta a ponta (MockTransport): {per_check:.1f} µs/verificação")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Servidor HTTP local que simula upstreams para os benchmarks
+
+Responde com latência configurável e, por sorteio a cada requisição, pode
+devolver erro 500, não responder (timeout) ou enviar a resposta byte a byte
+(slowloris). Roda em um processo separado para não disputar CPU com o checker.
+
+Uso isolado: python -m benchmarks.upstream --port 8900 --latency 0.02
+"""
+import argparse
+import asyncio
+import multiprocessing
+import random
+from dataclasses import dataclass
+
+RESPONSE = (
+    "HTTP/1.1 {status} {reason}\r\n"
+    "Content-Type: text/plain\r\n"
+    "Content-Length: 2\r\n"
+    "Connection: keep-alive\r\n"
+    "\r\n"
+    "ok"
+)
+REASONS = {200: "OK", 500: "Internal Server Error"}
+
+
+@dataclass
+class UpstreamProfile:
+    latency: float = 0.01
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    slowloris_rate: float = 0.0
+    hang_seconds: float = 30.0
+    slowloris_delay: float = 0.05
+    
+    @staticmethod
+    def add_arguments(parser: argparse.ArgumentParser) -> None:
+        parser.add_argument("--latency", type=float, default=0.01, help="latência base em segundos")
+        parser.add_argument("--jitter", type=float, default=0.0, help="variação uniforme somada à latência")
+        parser.add_argument("--error-rate", type=float, default=0.0, help="fração de respostas 500")
+        parser.add_argument("--timeout-rate", type=float, default=0.0, help="fração de requisições sem resposta")
+        parser.add_argument("--slowloris-rate", type=float, default=0.0, help="fração de respostas byte a byte")
+        parser.add_argument("--hang-seconds", type=float, default=30.0)
+        parser.add_argument("--slowloris-delay", type=float, default=0.05)
+    
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "UpstreamProfile":
+        return cls(
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            timeout_rate=args.timeout_rate,
+            slowloris_rate=args.slowloris_rate,
+            hang_seconds=args.hang_seconds,
+            slowloris_delay=args.slowloris_delay
+        )
+
+
+async def handle_connection(
+    profile: UpstreamProfile, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    try:
+        while True:
+            headers = await reader.readuntil(b"\r\n\r\n")
+            for line in headers.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    await reader.readexactly(int(line.split(b":", 1)[1]))
+            
+            # Um único sorteio escolhe o comportamento: timeout, erro, slowloris ou normal
+            roll = random.random()
+            if roll < profile.timeout_rate:
+                await asyncio.sleep(profile.hang_seconds)
+                return
+            roll -= profile.timeout_rate
+            
+            await asyncio.sleep(profile.latency + random.uniform(0, profile.jitter))
+            status = 500 if roll < profile.error_rate else 200
+            response = RESPONSE.format(status=status, reason=REASONS[status]).encode()
+            
+            if status == 200 and roll < profile.error_rate + profile.slowloris_rate:
+                for i in range(len(response)):
+                    writer.write(response[i:i + 1])
+                    await writer.drain()
+                    await asyncio.sleep(profile.slowloris_delay)
+            else:
+                writer.write(response)
+                await writer.drain()
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(profile: UpstreamProfile, host: str, port: int, ready=None) -> None:
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(profile, reader, writer),
+        host,
+        port,
+        backlog=4096
+    )
+    if ready is not None:
+        ready.put(server.sockets[0].getsockname()[1])
+    async with server:
+        await server.serve_forever()
+
+
+def _run(profile: UpstreamProfile, host: str, port: int, ready) -> None:
+    try:
+        asyncio.run(serve(profile, host, port, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+class FakeUpstream:
+    def __init__(self, profile: UpstreamProfile, host: str = "127.0.0.1", port: int = 0):
+        self.profile = profile
+        self.host = host
+        self.port = port
+        self._process = None
+    
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+    
+    def __enter__(self) -> "FakeUpstream":
+        context = multiprocessing.get_context("spawn")
+        ready = context.Queue()
+        self._process = context.Process(
+            target=_run, args=(self.profile, self.host, self.port, ready), daemon=True
+        )
+        self._process.start()
+        self.port = ready.get(timeout=30)
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._process.terminate()
+        self._process.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor de upstreams simulados")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    UpstreamProfile.add_arguments(parser)
+    args = parser.parse_args()
+    
+    print(f"Upstream simulado em http://{args.host}:{args.port}")
+    _run(UpstreamProfile.from_args(args), args.host, args.port, None)
+
+
+if __name__ == "__main__":
+    main()
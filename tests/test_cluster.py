@@ -0,0 +1,118 @@
+import asyncio
+import multiprocessing
+import time
+
+import httpx
+import pytest
+
+from app.cluster.coordinator import Coordinator
+from app.cluster.protocol import assign_messages, parse_address, result_from_message, result_to_message
+from app.cluster.ring import HashRing
+from app.cluster.worker import Worker
+from app.core.endpoints import EndpointRegistry
+from app.core.models import EndpointConfig, HealthStatus, ProbeResult
+from app.monitor.engine import ResultSink
+from app.monitor.health_checker import HealthChecker
+
+
+class CollectingSink(ResultSink):
+    def __init__(self):
+        self.seen: set[str] = set()
+    
+    async def handle(self, result: ProbeResult) -> None:
+        self.seen.add(result.endpoint)
+
+
+def run_worker(address: str, worker_id: str) -> None:
+    async def main():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200))
+        async with HealthChecker(max_retries=1, transport=transport) as checker:
+            await Worker(worker_id, address, checker=checker, heartbeat_interval=0.2).run()
+    
+    asyncio.run(main())
+
+
+async def wait_until(condition, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condição não atingida a tempo")
+        await asyncio.sleep(0.05)
+
+
+def test_hash_ring_moves_only_the_keys_of_the_changed_node():
+    ring = HashRing(virtual_nodes=64)
+    for node in ("w1", "w2", "w3"):
+        ring.add(node)
+    keys = [f"endpoint-{i}" for i in range(3000)]
+    before = {key: ring.owner(key) for key in keys}
+    
+    ring.add("w4")
+    after = {key: ring.owner(key) for key in keys}
+    moved = [key for key in keys if before[key] != after[key]]
+    
+    assert all(after[key] == "w4" for key in moved)
+    assert 0.15 < len(moved) / len(keys) < 0.35
+    
+    ring.remove("w2")
+    final = {key: ring.owner(key) for key in keys}
+    assert all(final[key] == after[key] for key in keys if after[key] != "w2")
+    assert "w2" not in final.values()
+
+
+def test_protocol_round_trips_results_and_assignments():
+    result = ProbeResult("API", "https://api.example.com/", HealthStatus.DEGRADED, 0.4, 503, "erro")
+    
+    assert result_from_message(result_to_message(result)) == result
+    assert parse_address("127.0.0.1:7070") == ("127.0.0.1", 7070, None)
+    assert parse_address("unix:/tmp/sentinel.sock") == (None, None, "/tmp/sentinel.sock")
+    assert parse_address("sentinel.sock") == (None, None, "sentinel.sock")
+    
+    endpoints = [EndpointConfig(name=f"E{i}", url=f"https://e{i}.example.com") for i in range(1200)]
+    messages = assign_messages(endpoints, ["Old"])
+    assert len(messages) == 4
+    assert b'"remove":["Old"]' in messages[0]
+
+
+@pytest.mark.asyncio
+async def test_coordinator_shards_endpoints_across_worker_processes(tmp_path):
+    address = f"unix:{tmp_path / 'cluster.sock'}"
+    endpoints = [
+        EndpointConfig(name=f"E{i}", url=f"https://e{i}.example.com", interval=0.1)
+        for i in range(40)
+    ]
+    names = {endpoint.name for endpoint in endpoints}
+    sink = CollectingSink()
+    coordinator = Coordinator(EndpointRegistry(endpoints), [sink], address=address, heartbeat_timeout=2)
+    task = asyncio.create_task(coordinator.run())
+    await wait_until(lambda: (tmp_path / "cluster.sock").exists(), timeout=5)
+    
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=run_worker, args=(address, f"w{i}"), daemon=True)
+        for i in range(2)
+    ]
+    for process in processes:
+        process.start()
+    
+    try:
+        await wait_until(lambda: len(coordinator.workers) == 2 and sink.seen == names)
+        shards = [set(worker.assigned) for worker in coordinator.workers.values()]
+        assert shards[0] and shards[1]
+        assert not shards[0] & shards[1]
+        assert shards[0] | shards[1] == names
+        
+        processes[0].terminate()
+        await wait_until(lambda: list(coordinator.workers) == ["w1"])
+        assert set(coordinator.workers["w1"].assigned) == names
+        
+        sink.seen.clear()
+        await wait_until(lambda: sink.seen == names)
+    finally:
+        for process in processes:
+            process.terminate()
+            process.join(timeout=5)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    
+    assert not (tmp_path / "cluster.sock").exists()
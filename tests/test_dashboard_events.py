@@ -0,0 +1,39 @@
+import json
+
+from app.dashboard.events import EventBroadcaster
+
+
+async def test_broadcaster_streams_initial_snapshot_and_deltas():
+    broadcaster = EventBroadcaster()
+    stream = broadcaster.stream(initial=EventBroadcaster.format("snapshot", {"results": []}))
+    
+    assert (await anext(stream)).startswith("event: snapshot")
+    assert broadcaster.subscribers == 1
+    
+    broadcaster.publish("result", {"name": "API", "status": "down"})
+    event, data = (await anext(stream)).strip().split("\n")
+    
+    assert event == "event: result"
+    assert json.loads(data.removeprefix("data: ")) == {"name": "API", "status": "down"}
+    
+    await stream.aclose()
+    assert broadcaster.subscribers == 0
+
+
+async def test_broadcaster_sends_keepalive_when_idle():
+    broadcaster = EventBroadcaster()
+    stream = broadcaster.stream(keepalive=0.01)
+    
+    assert await anext(stream) == ": keepalive\n\n"
+    await stream.aclose()
+
+
+async def test_broadcaster_disconnects_slow_subscribers():
+    broadcaster = EventBroadcaster(max_pending=2)
+    queue = broadcaster.subscribe()
+    
+    for i in range(3):
+        broadcaster.publish("result", {"index": i})
+    
+    assert broadcaster.subscribers == 0
+    assert queue.qsize() == 3
@@ -0,0 +1,60 @@
+from app.dashboard.index import StatusIndex
+
+
+def entry(name, status="healthy", response_time=0.1, timestamp="2024-01-01T00:00:00"):
+    return {
+        "name": name,
+        "status": status,
+        "response_time": response_time,
+        "timestamp": timestamp
+    }
+
+
+def build_index():
+    index = StatusIndex()
+    index.update(entry("api-users", "healthy", 0.2), ["prod"])
+    index.update(entry("api-orders", "down", 1.5), ["prod", "billing"])
+    index.update(entry("web-home", "degraded", 0.9), ["staging"])
+    index.update(entry("api-search", "healthy", 0.05), [])
+    return index
+
+
+def test_query_filters_by_status_prefix_and_tag():
+    index = build_index()
+    
+    assert [e["name"] for e in index.query(status="healthy")["items"]] == ["api-search", "api-users"]
+    assert [e["name"] for e in index.query(prefix="api-")["items"]] == [
+        "api-orders", "api-search", "api-users"
+    ]
+    assert [e["name"] for e in index.query(prefix="api-", tag="prod")["items"]] == [
+        "api-orders", "api-users"
+    ]
+    assert index.query(status="down", tag="staging")["total"] == 0
+
+
+def test_query_sorts_and_paginates():
+    index = build_index()
+    
+    first = index.query(sort="latency", descending=True, page=1, page_size=3)
+    second = index.query(sort="latency", descending=True, page=2, page_size=3)
+    
+    assert [e["name"] for e in first["items"]] == ["api-orders", "web-home", "api-users"]
+    assert [e["name"] for e in second["items"]] == ["api-search"]
+    assert first["total"] == 4
+    assert first["pages"] == 2
+
+
+def test_last_change_moves_only_on_status_transition():
+    index = StatusIndex()
+    index.update(entry("api", "healthy", timestamp="2024-01-01T00:00:00"))
+    index.update(entry("api", "healthy", timestamp="2024-01-01T00:01:00"))
+    assert index.entries["api"]["last_change"] == "2024-01-01T00:00:00"
+    
+    index.update(entry("api", "down", timestamp="2024-01-01T00:02:00"))
+    assert index.entries["api"]["last_change"] == "2024-01-01T00:02:00"
+    assert index.query(status="healthy")["total"] == 0
+    assert index.query(status="down")["total"] == 1
+    
+    index.update(entry("db", "healthy", timestamp="2024-01-01T00:03:00"))
+    ordered = index.query(sort="last_change", descending=True)["items"]
+    assert [e["name"] for e in ordered] == ["db", "api"]
@@ -0,0 +1,36 @@
+import gzip
+import json
+
+from app.dashboard.snapshot import SnapshotCache, accepted_encodings
+
+
+def test_snapshot_cache_serves_compressed_body_with_etag():
+    cache = SnapshotCache()
+    cache.publish("status", {"results": [{"name": "API", "status": "healthy"}]})
+    
+    status, headers, body = cache.select("status", None, "gzip, deflate")
+    
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(body)) == {"results": [{"name": "API", "status": "healthy"}]}
+
+
+def test_snapshot_cache_returns_304_until_new_version():
+    cache = SnapshotCache()
+    etag = cache.publish("status", {"version": 1}).etag
+    
+    status, _, body = cache.select("status", etag, "")
+    assert status == 304
+    assert body == b""
+    
+    cache.publish("status", {"version": 2})
+    status, headers, body = cache.select("status", etag, "")
+    
+    assert status == 200
+    assert headers["ETag"] != etag
+    assert "Content-Encoding" not in headers
+    assert json.loads(body) == {"version": 2}
+
+
+def test_accepted_encodings_ignores_refused_codings():
+    assert accepted_encodings("gzip;q=0.8, br;q=0, identity") == {"gzip", "identity"}
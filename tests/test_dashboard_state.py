@@ -0,0 +1,152 @@
+import json
+
+from starlette.testclient import TestClient
+
+import web_dashboard
+from app.core.endpoints import EndpointRegistry
+from app.core.models import HealthStatus, ProbeResult
+from app.core.stats import StatsTracker
+from app.dashboard.sink import DashboardSink
+from app.dashboard.state import DashboardState
+from app.monitor.sinks import StatsSink
+
+
+def entry(name, status):
+    return {"name": name, "status": status.value, "response_time": 0.1}
+
+
+async def test_sweep_replaces_snapshot_without_touching_previous_readers():
+    state = DashboardState()
+    state.record(entry("api", HealthStatus.HEALTHY))
+    before = await state.complete_sweep()
+    
+    state.record(entry("api", HealthStatus.DOWN))
+    assert state.snapshot is before
+    
+    after = await state.complete_sweep()
+    
+    assert before.results[0]["status"] == "healthy"
+    assert before.stats["healthy"] == 1
+    assert len(before.history) == 1
+    assert after.results[0]["status"] == "down"
+    assert after.stats["down"] == 1
+    assert len(after.history) == 2
+
+
+async def test_status_route_reads_current_snapshot(monkeypatch):
+    state = DashboardState()
+    state.record(entry("api", HealthStatus.DEGRADED))
+    await state.complete_sweep()
+    monkeypatch.setattr(web_dashboard, "dashboard", state)
+    
+    client = TestClient(web_dashboard.app)
+    cached = client.get("/api/status").json()
+    paged = client.get("/api/status", params={"status": "degraded"}).json()
+    
+    assert cached["stats"]["degraded"] == 1
+    assert "history" not in cached
+    assert paged["total"] == 1
+    assert paged["items"][0]["name"] == "api"
+    assert client.get("/api/status", params={"sort": "nope"}).status_code == 400
+
+
+async def test_history_route_filters_through_index_and_sorts(monkeypatch):
+    state = DashboardState()
+    state.record({"name": "api-b", "status": "down", "response_time": 0.5}, ["prod"])
+    state.record({"name": "api-a", "status": "down", "response_time": 0.9}, ["prod"])
+    state.record({"name": "web", "status": "down", "response_time": 0.1}, ["prod"])
+    await state.complete_sweep()
+    monkeypatch.setattr(web_dashboard, "dashboard", state)
+    
+    client = TestClient(web_dashboard.app)
+    by_latency = client.get(
+        "/api/history", params={"prefix": "api-", "tag": "prod", "sort": "latency", "order": "desc"}
+    ).json()
+    by_name = client.get("/api/history", params={"prefix": "api-"}).json()
+    
+    assert [r["name"] for r in by_latency["history"][0]["results"]] == ["api-a", "api-b"]
+    assert [r["name"] for r in by_name["history"][0]["results"]] == ["api-a", "api-b"]
+    assert client.get("/api/history", params={"sort": "last_change"}).status_code == 400
+
+
+async def test_history_route_uses_same_order_cached_and_filtered(monkeypatch):
+    state = DashboardState()
+    for status in (HealthStatus.HEALTHY, HealthStatus.DOWN):
+        state.record(entry("api", status))
+        await state.complete_sweep()
+    monkeypatch.setattr(web_dashboard, "dashboard", state)
+    
+    client = TestClient(web_dashboard.app)
+    cached = client.get("/api/history").json()["history"]
+    paged = client.get("/api/history", params={"page": 1}).json()["history"]
+    
+    assert [h["results"][0]["status"] for h in cached] == ["down", "healthy"]
+    assert [h["timestamp"] for h in paged] == [h["timestamp"] for h in cached]
+
+
+async def test_counts_follow_status_transitions_incrementally():
+    state = DashboardState()
+    state.record(entry("a", HealthStatus.HEALTHY))
+    state.record(entry("b", HealthStatus.HEALTHY))
+    state.record(entry("a", HealthStatus.DOWN))
+    state.record(entry("c", HealthStatus.DEGRADED))
+    
+    assert (await state.complete_sweep()).stats == {
+        "total_endpoints": 3,
+        "healthy": 1,
+        "degraded": 1,
+        "down": 1
+    }
+
+
+async def test_sweep_publishes_state_changes_as_one_event():
+    state = DashboardState()
+    queue = state.events.subscribe()
+    
+    state.record({"name": "api", "status": "healthy", "response_time": 0.1, "status_code": 200})
+    state.record({"name": "api", "status": "healthy", "response_time": 0.4, "status_code": 200})
+    state.record({"name": "api", "status": "down", "response_time": 0.0, "status_code": None})
+    state.record(entry("gone", HealthStatus.HEALTHY))
+    state.remove("gone")
+    assert queue.empty()
+    
+    await state.complete_sweep()
+    event, data = queue.get_nowait().strip().split("\n")
+    sweep = json.loads(data.removeprefix("data: "))
+    
+    assert event == "event: sweep"
+    assert [(change["name"], change["status"]) for change in sweep["changes"]] == [("api", "down")]
+    assert sweep["removed"] == ["gone"]
+    assert "history_entry" not in sweep
+    assert queue.empty()
+
+
+async def test_sweep_with_many_changes_keeps_subscribers_connected():
+    state = DashboardState()
+    state.events.subscribe()
+    
+    for i in range(state.events.max_pending + 1):
+        state.record(entry(f"api-{i}", HealthStatus.DOWN))
+    sweep = await state.complete_sweep()
+    
+    assert state.events.subscribers == 1
+    assert sweep.stats["down"] == state.events.max_pending + 1
+
+
+async def test_dashboard_reads_latency_recorded_once_by_stats_sink(tmp_path):
+    state = DashboardState()
+    stats_tracker = StatsTracker(str(tmp_path / "stats.json"))
+    sinks = [StatsSink(stats_tracker), DashboardSink(state, EndpointRegistry([]), stats_tracker)]
+    
+    for response_time in (0.1, 0.3):
+        result = ProbeResult("api", "https://example.com", HealthStatus.HEALTHY, response_time)
+        for sink in sinks:
+            await sink.handle(result)
+    
+    assert stats_tracker.get_latency_percentiles("api")["count"] == 2
+    assert state.index.entries["api"]["latency"]["count"] == 2
+    
+    for sink in sinks:
+        sink.remove_endpoint("api")
+    assert "api" not in stats_tracker.latency.windows
+    await sinks[0].close()
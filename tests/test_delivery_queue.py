@@ -0,0 +1,202 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.core.models import HealthCheckResult, HealthStatus
+from app.notifier.base import DeliveryError, NotifierBase
+from app.notifier.discord import DiscordNotifier
+from app.notifier.queue import DeliveryQueue, TokenBucket
+from app.notifier.telegram import MAX_MESSAGE_LENGTH, TelegramNotifier
+
+
+class FlakyNotifier(NotifierBase):
+    name = "flaky"
+    rate_limit = 100.0
+    burst = 10
+    
+    def __init__(self, failures):
+        self.failures = list(failures)
+        self.delivered = []
+    
+    def is_configured(self) -> bool:
+        return True
+    
+    async def send_alert(self, result: HealthCheckResult) -> bool:
+        return True
+    
+    async def deliver(self, results: list[HealthCheckResult]) -> None:
+        if self.failures:
+            raise self.failures.pop(0)
+        self.delivered.append(results)
+
+
+def make_result(name="Test"):
+    return HealthCheckResult(
+        endpoint=name,
+        url="https://example.com",
+        status=HealthStatus.DOWN,
+        response_time=1.0
+    )
+
+
+@pytest.mark.asyncio
+async def test_delivery_queue_retries_after_rate_limit(tmp_path):
+    notifier = FlakyNotifier([
+        DeliveryError("HTTP 429", retry_after=0.05),
+        DeliveryError("HTTP 502")
+    ])
+    queue = DeliveryQueue(
+        [notifier], spill_file=str(tmp_path / "spill.jsonl"), retry_base=0.01
+    )
+    task = asyncio.create_task(queue.run())
+    
+    queue.submit([make_result()])
+    await asyncio.wait_for(queue.join(), timeout=2)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    queue.close()
+    
+    assert len(notifier.delivered) == 1
+    assert queue.depth == 0
+    assert (tmp_path / "spill.jsonl").read_text() == ""
+
+
+@pytest.mark.asyncio
+async def test_delivery_queue_drops_non_retryable_errors(tmp_path):
+    notifier = FlakyNotifier([DeliveryError("HTTP 400", retryable=False)])
+    queue = DeliveryQueue([notifier], spill_file=str(tmp_path / "spill.jsonl"))
+    task = asyncio.create_task(queue.run())
+    
+    queue.submit([make_result()])
+    await asyncio.wait_for(queue.join(), timeout=2)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    
+    assert notifier.delivered == []
+    assert queue.depth == 0
+
+
+@pytest.mark.asyncio
+async def test_delivery_queue_restores_pending_jobs_from_spill(tmp_path):
+    spill_file = str(tmp_path / "spill.jsonl")
+    first = DeliveryQueue([FlakyNotifier([])], spill_file=spill_file)
+    first.submit([make_result("A"), make_result("B")])
+    first.close()
+    
+    notifier = FlakyNotifier([])
+    second = DeliveryQueue([notifier], spill_file=spill_file)
+    task = asyncio.create_task(second.run())
+    await asyncio.wait_for(second.join(), timeout=2)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    
+    assert [[r.endpoint for r in batch] for batch in notifier.delivered] == [["A", "B"]]
+
+
+@pytest.mark.asyncio
+async def test_delivery_queue_discards_jobs_of_unconfigured_channels(tmp_path):
+    spill_file = tmp_path / "spill.jsonl"
+    first = DeliveryQueue([FlakyNotifier([])], spill_file=str(spill_file))
+    first.submit([make_result("A")])
+    first.close()
+    
+    second = DeliveryQueue([], spill_file=str(spill_file))
+    second.close()
+    
+    assert second.depth == 0
+    assert spill_file.read_text() == ""
+
+
+@pytest.mark.asyncio
+async def test_delivery_queue_drops_invalid_spilled_jobs(tmp_path):
+    spill_file = tmp_path / "spill.jsonl"
+    job = {"id": "bad", "channel": "flaky", "results": [{"endpoint": "A"}], "attempts": 0}
+    spill_file.write_text(json.dumps({"op": "add", "job": job}) + "\n")
+    
+    queue = DeliveryQueue([FlakyNotifier([])], spill_file=str(spill_file))
+    queue.close()
+    
+    assert queue.depth == 0
+    assert spill_file.read_text() == ""
+
+
+@pytest.mark.asyncio
+async def test_delivery_queue_persists_attempts_across_restarts(tmp_path):
+    spill_file = str(tmp_path / "spill.jsonl")
+    notifier = FlakyNotifier([DeliveryError("HTTP 502")] * 10)
+    first = DeliveryQueue([notifier], spill_file=spill_file, max_attempts=3, retry_base=10)
+    task = asyncio.create_task(first.run())
+    first.submit([make_result()])
+    await asyncio.sleep(0.05)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    first.close()
+    
+    second = DeliveryQueue([notifier], spill_file=spill_file, max_attempts=3)
+    assert [job.attempts for job in second._pending.values()] == [1]
+    second.close()
+    
+    exhausted = DeliveryQueue([notifier], spill_file=spill_file, max_attempts=1)
+    exhausted.close()
+    assert exhausted.depth == 0
+
+
+@pytest.mark.asyncio
+async def test_telegram_jobs_fit_in_a_single_message(monkeypatch):
+    monkeypatch.setattr("app.notifier.telegram.settings.telegram_bot_token", "token")
+    monkeypatch.setattr("app.notifier.telegram.settings.telegram_chat_id", "chat")
+    posts = []
+    
+    def handler(request):
+        posts.append(request)
+        return httpx.Response(200)
+    
+    results = [
+        make_result(f"endpoint-{i}").model_copy(update={"error_message": "x" * 150})
+        for i in range(120)
+    ]
+    payload = [result.model_dump(mode="json") for result in results]
+    
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        notifier = TelegramNotifier(client)
+        batches = list(notifier.batches(payload))
+        for batch in batches:
+            await notifier.deliver([HealthCheckResult.model_validate(entry) for entry in batch])
+    
+    assert len(batches) > 1
+    assert sum(len(batch) for batch in batches) == len(results)
+    assert len(posts) == len(batches)
+    for batch in batches:
+        digest = notifier._format_digest([HealthCheckResult.model_validate(e) for e in batch])
+        assert len(digest) == 1
+        assert len(digest[0]) <= MAX_MESSAGE_LENGTH
+
+
+@pytest.mark.asyncio
+async def test_discord_deliver_reports_retry_after():
+    def handler(request):
+        return httpx.Response(429, json={"retry_after": 1.5})
+    
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        notifier = DiscordNotifier(client)
+        notifier.webhook_url = "https://discord.example.com/webhook"
+        
+        with pytest.raises(DeliveryError) as error:
+            await notifier.deliver([make_result()])
+    
+    assert error.value.retryable
+    assert error.value.retry_after == 1.5
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, capacity=2)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    
+    for _ in range(4):
+        await bucket.acquire()
+    
+    assert loop.time() - start >= 0.09
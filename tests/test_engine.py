@@ -0,0 +1,88 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.endpoints import EndpointRegistry
+from app.core.metrics import CIRCUITS_OPEN
+from app.core.models import EndpointConfig, HealthStatus
+from app.monitor.engine import MonitorEngine, ResultSink
+from app.monitor.health_checker import HealthChecker
+
+
+class RecordingSink(ResultSink):
+    def __init__(self, name):
+        self.name = name
+        self.results = []
+        self.events = []
+    
+    async def open(self):
+        self.events.append("open")
+    
+    async def handle(self, result):
+        self.results.append(result)
+    
+    async def close(self):
+        self.events.append("close")
+
+
+class FailingSink(ResultSink):
+    name = "failing"
+    
+    async def handle(self, result):
+        raise RuntimeError("boom")
+
+
+@pytest.mark.asyncio
+async def test_engine_fans_one_probe_stream_out_to_every_sink():
+    requests = []
+    
+    def handler(request):
+        requests.append(request.url.host)
+        return httpx.Response(200)
+    
+    endpoints = [
+        EndpointConfig(name="A", url="https://a.example.com", interval=0.05),
+        EndpointConfig(name="B", url="https://b.example.com", interval=0.05)
+    ]
+    first, second = RecordingSink("first"), RecordingSink("second")
+    
+    async with HealthChecker(max_retries=1, transport=httpx.MockTransport(handler)) as checker:
+        engine = MonitorEngine(EndpointRegistry(endpoints), [first, FailingSink(), second], checker=checker)
+        task = asyncio.create_task(engine.run())
+        await asyncio.sleep(0.2)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    
+    assert len(first.results) >= 4
+    assert [r.endpoint for r in first.results] == [r.endpoint for r in second.results]
+    assert len(requests) == len(first.results)
+    assert all(r.status == HealthStatus.HEALTHY for r in second.results)
+    assert first.events == ["open", "close"]
+
+
+@pytest.mark.asyncio
+async def test_engine_binds_open_circuits_gauge_to_its_checker():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+    async with HealthChecker(transport=transport) as checker:
+        engine = MonitorEngine(EndpointRegistry([]), [], checker=checker)
+        task = asyncio.create_task(engine.run())
+        await asyncio.sleep(0)
+        HealthChecker()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    
+    assert CIRCUITS_OPEN._unlabelled.function == checker.open_circuits
+
+
+def test_registry_precomputes_targets_and_rejects_duplicates():
+    registry = EndpointRegistry([
+        EndpointConfig(name="API", url="https://api.example.com/health", tags=["prod"]),
+        EndpointConfig(name="API", url="https://other.example.com")
+    ])
+    
+    assert len(registry) == 1
+    assert registry.url_for("API") == "https://api.example.com/health"
+    assert registry.get("API").host == "api.example.com"
+    assert registry.tags_for("API") == ["prod"]
+    assert registry.url_for("missing") == ""
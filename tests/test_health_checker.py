@@ -1,6 +1,12 @@
+import asyncio
+
+import httpx
 import pytest
 
-from app.core.models import EndpointConfig, HealthStatus
+from app.core.alerts import CircuitBreaker, CircuitConfig, CircuitState
+from app.core.models import (
+    EndpointConfig, HealthCheckResult, HealthStatus, ProbeResult, RetryPolicy
+)
 from app.monitor.health_checker import HealthChecker
 
 
@@ -63,3 +69,207 @@ async def test_health_checker_multiple_endpoints():
     
     assert len(results) == 2
     assert all(r.response_time > 0 for r in results)
+
+
+@pytest.mark.asyncio
+async def test_health_checker_respects_concurrency_limits():
+    in_flight = {"total": 0, "peak": 0}
+    per_host = {}
+    per_host_peak = {}
+    
+    async def handler(request):
+        host = request.url.host
+        in_flight["total"] += 1
+        per_host[host] = per_host.get(host, 0) + 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["total"])
+        per_host_peak[host] = max(per_host_peak.get(host, 0), per_host[host])
+        await asyncio.sleep(0.01)
+        in_flight["total"] -= 1
+        per_host[host] -= 1
+        return httpx.Response(200)
+    
+    endpoints = [
+        EndpointConfig(name=f"E{i}", url=f"https://host{i % 3}.example.com/{i}")
+        for i in range(60)
+    ]
+    
+    async with HealthChecker(
+        max_retries=1,
+        max_concurrency=8,
+        max_concurrency_per_host=2,
+        transport=httpx.MockTransport(handler)
+    ) as checker:
+        results = await checker.check_multiple(endpoints)
+    
+    assert [r.endpoint for r in results] == [e.name for e in endpoints]
+    assert all(r.status == HealthStatus.HEALTHY for r in results)
+    assert in_flight["peak"] <= 6
+    assert max(per_host_peak.values()) <= 2
+
+
+@pytest.mark.asyncio
+async def test_health_checker_iter_results_yields_as_completed():
+    async def handler(request):
+        if request.url.host == "slow.example.com":
+            await asyncio.sleep(0.2)
+        return httpx.Response(200)
+    
+    endpoints = [
+        EndpointConfig(name="Slow", url="https://slow.example.com"),
+        EndpointConfig(name="Fast", url="https://fast.example.com")
+    ]
+    
+    async with HealthChecker(max_retries=1, transport=httpx.MockTransport(handler)) as checker:
+        names = [result.endpoint async for result in checker.iter_results(endpoints)]
+        ordered = await checker.check_multiple(endpoints)
+    
+    assert names == ["Fast", "Slow"]
+    assert [r.endpoint for r in ordered] == ["Slow", "Fast"]
+
+
+@pytest.mark.asyncio
+async def test_health_checker_returns_compact_results_convertible_to_model():
+    endpoint = EndpointConfig(name="API", url="https://api.example.com/health", expected_status=204)
+    transport = httpx.MockTransport(lambda request: httpx.Response(500))
+    
+    async with HealthChecker(max_retries=1, transport=transport) as checker:
+        result = await checker.check_endpoint(endpoint)
+    
+    assert isinstance(result, ProbeResult)
+    assert not hasattr(result, "__dict__")
+    
+    model = result.to_model()
+    assert isinstance(model, HealthCheckResult)
+    assert model.status == HealthStatus.DEGRADED
+    assert model.url == "https://api.example.com/health"
+    assert model.status_code == 500
+    assert model.checked_at == pytest.approx(result.checked_at)
+    assert model.model_dump(mode="json")["error_message"] == "Status code inesperado: 500"
+
+
+@pytest.mark.asyncio
+async def test_health_checker_opens_circuit_and_probes_once_until_recovery():
+    calls = []
+    healthy = False
+    
+    def handler(request):
+        calls.append(request)
+        if not healthy:
+            raise httpx.ConnectError("recusado")
+        return httpx.Response(200)
+    
+    config = CircuitConfig(failure_threshold=2, open_seconds=30, probe_timeout=1)
+    endpoint = EndpointConfig(
+        name="Circuit API",
+        url="https://circuit.example.com",
+        retry={"base_delay": 0.01, "max_delay": 0.01}
+    )
+    
+    async with HealthChecker(
+        max_retries=2, transport=httpx.MockTransport(handler), circuit_config=config
+    ) as checker:
+        for _ in range(2):
+            await checker.check_endpoint(endpoint)
+        state = checker.circuits["Circuit API"]
+        assert state.state is CircuitState.OPEN
+        assert len(calls) == 4
+        assert checker.resume_at("Circuit API") == state.open_until
+        
+        assert await checker.check_endpoint(endpoint) is None
+        assert await checker.check_multiple([endpoint]) == []
+        assert len(calls) == 4
+        
+        state.open_until = 0.0
+        await checker.check_endpoint(endpoint)
+        assert len(calls) == 5
+        assert state.state is CircuitState.OPEN
+        assert state.consecutive_opens == 2
+        
+        healthy = True
+        state.open_until = 0.0
+        result = await checker.check_endpoint(endpoint)
+        assert result.status == HealthStatus.HEALTHY
+        assert state.state is CircuitState.CLOSED
+        assert checker.resume_at("Circuit API") == 0.0
+
+
+def test_circuit_backoff_doubles_up_to_the_limit():
+    config = CircuitConfig(failure_threshold=1, open_seconds=10, max_open_seconds=25)
+    state = CircuitBreaker()
+    
+    waits = []
+    for _ in range(4):
+        state.allows_probe(state.open_until)
+        state.record_probe(False, config, 100.0)
+        waits.append(state.open_until - 100.0)
+    
+    assert waits == [10, 20, 25, 25]
+    
+    state.allows_probe(state.open_until)
+    state.record_probe(True, config, 200.0)
+    assert state.state is CircuitState.CLOSED
+    assert state.consecutive_opens == 0
+
+
+@pytest.mark.asyncio
+async def test_health_checker_retries_on_configured_status_codes():
+    responses = iter([503, 503, 200])
+    
+    def handler(request):
+        return httpx.Response(next(responses))
+    
+    endpoint = EndpointConfig(
+        name="Flaky API",
+        url="https://flaky.example.com",
+        retry={"max_attempts": 3, "base_delay": 0.01, "max_delay": 0.02, "retry_on": [503]}
+    )
+    strict = endpoint.model_copy(update={"retry": RetryPolicy(max_attempts=3, base_delay=0.01)})
+    
+    async with HealthChecker(transport=httpx.MockTransport(handler)) as checker:
+        result = await checker.check_endpoint(endpoint)
+        assert result.status == HealthStatus.HEALTHY
+        
+        responses = iter([503, 200])
+        result = await checker.check_endpoint(strict)
+        assert result.status == HealthStatus.DEGRADED
+        assert result.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_health_checker_respects_total_deadline():
+    calls = []
+    
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(1)
+        return httpx.Response(200)
+    
+    endpoint = EndpointConfig(
+        name="Slow API",
+        url="https://slow.example.com",
+        retry={"max_attempts": 10, "base_delay": 0.01, "max_delay": 0.01, "deadline": 0.25}
+    )
+    
+    async with HealthChecker(transport=httpx.MockTransport(handler)) as checker:
+        result = await checker.check_endpoint(endpoint)
+    
+    assert result.status == HealthStatus.DOWN
+    assert "Timeout" in result.error_message
+    assert result.response_time < 0.5
+    assert len(calls) <= 2
+
+
+def test_retry_policy_uses_bounded_decorrelated_jitter():
+    policy = RetryPolicy(base_delay=0.5, max_delay=4)
+    
+    delay = 0.0
+    delays = []
+    for _ in range(200):
+        delay = policy.next_delay(delay)
+        delays.append(delay)
+    
+    assert all(0.5 <= value <= 4 for value in delays)
+    assert len(set(delays)) > 1
+    
+    with pytest.raises(ValueError):
+        RetryPolicy(base_delay=5, max_delay=1)
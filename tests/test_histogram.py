@@ -0,0 +1,47 @@
+from app.core.histogram import LatencyHistogram, LatencyTracker, SlidingLatencyWindow
+
+
+def test_histogram_quantiles_within_bucket_precision():
+    histogram = LatencyHistogram()
+    for i in range(1, 1001):
+        histogram.record(i / 1000)
+    
+    assert abs(histogram.quantile(0.50) - 0.5) / 0.5 < 0.05
+    assert abs(histogram.quantile(0.99) - 0.99) / 0.99 < 0.05
+    assert histogram.count == 1000
+
+
+def test_histogram_merge():
+    fast = LatencyHistogram()
+    slow = LatencyHistogram()
+    for _ in range(90):
+        fast.record(0.1)
+    for _ in range(10):
+        slow.record(2.0)
+    
+    fast.merge(slow)
+    
+    assert fast.count == 100
+    assert fast.quantile(0.5) < 0.11
+    assert fast.quantile(0.95) > 1.9
+
+
+def test_sliding_window_expires_old_slots():
+    window = SlidingLatencyWindow(slot_seconds=60, slots=5)
+    window.record(5.0, now=1000)
+    window.record(0.2, now=1250)
+    
+    assert window.merged(now=1250).count == 2
+    assert window.merged(now=1400).count == 1
+
+
+def test_latency_tracker_percentiles_per_endpoint():
+    tracker = LatencyTracker()
+    tracker.record("A", 0.1, now=1000)
+    tracker.record("B", 1.0, now=1000)
+    
+    percentiles = tracker.all_percentiles(now=1000)
+    
+    assert percentiles["A"]["count"] == 1
+    assert percentiles["A"]["p99"] < percentiles["B"]["p50"]
+    assert tracker.percentiles("C")["p50"] is None
@@ -0,0 +1,72 @@
+import io
+import json
+
+import pytest
+
+from app.core.loader import EndpointLoader, iter_json_array
+
+
+def test_json_array_is_streamed_across_chunk_boundaries():
+    entries = [{"name": f"E{i}", "url": f"https://e{i}.example.com"} for i in range(50)]
+    f = io.StringIO(json.dumps(entries, indent=2))
+    
+    streamed = list(iter_json_array(f, chunk_size=7))
+    
+    assert [item for item, _ in streamed] == entries
+    assert all(json.loads(text) == item for item, text in streamed)
+
+
+@pytest.mark.parametrize("text", ["[1,,,2]", "[1 2]", "[1, 2] garbage", "[,1]", "[1,]"])
+def test_json_array_rejects_malformed_separators(text):
+    for chunk_size in (1, 7, 1024):
+        with pytest.raises(ValueError):
+            list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+
+
+def test_loader_reports_bad_entries_and_keeps_the_rest(tmp_path):
+    config = tmp_path / "endpoints.json"
+    config.write_text(json.dumps([
+        {"name": "Good", "url": "https://good.example.com"},
+        {"name": "Bad", "url": "not a url", "method": "FETCH"},
+        "nope",
+        {"name": "Also Good", "url": "https://also.example.com"}
+    ]), encoding="utf-8")
+    
+    result = EndpointLoader(str(config), batch_size=2).load()
+    
+    assert [e.name for e in result.endpoints] == ["Good", "Also Good"]
+    assert [(e.index, e.name) for e in result.errors] == [(1, "Bad"), (2, None)]
+    assert "url" in result.errors[0].message and "method" in result.errors[0].message
+    assert result.complete
+
+
+def test_loader_reads_directory_of_mixed_formats_and_caches_by_content(tmp_path):
+    (tmp_path / "a.json").write_text(
+        json.dumps([{"name": "A", "url": "https://a.example.com"}]), encoding="utf-8"
+    )
+    (tmp_path / "b.ndjson").write_text(
+        '{"name": "B", "url": "https://b.example.com"}\n\n{broken\n', encoding="utf-8"
+    )
+    (tmp_path / "c.yaml").write_text(
+        "- name: C\n  url: https://c.example.com\n  tags: [prod]\n", encoding="utf-8"
+    )
+    (tmp_path / "notes.txt").write_text("ignored", encoding="utf-8")
+    loader = EndpointLoader(str(tmp_path))
+    
+    first = loader.load()
+    second = loader.load()
+    
+    assert [e.name for e in first.endpoints] == ["A", "B", "C"]
+    assert first.endpoints[2].tags == ["prod"]
+    assert [(e.index, e.source.endswith("b.ndjson")) for e in first.errors] == [(3, True)]
+    assert all(a is b for a, b in zip(first.endpoints, second.endpoints))
+
+
+def test_unreadable_file_is_reported_as_incomplete(tmp_path):
+    config = tmp_path / "endpoints.json"
+    config.write_text('[{"name": "A", "url": "https://a.example.com"}, {"name": ', encoding="utf-8")
+    
+    result = EndpointLoader(str(config)).load()
+    
+    assert not result.complete
+    assert result.errors[0].index is None
@@ -0,0 +1,87 @@
+import json
+import logging
+import queue
+
+from app.core.logger import (
+    JsonFormatter, NonBlockingQueueHandler, RateLimitFilter, SizeAndTimeRotatingFileHandler
+)
+
+
+def make_record(
+    msg: str, *args, lineno: int = 10, created: float = 1000.0, level: int = logging.WARNING
+) -> logging.LogRecord:
+    record = logging.makeLogRecord({
+        "name": "app.test", "levelno": level, "levelname": logging.getLevelName(level),
+        "pathname": "app/test.py", "lineno": lineno, "msg": msg, "args": args
+    })
+    record.created = created
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    record = make_record("%s: DOWN", "API")
+    record.endpoint = "API"
+    
+    entry = json.loads(JsonFormatter().format(record))
+    
+    assert entry["message"] == "API: DOWN"
+    assert entry["level"] == "WARNING"
+    assert entry["logger"] == "app.test"
+    assert entry["endpoint"] == "API"
+
+
+def test_rate_limit_per_call_site_and_reports_suppressed():
+    limiter = RateLimitFilter(limit=3, window=10)
+    
+    passed = [limiter.filter(make_record(f"E{i}: falha", created=1000 + i * 0.1)) for i in range(10)]
+    other_site = limiter.filter(make_record("outro", lineno=20, created=1001))
+    
+    assert passed == [True] * 3 + [False] * 7
+    assert other_site
+    assert limiter.dropped == 7
+    
+    later = make_record("E0: falha", created=1011)
+    assert limiter.filter(later)
+    assert "+7 mensagens semelhantes suprimidas" in later.getMessage()
+
+
+def test_rate_limit_never_suppresses_errors():
+    limiter = RateLimitFilter(limit=1, window=10)
+    
+    errors = [
+        make_record(f"E{i}: DOWN após 3 tentativas", lineno=30, level=logging.ERROR)
+        for i in range(50)
+    ]
+    
+    assert all(limiter.filter(record) for record in errors)
+    assert limiter.dropped == 0
+
+
+def test_queue_handler_drops_when_full_without_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+    
+    for i in range(5):
+        handler.handle(make_record(f"mensagem {i}"))
+    
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_file_handler_rotates_by_size_and_time(tmp_path):
+    log_file = tmp_path / "sentinel.log"
+    handler = SizeAndTimeRotatingFileHandler(str(log_file), max_bytes=200, backup_count=3, interval=60)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    
+    try:
+        handler.rollover_at = float("inf")
+        handler.emit(make_record("x" * 150, created=1999))
+        handler.emit(make_record("y" * 150, created=1999))
+        assert (tmp_path / "sentinel.log.1").exists()
+        
+        handler.rollover_at = 2000.0
+        handler.emit(make_record("z", created=2001))
+        assert (tmp_path / "sentinel.log.2").exists()
+        assert log_file.read_text() == "z\n"
+        assert handler.rollover_at > 2001
+    finally:
+        handler.close()
@@ -0,0 +1,101 @@
+import httpx
+import pytest
+from starlette.testclient import TestClient
+
+import web_dashboard
+from app.core.metrics import (
+    PROBE_DURATION, Counter, Gauge, Histogram, MetricsRegistry, REGISTRY, forget_endpoint,
+    record_probe
+)
+from app.core.models import EndpointConfig, HealthStatus, ProbeResult
+from app.monitor.health_checker import HealthChecker
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    requests = Counter("test_requests_total", "Requisições", ["code"], registry=registry)
+    depth = Gauge("test_queue_depth", "Fila", registry=registry)
+    latency = Histogram("test_latency_seconds", "Latência", buckets=(0.1, 1), registry=registry)
+    
+    requests.labels("200").inc()
+    requests.labels("200").inc(2)
+    requests.labels('a"b').inc()
+    depth.set_function(lambda: 7)
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value)
+    
+    text = registry.render()
+    
+    assert "# TYPE test_requests_total counter" in text
+    assert 'test_requests_total{code="200"} 3' in text
+    assert 'test_requests_total{code="a\\"b"} 1' in text
+    assert "test_queue_depth 7" in text
+    assert 'test_latency_seconds_bucket{le="0.1"} 2' in text
+    assert 'test_latency_seconds_bucket{le="1"} 3' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 4' in text
+    assert "test_latency_seconds_count 4" in text
+    assert "test_latency_seconds_sum 3.65" in text
+
+
+def test_registry_rejects_duplicate_names():
+    registry = MetricsRegistry()
+    Counter("test_total", "Teste", registry=registry)
+    
+    with pytest.raises(ValueError):
+        Counter("test_total", "Teste", registry=registry)
+
+
+def test_labelled_metrics_require_labels():
+    registry = MetricsRegistry()
+    requests = Counter("test_requests_total", "Requisições", ["code"], registry=registry)
+    depth = Gauge("test_depth", "Fila", ["queue"], registry=registry)
+    latency = Histogram("test_latency_seconds", "Latência", ["endpoint"], registry=registry)
+    
+    for update in (requests.inc, depth.set, latency.observe):
+        with pytest.raises(ValueError, match="labels"):
+            update(1)
+    
+    requests.labels("200").inc()
+    assert 'test_requests_total{code="200"} 1' in registry.render()
+
+
+def test_record_probe_and_forget_endpoint():
+    result = ProbeResult("Metrics API", "https://metrics.example.com", HealthStatus.DOWN, 0.3)
+    
+    record_probe(result)
+    text = REGISTRY.render()
+    assert 'sentinel_endpoint_up{endpoint="Metrics API"} 0' in text
+    assert 'sentinel_probe_duration_seconds_bucket{endpoint="Metrics API",le="0.5"} 1' in text
+    
+    forget_endpoint("Metrics API")
+    assert "Metrics API" not in REGISTRY.render()
+
+
+@pytest.mark.asyncio
+async def test_health_checker_counts_retries_and_errors():
+    def handler(request):
+        raise httpx.ConnectError("recusado")
+    
+    retries = REGISTRY.get("sentinel_probe_retries_total")
+    errors = REGISTRY.get("sentinel_probe_errors_total").labels("request")
+    before_retries, before_errors = retries.labels().value, errors.value
+    
+    endpoint = EndpointConfig(
+        name="Retry API", url="https://retry.example.com", retry={"base_delay": 0.01}
+    )
+    async with HealthChecker(max_retries=2, transport=httpx.MockTransport(handler)) as checker:
+        await checker.check_endpoint(endpoint)
+    
+    assert retries.labels().value == before_retries + 1
+    assert errors.value == before_errors + 2
+    assert PROBE_DURATION.labels("Retry API").count == 1
+    forget_endpoint("Retry API")
+
+
+def test_metrics_route():
+    client = TestClient(web_dashboard.app)
+    response = client.get("/metrics")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE sentinel_probes_total counter" in response.text
@@ -1,6 +1,14 @@
+import asyncio
+
+import httpx
+import pytest
+
 from app.core.models import HealthCheckResult, HealthStatus
+from app.notifier.base import NotifierBase
+from app.notifier.digest import AlertDigest
 from app.notifier.discord import DiscordNotifier
 from app.notifier.email import EmailNotifier
+from app.notifier.registry import NotifierRegistry, create_http_client
 from app.notifier.telegram import TelegramNotifier
 
 
@@ -53,3 +61,193 @@ def test_notifier_should_not_alert_on_healthy():
     )
     
     assert not notifier.should_alert(result)
+
+
+class FakeSMTPServer:
+    def __init__(self):
+        self.connections = 0
+        self.messages = []
+        self.writers = []
+    
+    async def handle(self, reader, writer):
+        self.connections += 1
+        self.writers.append(writer)
+        writer.write(b"220 localhost ESMTP\r\n")
+        
+        while line := await reader.readline():
+            command = line.decode().strip().upper()
+            if command.startswith("EHLO"):
+                writer.write(b"250-localhost\r\n250 AUTH PLAIN\r\n")
+            elif command.startswith("AUTH"):
+                writer.write(b"235 Authentication successful\r\n")
+            elif command == "DATA":
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                body = []
+                while (data := await reader.readline()) != b".\r\n":
+                    body.append(data)
+                self.messages.append(b"".join(body))
+                writer.write(b"250 OK\r\n")
+            elif command == "QUIT":
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                break
+            else:
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+        
+        writer.close()
+    
+    def drop_connections(self):
+        for writer in self.writers:
+            writer.close()
+
+
+@pytest.mark.asyncio
+async def test_email_notifier_reuses_and_restores_smtp_session():
+    fake = FakeSMTPServer()
+    server = await asyncio.start_server(fake.handle, "127.0.0.1", 0)
+    
+    notifier = EmailNotifier()
+    notifier.smtp_host = "127.0.0.1"
+    notifier.smtp_port = server.sockets[0].getsockname()[1]
+    notifier.smtp_user = "sentinel@example.com"
+    notifier.smtp_password = "secret"
+    notifier.alert_email = "ops@example.com"
+    notifier.use_tls = False
+    
+    result = HealthCheckResult(
+        endpoint="Test",
+        url="https://example.com",
+        status=HealthStatus.DOWN,
+        response_time=1.0,
+        error_message="Error"
+    )
+    
+    async with server:
+        assert await notifier.send_alert(result)
+        assert await notifier.send_alert(result)
+        assert fake.connections == 1
+        
+        fake.drop_connections()
+        await asyncio.sleep(0.05)
+        
+        assert await notifier.send_alert(result)
+        await notifier.close()
+    
+    assert fake.connections == 2
+    assert len(fake.messages) == 3
+
+
+@pytest.mark.asyncio
+async def test_notifier_registry_shares_one_client():
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(204)
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    
+    async with NotifierRegistry(client) as registry:
+        telegram, discord, _ = registry.notifiers
+        discord.webhook_url = "https://discord.example.com/webhook"
+        
+        result = HealthCheckResult(
+            endpoint="Test",
+            url="https://example.com",
+            status=HealthStatus.DOWN,
+            response_time=1.0
+        )
+        
+        assert telegram.client is client and discord.client is client
+        assert discord in registry.active
+        assert await discord.send_alert(result)
+        assert await discord.send_alert(result)
+    
+    assert len(requests) == 2
+    assert not client.is_closed
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_notifier_posts_use_configured_client_timeout(monkeypatch):
+    monkeypatch.setattr("app.notifier.registry.settings.notifier_timeout", 3.5)
+    timeouts = []
+    
+    def handler(request):
+        timeouts.append(request.extensions["timeout"])
+        return httpx.Response(204)
+    
+    shared = create_http_client()
+    assert shared.timeout.read == 3.5
+    await shared.aclose()
+    
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler), timeout=3.5) as client:
+        discord = DiscordNotifier(client)
+        discord.webhook_url = "https://discord.example.com/webhook"
+        assert await discord.send_alert(make_down_result("Test"))
+    
+    assert timeouts == [{"connect": 3.5, "read": 3.5, "write": 3.5, "pool": 3.5}]
+
+
+class RecordingNotifier(NotifierBase):
+    def __init__(self):
+        self.alerts = []
+        self.digests = []
+    
+    def is_configured(self) -> bool:
+        return True
+    
+    async def send_alert(self, result: HealthCheckResult) -> bool:
+        self.alerts.append(result)
+        return True
+    
+    async def send_digest(self, results: list[HealthCheckResult]) -> bool:
+        self.digests.append(results)
+        return True
+
+
+def make_down_result(name):
+    return HealthCheckResult(
+        endpoint=name,
+        url="https://example.com",
+        status=HealthStatus.DOWN,
+        response_time=1.0,
+        error_message="Timeout"
+    )
+
+
+@pytest.mark.asyncio
+async def test_alert_digest_groups_simultaneous_failures():
+    notifier = RecordingNotifier()
+    digest = AlertDigest([notifier], flush_interval=0.05, max_batch=4)
+    task = asyncio.create_task(digest.run())
+    
+    for i in range(6):
+        digest.add(make_down_result(f"E{i}"))
+    await asyncio.sleep(0.1)
+    
+    digest.add(make_down_result("Late"))
+    await asyncio.sleep(0.1)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    
+    assert [len(batch) for batch in notifier.digests] == [4, 2]
+    assert [r.endpoint for r in notifier.alerts] == ["Late"]
+
+
+@pytest.mark.asyncio
+async def test_discord_digest_batches_embeds_per_message():
+    payloads = []
+    
+    def handler(request):
+        payloads.append(request.read())
+        return httpx.Response(204)
+    
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        notifier = DiscordNotifier(client)
+        notifier.webhook_url = "https://discord.example.com/webhook"
+        
+        assert await notifier.send_digest([make_down_result(f"E{i}") for i in range(25)])
+    
+    assert len(payloads) == 3
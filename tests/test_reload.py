@@ -0,0 +1,140 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.core.endpoints import EndpointConfigWatcher, EndpointRegistry, load_endpoints
+from app.monitor.engine import MonitorEngine, ResultSink
+from app.monitor.health_checker import HealthChecker
+
+
+class RecordingSink(ResultSink):
+    def __init__(self):
+        self.results = []
+        self.removed = []
+    
+    async def handle(self, result):
+        self.results.append(result)
+    
+    def remove_endpoint(self, name):
+        self.removed.append(name)
+
+
+def write_config(path, entries):
+    path.write_text(json.dumps(entries), encoding="utf-8")
+
+
+def test_watcher_only_revalidates_changed_entries(tmp_path):
+    config = tmp_path / "endpoints.json"
+    write_config(config, [
+        {"name": "A", "url": "https://a.example.com"},
+        {"name": "B", "url": "https://b.example.com"}
+    ])
+    watcher = EndpointConfigWatcher(str(config))
+    first = watcher.load()
+    registry = EndpointRegistry(first)
+    
+    write_config(config, [
+        {"name": "A", "url": "https://a.example.com"},
+        {"name": "B", "url": "https://b.example.com", "interval": 5},
+        {"name": "C", "url": "https://c.example.com"}
+    ])
+    second = watcher.load()
+    diff = registry.diff(second)
+    
+    assert second[0] is first[0]
+    assert [e.name for e in diff.added] == ["C"]
+    assert [e.name for e in diff.changed] == ["B"]
+    assert diff.removed == []
+    
+    assert registry.diff([second[2]]).removed == ["A", "B"]
+
+
+@pytest.mark.asyncio
+async def test_engine_applies_file_changes_without_restarting(tmp_path):
+    config = tmp_path / "endpoints.json"
+    write_config(config, [
+        {"name": "A", "url": "https://a.example.com", "interval": 0.05},
+        {"name": "B", "url": "https://b.example.com", "interval": 0.05}
+    ])
+    watcher = EndpointConfigWatcher(str(config), poll_interval=0.02)
+    sink = RecordingSink()
+    
+    async with HealthChecker(
+        max_retries=1, transport=httpx.MockTransport(lambda request: httpx.Response(200))
+    ) as checker:
+        engine = MonitorEngine(
+            EndpointRegistry(watcher.load()), [sink], checker=checker, watcher=watcher
+        )
+        task = asyncio.create_task(engine.run())
+        await asyncio.sleep(0.15)
+        
+        write_config(config, [
+            {"name": "B", "url": "https://b.example.com", "interval": 0.05},
+            {"name": "C", "url": "https://c.example.com", "interval": 0.05}
+        ])
+        await asyncio.sleep(0.1)
+        checked_before = len(sink.results)
+        await asyncio.sleep(0.2)
+        
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    
+    later = [r.endpoint for r in sink.results[checked_before:]]
+    assert sink.removed == ["A"]
+    assert "A" not in later
+    assert {"B", "C"} <= set(later)
+    assert sorted(e.name for e in engine.registry) == ["B", "C"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_reload_keeps_current_configuration(tmp_path):
+    config = tmp_path / "endpoints.json"
+    write_config(config, [
+        {"name": "A", "url": "https://a.example.com"},
+        {"name": "B", "url": "https://b.example.com"}
+    ])
+    watcher = EndpointConfigWatcher(str(config), poll_interval=0)
+    first = watcher.load()
+    changes = []
+    
+    task = asyncio.create_task(watcher.run(changes.append))
+    await asyncio.sleep(0)
+    
+    config.write_text('[{"name": "A", "url": ', encoding="utf-8")
+    watcher.request_reload()
+    await asyncio.sleep(0.05)
+    assert changes == []
+    
+    write_config(config, [
+        {"name": "A", "url": "not a url"},
+        {"name": "C", "url": "https://c.example.com"}
+    ])
+    watcher.request_reload()
+    await asyncio.sleep(0.05)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    
+    assert len(changes) == 1
+    assert [e.name for e in changes[0]] == ["C", "A"]
+    assert changes[0][1] is first[0]
+
+
+def test_first_reload_after_startup_keeps_last_valid_entry(tmp_path):
+    config = tmp_path / "endpoints.json"
+    write_config(config, [
+        {"name": "A", "url": "https://a.example.com"},
+        {"name": "B", "url": "https://b.example.com"}
+    ])
+    watcher = EndpointConfigWatcher(str(config))
+    registry = EndpointRegistry(load_endpoints(watcher=watcher))
+    
+    write_config(config, [
+        {"name": "A", "url": "https://a.example.com"},
+        {"name": "B", "url": "not a url"}
+    ])
+    diff = registry.diff(watcher.load())
+    
+    assert not diff
+    assert diff.removed == []
@@ -0,0 +1,97 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.alerts import CircuitConfig
+from app.core.models import EndpointConfig, HealthStatus
+from app.monitor.health_checker import HealthChecker
+from app.monitor.scheduler import EndpointScheduler
+
+
+@pytest.mark.asyncio
+async def test_scheduler_runs_endpoints_on_their_own_interval():
+    async def handler(request):
+        if request.url.host == "slow.example.com":
+            await asyncio.sleep(1)
+        return httpx.Response(200)
+    
+    endpoints = [
+        EndpointConfig(name="Fast", url="https://fast.example.com", interval=0.05),
+        EndpointConfig(name="Slow", url="https://slow.example.com", interval=0.05)
+    ]
+    checks = []
+    
+    async def on_result(result):
+        checks.append(result)
+    
+    async with HealthChecker(max_retries=1, transport=httpx.MockTransport(handler)) as checker:
+        scheduler = EndpointScheduler(checker, endpoints, 60, on_result)
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(0.4)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    
+    fast_checks = [r for r in checks if r.endpoint == "Fast"]
+    assert len(fast_checks) >= 4
+    assert all(r.status == HealthStatus.HEALTHY for r in fast_checks)
+    assert not [r for r in checks if r.endpoint == "Slow"]
+
+
+def test_scheduler_uses_default_interval():
+    endpoint = EndpointConfig(name="Test", url="https://example.com")
+    scheduler = EndpointScheduler(None, [endpoint], 30, None)
+    
+    assert scheduler.interval_for(endpoint) == 30
+    assert scheduler.interval_for(endpoint.model_copy(update={"interval": 5})) == 5
+
+
+@pytest.mark.asyncio
+async def test_scheduler_records_lag_and_stops_on_cancel():
+    endpoints = [
+        EndpointConfig(name=f"E{i}", url=f"https://e{i}.example.com", interval=0.01)
+        for i in range(20)
+    ]
+    
+    async def on_result(result):
+        pass
+    
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+    async with HealthChecker(max_retries=1, transport=transport) as checker:
+        scheduler = EndpointScheduler(checker, endpoints, 60, on_result)
+        for _ in range(5):
+            task = asyncio.create_task(scheduler.run())
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await asyncio.wait_for(asyncio.gather(task, return_exceptions=True), timeout=1)
+    
+    assert scheduler.lag.count >= len(endpoints)
+    assert scheduler.lag.quantile(0.5) is not None
+
+
+@pytest.mark.asyncio
+async def test_scheduler_defers_endpoints_with_open_circuit():
+    endpoint = EndpointConfig(name="Down", url="https://down.example.com", interval=0.01)
+    calls = []
+    
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError("recusado")
+    
+    async def on_result(result):
+        pass
+    
+    config = CircuitConfig(failure_threshold=1, open_seconds=60)
+    transport = httpx.MockTransport(handler)
+    async with HealthChecker(max_retries=1, transport=transport, circuit_config=config) as checker:
+        scheduler = EndpointScheduler(checker, [endpoint], 60, on_result)
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(0.2)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        
+        assert len(calls) == 1
+        assert scheduler._heap[0][0] >= checker.resume_at("Down")
+        
+        scheduler.update(endpoint)
+        assert "Down" not in checker.circuits
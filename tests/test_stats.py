@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from app.core.models import HealthCheckResult, HealthStatus, ProbeResult
+from app.core.stats import StatsTracker
+from app.monitor.sinks import StatsSink
+
+
+def make_result(status, response_time=0.5):
+    return HealthCheckResult(
+        endpoint="Test",
+        url="https://example.com",
+        status=status,
+        response_time=response_time
+    )
+
+
+def test_stats_tracker_replays_log_after_restart(tmp_path):
+    stats_file = tmp_path / "stats.json"
+    tracker = StatsTracker(str(stats_file))
+    tracker.update([make_result(HealthStatus.HEALTHY), make_result(HealthStatus.DOWN)])
+    tracker.update([make_result(HealthStatus.DEGRADED)])
+    tracker.flush()
+    
+    with open(tracker.log_file, "a") as f:
+        f.write('{"total": 5, "heal')
+    
+    restored = StatsTracker(str(stats_file))
+    
+    assert restored.stats.total_checks == 3
+    assert restored.stats.healthy_count == 1
+    assert restored.stats.degraded_count == 1
+    assert restored.stats.down_count == 1
+    assert restored.get_uptime_percentage() == tracker.get_uptime_percentage()
+
+
+def test_stats_tracker_keeps_updates_written_after_a_torn_line(tmp_path):
+    stats_file = tmp_path / "stats.json"
+    tracker = StatsTracker(str(stats_file))
+    for _ in range(3):
+        tracker.update([make_result(HealthStatus.HEALTHY)])
+    tracker.flush()
+    
+    with open(tracker.log_file, "a") as f:
+        f.write('{"total": 5, "heal')
+    
+    resumed = StatsTracker(str(stats_file))
+    for _ in range(5):
+        resumed.update([make_result(HealthStatus.DOWN)])
+    resumed.flush()
+    
+    restored = StatsTracker(str(stats_file))
+    
+    assert restored.stats.total_checks == 8
+    assert restored.stats.down_count == 5
+
+
+def test_stats_tracker_compacts_into_snapshot(tmp_path):
+    stats_file = tmp_path / "stats.json"
+    tracker = StatsTracker(str(stats_file), compact_every=3)
+    
+    for _ in range(4):
+        tracker.update([make_result(HealthStatus.HEALTHY)])
+    tracker.flush()
+    
+    snapshot = json.loads(stats_file.read_text())
+    assert snapshot["sequence"] == 3
+    assert snapshot["stats"]["total_checks"] == 3
+    assert len(tracker.log_file.read_text().splitlines()) == 1
+    
+    tracker.close()
+    restored = StatsTracker(str(stats_file))
+    
+    assert restored.stats.total_checks == 4
+    assert restored.log_file.read_text() == ""
+
+
+def probe(response_time):
+    return ProbeResult("api", "https://example.com", HealthStatus.HEALTHY, response_time)
+
+
+async def test_stats_sink_averages_once_per_sweep(tmp_path):
+    tracker = StatsTracker(str(tmp_path / "stats.json"))
+    sink = StatsSink(tracker)
+    
+    for response_time in (0.2, 0.4):
+        await sink.handle(probe(response_time))
+    assert tracker.stats.total_checks == 0
+    assert tracker.get_latency_percentiles("api")["count"] == 2
+    
+    sink._flush()
+    for response_time in (1.0, 1.0):
+        await sink.handle(probe(response_time))
+    await sink.close()
+    
+    assert tracker.stats.total_checks == 4
+    assert tracker.stats.average_response_time == pytest.approx(0.3 * 0.7 + 1.0 * 0.3)
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from app.core.models import HealthCheckResult, HealthStatus
+from app.core.timeseries import ResultStore
+
+
+def make_result(name, status, response_time, timestamp):
+    return HealthCheckResult(
+        endpoint=name,
+        url="https://example.com",
+        status=status,
+        response_time=response_time,
+        timestamp=timestamp
+    )
+
+
+def test_result_store_batches_and_rolls_up(tmp_path):
+    store = ResultStore(db_path=str(tmp_path / "history.db"), batch_size=10)
+    base = datetime(2024, 1, 1, 12, 0, 0)
+    
+    for i in range(6):
+        status = HealthStatus.DOWN if i == 5 else HealthStatus.HEALTHY
+        store.add(make_result("API", status, 0.1 * (i + 1), base + timedelta(seconds=10 * i)))
+    
+    assert store.flush() == 6
+    
+    since = base.timestamp() - 1
+    until = base.timestamp() + 3600
+    raw = store.query("API", since, until)
+    minute = store.query("API", since, until, resolution="1m")
+    
+    assert len(raw) == 6
+    assert len(minute) == 1
+    assert minute[0]["checks"] == 6
+    assert minute[0]["healthy"] == 5
+    assert minute[0]["down"] == 1
+    assert round(minute[0]["max_response_time"], 2) == 0.6
+    assert store.endpoints() == ["API"]
+    store.close()
+
+
+def test_result_store_retention(tmp_path):
+    store = ResultStore(
+        db_path=str(tmp_path / "history.db"),
+        retention_days={"raw": 1, "1m": 1, "1h": 30, "1d": 365}
+    )
+    old = datetime.now() - timedelta(days=3)
+    store.add(make_result("API", HealthStatus.HEALTHY, 0.2, old))
+    store.flush()
+    
+    store.apply_retention()
+    since = old.timestamp() - 86400
+    
+    assert store.query("API", since) == []
+    assert store.query("API", since, resolution="1m") == []
+    assert len(store.query("API", since, resolution="1h")) == 1
+    store.close()
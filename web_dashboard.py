@@ -3,156 +3,251 @@ Dashboard Web para SentinelAPI
 Interface visual para monitoramento de endpoints em tempo real
 """
 import asyncio
-import json
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from threading import Thread
+from typing import Any, AsyncIterator
 
-from flask import Flask, jsonify, render_template
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.templating import Jinja2Templates
 
+from app.core.config import settings
+from app.core.endpoints import EndpointConfigWatcher, EndpointRegistry, load_endpoints
 from app.core.logger import setup_logger
-from app.core.models import EndpointConfig
-from app.monitor.health_checker import HealthChecker
+from app.core.metrics import CONTENT_TYPE, render
+from app.core.stats import StatsTracker
+from app.core.timeseries import ROLLUPS, ResultStore
+from app.dashboard.events import EventBroadcaster
+from app.dashboard.index import SORT_KEYS
+from app.dashboard.sink import DashboardSink
+from app.dashboard.state import DashboardState
+from app.monitor.engine import MonitorEngine
+from app.monitor.sinks import AlertSink, HistorySink, StatsSink
 
 logger = setup_logger(__name__)
 
-app = Flask(__name__)
-
-# Estado global do monitoramento
-monitoring_data = {
-    "results": [],
-    "last_check": None,
-    "stats": {
-        "total_endpoints": 0,
-        "healthy": 0,
-        "degraded": 0,
-        "down": 0
-    },
-    "history": []  # Histórico limitado dos últimos checks
-}
-
-
-def load_endpoints(file_path: str = "endpoints.json") -> list[EndpointConfig]:
-    """Carrega endpoints do arquivo de configuração"""
-    config_file = Path(file_path)
+templates = Jinja2Templates(directory=str(Path(__file__).parent / "templates"))
+
+# Estado do monitoramento: só o loop de monitoramento escreve, e as rotas
+# leem snapshots imutáveis que são substituídos (copy-on-write) a cada verificação
+dashboard = DashboardState()
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette) -> AsyncIterator[None]:
+    """Roda o motor de monitoramento no mesmo event loop do servidor"""
+    watcher = EndpointConfigWatcher()
+    registry = EndpointRegistry(load_endpoints(watcher=watcher))
+    result_store = ResultStore()
+    app.state.result_store = result_store
+    # Percentis de latência (janela de 1 hora) registrados uma única vez, pelo StatsSink
+    stats_tracker = StatsTracker()
+    app.state.stats_tracker = stats_tracker
     
-    if not config_file.exists():
-        logger.warning(f"Arquivo de configuração {file_path} não encontrado")
-        return []
+    if not registry:
+        logger.warning("Nenhum endpoint configurado; aguardando alterações em endpoints.json")
     
+    # Um único fluxo de verificações alimenta dashboard, histórico, estatísticas e alertas;
+    # o StatsSink vem antes para o dashboard já ler os percentis com o resultado atual
+    engine = MonitorEngine(registry, [
+        StatsSink(stats_tracker),
+        DashboardSink(dashboard, registry, stats_tracker),
+        HistorySink(result_store),
+        AlertSink()
+    ], watcher=watcher)
+    monitor = asyncio.create_task(engine.run())
+    logger.info("Monitoramento iniciado...")
     try:
-        with open(config_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
-        endpoints = [EndpointConfig(**endpoint) for endpoint in data]
-        logger.info(f"Carregados {len(endpoints)} endpoints para monitoramento")
-        return endpoints
-        
-    except Exception as e:
-        logger.error(f"Erro ao carregar endpoints: {e}")
-        return []
-
-
-async def monitor_loop():
-    """Loop de monitoramento assíncrono"""
-    endpoints = load_endpoints()
+        yield
+    finally:
+        # O HistorySink fecha o ResultStore quando o motor encerra
+        monitor.cancel()
+        await asyncio.gather(monitor, return_exceptions=True)
+
+
+def cached_response(request: Request, name: str) -> Response:
+    """Responde com o snapshot pré-serializado, usando ETag e compressão"""
+    status, headers, body = dashboard.snapshots.select(
+        name,
+        request.headers.get("If-None-Match"),
+        request.headers.get("Accept-Encoding", "")
+    )
+    return Response(body, status_code=status, headers=headers, media_type="application/json")
+
+
+async def index(request: Request) -> Response:
+    """Página principal do dashboard"""
+    return templates.TemplateResponse(request, "dashboard.html")
+
+
+QUERY_PARAMS = {"page", "page_size", "status", "prefix", "tag", "sort", "order"}
+
+
+def int_arg(request: Request, name: str, default: int) -> int:
+    """Lê um parâmetro inteiro, usando o padrão quando ausente ou inválido"""
+    try:
+        return int(request.query_params.get(name, default))
+    except ValueError:
+        return default
+
+
+def query_args(request: Request) -> dict[str, Any]:
+    """Lê os parâmetros de paginação, filtro e ordenação da requisição"""
+    params = request.query_params
+    sort = params.get("sort", "name")
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Ordenação inválida: {sort}")
     
-    if not endpoints:
-        logger.error("Nenhum endpoint configurado para monitoramento")
-        return
+    return {
+        "status": params.get("status"),
+        "prefix": params.get("prefix"),
+        "tag": params.get("tag"),
+        "sort": sort,
+        "descending": params.get("order", "asc") == "desc",
+        "page": int_arg(request, "page", 1),
+        "page_size": int_arg(request, "page_size", 50)
+    }
+
+
+async def api_status(request: Request) -> Response:
+    """API endpoint para obter status atual (paginado quando há filtros)"""
+    if not QUERY_PARAMS & request.query_params.keys():
+        return cached_response(request, "status")
     
-    while True:
-        try:
-            async with HealthChecker(max_retries=2) as checker:
-                results = await checker.check_multiple(endpoints)
-                
-                # Atualizar dados globais
-                monitoring_data["results"] = [
-                    {
-                        "name": r.endpoint,
-                        "url": next((e.url for e in endpoints if e.name == r.endpoint), ""),
-                        "status": r.status,
-                        "response_time": round(r.response_time, 2),
-                        "status_code": r.status_code,
-                        "error_message": r.error_message,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    for r in results
-                ]
-                
-                monitoring_data["last_check"] = datetime.now().isoformat()
-                
-                # Calcular estatísticas
-                stats = monitoring_data["stats"]
-                stats["total_endpoints"] = len(results)
-                stats["healthy"] = sum(1 for r in results if r.status == "healthy")
-                stats["degraded"] = sum(1 for r in results if r.status == "degraded")
-                stats["down"] = sum(1 for r in results if r.status == "down")
-                
-                # Adicionar ao histórico (manter últimos 50 registros)
-                history_entry = {
-                    "timestamp": datetime.now().isoformat(),
-                    "results": [
-                        {
-                            "name": r.endpoint,
-                            "status": r.status,
-                            "response_time": round(r.response_time, 2)
-                        }
-                        for r in results
-                    ]
-                }
-                monitoring_data["history"].append(history_entry)
-                if len(monitoring_data["history"]) > 50:
-                    monitoring_data["history"].pop(0)
-                
-                logger.info(f"Check completo: {stats['healthy']} healthy, {stats['degraded']} degraded, {stats['down']} down")
-                
-        except Exception as e:
-            logger.error(f"Erro no loop de monitoramento: {e}")
-        
-        # Aguardar antes do próximo check (30 segundos)
-        await asyncio.sleep(30)
-
-
-def run_monitor_thread():
-    """Executar loop de monitoramento em thread separada"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    loop.run_until_complete(monitor_loop())
-
-
-@app.route("/")
-def index():
-    """Página principal do dashboard"""
-    return render_template("dashboard.html")
+    try:
+        args = query_args(request)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    
+    snapshot = dashboard.snapshot
+    return JSONResponse({
+        "last_check": snapshot.last_check,
+        "stats": dict(snapshot.stats),
+        **dashboard.index.query(**args)
+    })
+
+
+async def api_stream(request: Request) -> Response:
+    """Stream SSE: contagens iniciais e depois um evento por varredura com o que mudou"""
+    snapshot = dashboard.snapshot
+    initial = EventBroadcaster.format("snapshot", {
+        "last_check": snapshot.last_check,
+        "stats": dict(snapshot.stats)
+    })
+    return StreamingResponse(
+        dashboard.events.stream(initial=initial),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def api_history(request: Request) -> Response:
+    """API endpoint para obter histórico (paginado quando há filtros)"""
+    if not QUERY_PARAMS & request.query_params.keys():
+        return cached_response(request, "history")
+    
+    try:
+        args = query_args(request)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    
+    if args["sort"] == "last_change":
+        return JSONResponse(
+            {"error": "Ordenação last_change não disponível no histórico"}, status_code=400
+        )
+    
+    # Do mais recente ao mais antigo, como o snapshot em cache
+    history = dashboard.snapshot.history[::-1]
+    page = max(args["page"], 1)
+    page_size = max(min(args["page_size"], 50), 1)
+    selected = history[(page - 1) * page_size:page * page_size]
+    
+    # Prefixo e tag vêm do índice; o status é o de cada verificação registrada
+    names = dashboard.index.select(prefix=args["prefix"], tag=args["tag"])
+    status = args["status"]
+    key = SORT_KEYS[args["sort"]]
+    
+    return JSONResponse({
+        "history": [
+            {
+                "timestamp": entry["timestamp"],
+                "results": sorted(
+                    (
+                        r for r in entry["results"]
+                        if (not status or r["status"] == status)
+                        and (names is None or r["name"] in names)
+                    ),
+                    key=key,
+                    reverse=args["descending"]
+                )
+            }
+            for entry in selected
+        ],
+        "total": len(history),
+        "page": page,
+        "page_size": page_size
+    })
 
 
-@app.route("/api/status")
-def api_status():
-    """API endpoint para obter status atual"""
-    return jsonify(monitoring_data)
+async def api_latency(request: Request) -> Response:
+    """API endpoint para obter percentis de latência (p50/p95/p99) por endpoint"""
+    return JSONResponse(request.app.state.stats_tracker.latency.all_percentiles())
 
 
-@app.route("/api/history")
-def api_history():
-    """API endpoint para obter histórico"""
-    return jsonify({
-        "history": monitoring_data["history"][-20:]  # Últimos 20 registros
+async def metrics(request: Request) -> Response:
+    """Métricas do monitor no formato de texto do Prometheus"""
+    return Response(await render(), media_type=CONTENT_TYPE)
+
+
+async def api_endpoint_history(request: Request) -> Response:
+    """API endpoint para consultar o histórico persistido de um endpoint"""
+    endpoint = request.path_params["endpoint"]
+    resolution = request.query_params.get("resolution", "1h")
+    
+    try:
+        hours = float(request.query_params.get("hours", 24))
+    except ValueError:
+        hours = 24.0
+    
+    if resolution != "raw" and resolution not in ROLLUPS:
+        return JSONResponse({"error": f"Resolução inválida: {resolution}"}, status_code=400)
+    
+    since = datetime.now().timestamp() - hours * 3600
+    points = await asyncio.to_thread(
+        request.app.state.result_store.query, endpoint, since, resolution=resolution
+    )
+    return JSONResponse({
+        "endpoint": endpoint,
+        "resolution": resolution,
+        "points": points
     })
 
 
-def main():
+app = Starlette(
+    routes=[
+        Route("/", index),
+        Route("/api/status", api_status),
+        Route("/api/stream", api_stream),
+        Route("/api/history", api_history),
+        Route("/api/latency", api_latency),
+        Route("/api/history/{endpoint:path}", api_endpoint_history),
+        Route("/metrics", metrics)
+    ],
+    lifespan=lifespan
+)
+
+
+def main() -> None:
     """Iniciar dashboard web"""
-    # Iniciar thread de monitoramento
-    monitor_thread = Thread(target=run_monitor_thread, daemon=True)
-    monitor_thread.start()
-    
     logger.info("=== Dashboard SentinelAPI ===")
-    logger.info("Acesse: http://localhost:5000")
-    logger.info("Monitoramento iniciado...")
+    logger.info(f"Acesse: http://localhost:{settings.dashboard_port}")
     
-    # Iniciar servidor Flask
-    app.run(host="0.0.0.0", port=5000, debug=False)
+    # Servidor ASGI: monitoramento e requisições compartilham o mesmo event loop
+    uvicorn.run(app, host=settings.dashboard_host, port=settings.dashboard_port, log_level="warning")
 
 
 if __name__ == "__main__":